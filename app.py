@@ -7,7 +7,16 @@ import platform
 import subprocess
 import re
 import sys
-from git_helper import GitHelper, SESSION_META_DIR
+import functools
+import contextlib
+import threading
+import time
+import gitsimply_api
+from task_runner import GitTaskRunner
+from autosave import AutosavePolicy
+from workspace import Workspace
+from tracing import tracer, current_action
+from chunk_store import DEFAULT_THRESHOLD_MB as LARGE_ASSET_THRESHOLD_MB
 
 def get_app_config_dir():
     """Gets the application-specific config directory path."""
@@ -21,7 +30,20 @@ def get_app_config_dir():
 
 APP_CONFIG_DIR = get_app_config_dir()
 APP_CONFIG_FILE = os.path.join(APP_CONFIG_DIR, "config.json")
-SESSION_FILE = "session.json"
+REFRESH_COALESCE_MS = 100
+BUSY_INDICATOR_DELAY_MS = 150
+PROGRESS_THRESHOLD_MS = 1000 # Operations running longer than this get a progress bar and a Cancel button.
+PROGRESS_POLL_MS = 100
+WATCH_POLL_MS = 250
+HISTORY_PAGE_SIZE = 200
+HISTORY_PREFETCH_FRACTION = 0.9 # Load the next page once the view is scrolled this far down.
+DIFF_AGAINST_PARENT, DIFF_AGAINST_HEAD, DIFF_AGAINST_MARKED = "parent", "head", "marked"
+DIFF_MAX_LINES = 2000 # Lines of a single file's diff shown in the changes list.
+AUTOSAVE_RETRY_MS = 5000 # How soon to try again when an autosave comes due in the middle of something else.
+MAINTENANCE_POLL_MS = 5000
+MAINTENANCE_IDLE_SECONDS = 120 # Repository housekeeping only starts after this long without user actions or file edits.
+STARTUP_BUDGET_MS = 400 # Launch to a drawn window; the warm start exists to stay under this.
+STALE_STATUS_TEXT = "Showing the project as it was last time. Checking for changes..."
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -32,9 +54,32 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def user_action(handler):
+    """
+    Marks a PermutationManager method as a user-facing action. Requested UI refreshes
+    are held back until the outermost running action has finished, and the
+    repository status is fetched at most once for the whole action.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, *args, **kwargs):
+        self._action_depth += 1
+        self._last_activity = time.monotonic()
+        helper = self.git_helper
+        token, start = current_action.set(handler.__name__), time.perf_counter()
+        try:
+            with helper.status_snapshot() if helper else contextlib.nullcontext():
+                return handler(self, *args, **kwargs)
+        finally:
+            current_action.reset(token)
+            tracer.record(handler.__name__, "ui", start, time.perf_counter(), action=handler.__name__)
+            self._action_depth -= 1
+            if not self._action_depth: self._show_action_latency(handler.__name__, start)
+    return wrapper
+
 class PermutationManager(tk.Tk):
-    def __init__(self):
+    def __init__(self, started_at=None):
         super().__init__()
+        self._started_at = started_at or time.perf_counter()
         self.title("GitSimply")
         
         try:
@@ -49,19 +94,189 @@ class PermutationManager(tk.Tk):
         self.is_detached, self.detached_from_branch = False, ""
         self.detached_commit_info, self.is_viewing_latest = {}, False
         self.history, self.current_head_hash = [], None
+        self._history_cursor, self._history_loading = None, False
+        self._preview_window, self._search_window, self._workspace_window = None, None, None
+        self.workspace = Workspace()
+        self._autosave_policy, self._autosave_after_id = None, None
+        self._diff_base, self._diff_request, self._diff_sides, self._diff_files = None, 0, None, {}
+        self._action_depth, self._refresh_after_id, self._close_requested = 0, None, False
+        self._busy_after_id, self._status_before_busy, self._progress_after_id = None, None, None
+        self._branches, self._ui_cache_saved, self._first_paint_ms = [], None, None
+        self._branch_sort = ("name", False) # (column, descending) of the branch list.
+        self._last_activity = time.monotonic()
+        self.task_runner = GitTaskRunner(self, on_busy_changed=self._on_busy_changed)
+        # Set by the filesystem watcher thread, picked up on the Tk thread by _poll_worktree_events.
+        self._worktree_changed = threading.Event()
 
         self._load_config()
         self._create_widgets()
 
-        if self.project_root and os.path.exists(self.project_root):
+        # Warm start: draw what the project looked like last time, then open it with git once the window is up.
+        self._startup_pending = bool(self.project_root and os.path.exists(self.project_root))
+        if self._startup_pending:
             self._show_main_interface()
-            self._initialize_project(self.project_root)
+            self._show_cached_state(gitsimply_api.load_ui_cache(self.project_root))
         else:
             self._show_welcome_screen()
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.after(WATCH_POLL_MS, self._poll_worktree_events)
+        self.after(MAINTENANCE_POLL_MS, self._check_maintenance)
+
+    def _on_first_map(self, event):
+        if event.widget is not self or self._first_paint_ms is not None: return
+        now = time.perf_counter()
+        self._first_paint_ms = (now - self._started_at) * 1000
+        tracer.record("startup: window shown", "ui", self._started_at, now)
+        if not self._startup_pending:
+            self._show_startup_time()
+            return
+        try:
+            self.status_frame.grab_set() # The cached view is for looking only, until git has confirmed it.
+        except tk.TclError:
+            pass
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Opens the project for real, replacing the cached view with the current state."""
+        self._startup_pending = False
+        self._initialize_project(self.project_root)
+        self.status_frame.grab_release()
+        if self.status_bar.cget("text") == STALE_STATUS_TEXT: self.status_bar.config(text="Ready.")
+        now = time.perf_counter()
+        tracer.record("startup: up to date", "ui", self._started_at, now)
+        self._show_startup_time((now - self._started_at) * 1000)
+
+    def _show_startup_time(self, ready_ms=None):
+        note = " (over budget)" if self._first_paint_ms > STARTUP_BUDGET_MS else ""
+        text = f"startup: window in {self._first_paint_ms:.0f} ms{note}, budget {STARTUP_BUDGET_MS} ms"
+        if ready_ms is not None: text += f" | up to date in {ready_ms:.0f} ms"
+        self.latency_label.config(text=text)
+
+    def _show_cached_state(self, cache):
+        """Draws the branch list, history page and mode saved by _save_ui_cache, marked as not yet checked."""
+        self.proj_label.config(text=self.project_root)
+        self.status_bar.config(text=STALE_STATUS_TEXT)
+        if not cache: return
+        try:
+            self.is_detached, self.active_branch = cache["is_detached"], cache["active_branch"]
+            self.detached_from_branch, self.detached_commit_info = cache["detached_from_branch"], cache["detached_commit_info"]
+            self.is_viewing_latest, self.current_head_hash = cache["is_viewing_latest"], cache["head"]
+            self._show_unsaved_indicator(cache["has_changes"])
+            if self.is_detached: self._render_detached_info()
+            else: self._render_branch_list(cache["branches"])
+            self.hist_label.config(text=f"'{cache['history_branch']}'")
+            self.history = []
+            self._append_history_rows(cache["history"])
+        except (KeyError, TypeError):
+            pass # A damaged cache only costs the early preview; the real state follows.
+
+    def _save_ui_cache(self, has_changes, history_branch):
+        state = {
+            "head": self.current_head_hash, "is_detached": self.is_detached, "active_branch": self.active_branch,
+            "has_changes": has_changes, "detached_from_branch": self.detached_from_branch,
+            "detached_commit_info": self.detached_commit_info, "is_viewing_latest": self.is_viewing_latest,
+            "branches": self._branches, "history_branch": history_branch,
+            "history": [{"hash": e["hash"], "date": e["date"], "subject": e["subject"]} for e in self.history[:HISTORY_PAGE_SIZE]],
+        }
+        if state == self._ui_cache_saved: return
+        try:
+            gitsimply_api.save_ui_cache(self.project_root, state)
+            self._ui_cache_saved = state
+        except OSError:
+            pass # Only the next warm start is affected.
+
+    def destroy(self):
+        # Closing mid-operation could leave the repository half-updated, so wait for it.
+        if self.task_runner.is_busy():
+            self._close_requested = True
+            return
+        self.task_runner.shutdown()
+        self.workspace.close()
+        super().destroy()
+
+    def _show_action_latency(self, action_name, start):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        # Background work (watcher rechecks, prefetches) carries no action tag and is left out.
+        calls = [r for r in tracer.records(since=start) if r["kind"] != "ui" and r["action"]]
+        git_ms = sum(r["duration"] for r in calls) * 1000
+        try:
+            self.latency_label.config(text=f"{action_name.strip('_')}: {elapsed_ms:.0f} ms | {len(calls)} git call(s), {git_ms:.0f} ms in git")
+        except tk.TclError:
+            pass # The window was closed by the action itself.
+
+    def _run_git(self, operation, *args, mutating=True, **kwargs):
+        """Runs a GitHelper call on the background runner, keeping the window responsive until it finishes."""
+        return self.task_runner.run_and_wait(operation, *args, mutating=mutating, **kwargs)
+
+    def _on_busy_changed(self, busy):
+        if busy:
+            # Block clicks on the rest of the window while git is working; redraws (and Cancel) still work.
+            try:
+                self.status_frame.grab_set()
+            except tk.TclError:
+                pass
+            self._busy_after_id = self.after(BUSY_INDICATOR_DELAY_MS, self._show_busy_indicator)
+            self._progress_after_id = self.after(PROGRESS_THRESHOLD_MS, self._show_progress_controls)
+            return
+        if self._busy_after_id:
+            self.after_cancel(self._busy_after_id); self._busy_after_id = None
+        if self._progress_after_id:
+            self.after_cancel(self._progress_after_id); self._progress_after_id = None
+        self.progress_bar.pack_forget(); self.cancel_button.pack_forget()
+        self.status_frame.grab_release()
+        self.config(cursor="")
+        if self._status_before_busy is not None:
+            self.status_bar.config(text=self._status_before_busy); self._status_before_busy = None
+        if self._close_requested: self.after_idle(self.destroy)
+
+    def _show_busy_indicator(self):
+        self._busy_after_id = None
+        self.config(cursor="watch")
+        self._status_before_busy = self.status_bar.cget("text")
+        self.status_bar.config(text="Working...")
+
+    def _show_progress_controls(self):
+        self.progress_bar.config(mode="determinate", value=0)
+        self.cancel_button.config(state=tk.NORMAL, text="Cancel")
+        self.cancel_button.pack(side=tk.RIGHT, padx=(0, 5), before=self.status_bar)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5, before=self.cancel_button)
+        self._poll_progress()
+
+    def _poll_progress(self):
+        """Mirrors the running git command's progress into the status bar until the operation ends."""
+        self._progress_after_id = self.after(PROGRESS_POLL_MS, self._poll_progress)
+        progress = self.git_helper.current_progress() if self.git_helper else None
+        if not progress: return
+        if progress["total"]:
+            self.progress_bar.config(mode="determinate", value=100 * progress["done"] / progress["total"])
+            text = f"{progress['phase']}: {progress['percent']}% ({progress['done']}/{progress['total']})"
+        else:
+            self.progress_bar.config(mode="indeterminate"); self.progress_bar.step(4)
+            text = f"{progress['phase']}: {progress['done']}"
+        if str(self.cancel_button.cget("state")) != tk.DISABLED: self.status_bar.config(text=text)
+
+    def _cancel_running_operation(self):
+        if not self.git_helper: return
+        stopped = self.git_helper.cancel_running()
+        self.cancel_button.config(state=tk.DISABLED, text="Cancelling...")
+        # Steps that don't stream (commits, ref updates) are quick and finish on their own.
+        self.status_bar.config(text="Cancelling..." if stopped else "Finishing the current step...")
+
+    def request_ui_refresh(self):
+        """Asks for an update_ui_state soon. A burst of requests collapses into a single refresh."""
+        if self._refresh_after_id: return
+        self._refresh_after_id = self.after(REFRESH_COALESCE_MS, self._run_requested_refresh)
+
+    def _run_requested_refresh(self):
+        self._refresh_after_id = None
+        if self._action_depth or self.task_runner.is_busy():
+            self.request_ui_refresh() # Try again once the current action is done.
+            return
+        self.update_ui_state()
 
     def _show_welcome_screen(self):
         self.main_pane.pack_forget()
-        self.status_bar.pack_forget()
+        self.status_frame.pack_forget()
         self.top_frame.pack_forget()
         self.welcome_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -69,76 +284,129 @@ class PermutationManager(tk.Tk):
         self.welcome_frame.pack_forget()
         self.top_frame.pack(fill=tk.X)
         self.main_pane.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-    def _get_session_path(self):
-        if not self.project_root: return None
-        return os.path.join(self.project_root, SESSION_META_DIR, SESSION_FILE)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
 
     def _load_session_state(self):
-        path = self._get_session_path()
-        if path and os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    session_data = json.load(f)
-                    self.detached_from_branch = session_data.get("detached_from_branch", "")
-                    self.detached_commit_info = session_data.get("detached_commit_info", {})
-                    self.is_viewing_latest = session_data.get("is_viewing_latest", False)
-            except (json.JSONDecodeError, FileNotFoundError):
-                self._clear_session_state()
+        session = gitsimply_api.load_session(self.project_root) if self.project_root else None
+        if session:
+            self.detached_from_branch = session.get("detached_from_branch", "")
+            self.detached_commit_info = session.get("detached_commit_info", {})
+            self.is_viewing_latest = session.get("is_viewing_latest", False)
         else:
             self._clear_session_state(clear_vars=True)
 
     def _save_session_state(self):
-        path = self._get_session_path()
-        if not path: return
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        session_data = {
-            "detached_from_branch": self.detached_from_branch,
-            "detached_commit_info": self.detached_commit_info,
-            "is_viewing_latest": self.is_viewing_latest
-        }
-        with open(path, "w") as f:
-            json.dump(session_data, f, indent=2)
+        if not self.project_root: return
+        gitsimply_api.save_session(self.project_root, self.detached_from_branch, self.detached_commit_info, self.is_viewing_latest)
 
     def _clear_session_state(self, clear_vars=True):
-        path = self._get_session_path()
-        if path and os.path.exists(path):
-            try:
-                os.remove(path)
-            except OSError:
-                pass
+        if self.project_root: gitsimply_api.clear_session(self.project_root)
         if clear_vars:
             self.detached_from_branch = ""
             self.detached_commit_info = {}
             self.is_viewing_latest = False
 
+    @user_action
     def _initialize_project(self, path):
         self._show_main_interface()
-        self.project_root, self.git_helper = path, GitHelper(path)
+        for window in (self._preview_window, self._search_window):
+            if window and window.winfo_exists(): window.destroy()
+        self._diff_base = None
+        self.mark_button.config(text="Mark Selected for Comparison")
+        # Other projects' helpers stay open in the workspace; only the loaded one is watched.
+        if self.git_helper: self.git_helper.stop_watching()
+        self._worktree_changed.clear()
+        self.project_root, self.git_helper = path, self.workspace.helper_for(path)
         self.proj_label.config(text=self.project_root)
-        result = self.git_helper.initialize_repo()
-        if not result["success"]: self._show_error(f"Failed to initialize project:\n{result['error']}"); return
+        report = None
+        if not self.workspace.is_initialized(path):
+            result = self._run_git(self.git_helper.initialize_repo)
+            if not result["success"]: self._show_error(f"Failed to initialize project:\n{result['error']}"); return
+            self.workspace.mark_initialized(path)
+            report = self.git_helper.last_performance_report
+
+        settings = self.git_helper.load_project_settings()
+        self.performance_profile_var.set(settings.get("performance_profile", True))
+        self.autosave_var.set(settings.get("autosave", False))
+        self.large_assets_var.set(settings.get("large_assets", False))
+        self._autosave_policy = AutosavePolicy.from_settings(settings)
+        self._cancel_autosave()
+        if report: self.status_bar.config(text=f"Tuned Git for this project ({len(report)} setting(s) changed). See Settings > Performance Report.")
 
         self._load_session_state()
         self._save_config()
+        self.git_helper.start_watching(on_change=self._on_worktree_event)
         self.update_ui_state()
 
-    def update_ui_state(self):
-        if not self.git_helper: return
-        state_res = self.git_helper.get_current_state()
-        if not state_res["success"]: self._show_error(state_res["error"]); return
+    def _on_worktree_event(self, repository_changed):
+        # Runs on the watcher thread, so only record the event for the Tk thread.
+        self._worktree_changed.set()
+
+    def _poll_worktree_events(self):
+        """Keeps the unsaved-changes indicator in step with the project folder, without a manual refresh."""
+        self.after(WATCH_POLL_MS, self._poll_worktree_events)
+        if not self.git_helper or self._action_depth or self.task_runner.is_busy(): return
+        if not self._worktree_changed.is_set(): return
+        self._worktree_changed.clear()
+        self._last_activity = time.monotonic()
+        if self.autosave_var.get() and self._autosave_policy:
+            self._autosave_policy.record_change()
+            self._schedule_autosave()
+        helper = self.git_helper
+        def on_status(state_res, error):
+            if error or helper is not self.git_helper or not state_res["success"]: return
+            data = state_res["data"]
+            moved = (data["is_detached"] != self.is_detached or data["head"] != self.current_head_hash
+                     or (not data["is_detached"] and data["current_ref"] != self.active_branch))
+            # Something outside the app moved HEAD; everything on screen needs rebuilding.
+            if moved: self.request_ui_refresh()
+            else: self._show_unsaved_indicator(data["has_changes"])
+        self.task_runner.submit(helper.get_repo_status, mutating=False, quiet=True, on_done=on_status)
+
+    def _check_maintenance(self):
+        """Starts repository housekeeping once the app has been idle for a while, and reports what it reclaimed."""
+        self.after(MAINTENANCE_POLL_MS, self._check_maintenance)
+        helper = self.git_helper
+        if not helper: return
+        result = helper.take_maintenance_result()
+        if result: self._report_maintenance(result)
+        if self._action_depth or self.task_runner.is_busy(): return
+        if time.monotonic() - self._last_activity < MAINTENANCE_IDLE_SECONDS: return
+        if helper.maintenance_due(): helper.start_background_maintenance()
+
+    def _report_maintenance(self, result):
+        if not result["success"]:
+            self.status_bar.config(text=result["error"])
+            return
+        data = result["data"]
+        if not data["tasks"]: return
+        packed = data["loose_objects"][0] - data["loose_objects"][1]
+        reclaimed = f", reclaimed {data['reclaimed_kb'] / 1024:.1f} MB" if data["reclaimed_kb"] > 0 else ""
+        self.status_bar.config(text=f"Tidied the repository in the background: packed {packed} loose object(s){reclaimed}.")
 
-        hash_res = self.git_helper.get_current_commit_hash()
-        if not hash_res["success"]: self._show_error(hash_res["error"]); return
-        self.current_head_hash = hash_res["output"]
+    def _run_maintenance_now(self):
+        if not self.git_helper: return
+        started = self.git_helper.start_background_maintenance(force=True)
+        self.status_bar.config(text="Tidying the repository in the background..." if started else "Repository maintenance is already running.")
 
-        has_changes = self.git_helper.has_changes()
+    def _show_unsaved_indicator(self, has_changes):
         if has_changes:
             self.unsaved_changes_frame.pack(fill=tk.X, pady=(2, 5))
         else:
             self.unsaved_changes_frame.pack_forget()
 
+    @user_action
+    def update_ui_state(self):
+        if not self.git_helper: return
+        if self._refresh_after_id:
+            self.after_cancel(self._refresh_after_id); self._refresh_after_id = None
+        state_res = self._run_git(self.git_helper.get_repo_status, mutating=False)
+        if not state_res["success"]: self._show_error(state_res["error"]); return
+        self.current_head_hash = state_res["data"]["head"]
+
+        has_changes = state_res["data"]["has_changes"]
+        self._show_unsaved_indicator(has_changes)
+
         self.is_detached = state_res["data"]["is_detached"]
         if self.is_detached:
             if not self.detached_from_branch or not self.detached_commit_info:
@@ -153,109 +421,185 @@ class PermutationManager(tk.Tk):
                         discard_msg = ("To protect your project, you must either save your unsaved work to a new branch or discard it.\n\n"
                                        "If you choose 'OK', the changes from your last session will be PERMANENTLY DISCARDED and you will be returned to the 'main' branch.")
                         if messagebox.askokcancel("Action Required", discard_msg, icon='warning', parent=self):
-                            self.git_helper.discard_changes()
-                            self.git_helper.checkout('main')
+                            self._run_git(self.git_helper.discard_changes)
+                            self._run_git(self.git_helper.checkout, 'main')
                             self._clear_session_state()
-                            self.update_ui_state()
+                            self.request_ui_refresh()
                         else:
                             messagebox.showerror("Exiting", "The application cannot continue in this unstable state. Please restart and save your work to a new branch.", parent=self)
                             self.destroy()
                         return
 
-                    result = self.git_helper.create_branch(branch_name, start_point=self.current_head_hash)
+                    result = self._run_git(self.git_helper.create_branch, branch_name, start_point=self.current_head_hash)
                     if not result['success']:
                         self._show_error(f"Failed to create recovery branch '{branch_name}':\n{result['error']}")
                         return
                     
-                    commit_res = self.git_helper.commit("Recovered unsaved work from unexpected shutdown")
+                    commit_res = self._run_git(self.git_helper.commit, "Recovered unsaved work from unexpected shutdown")
                     if not commit_res['success']:
                         self._show_error(f"Created recovery branch '{branch_name}' but failed to commit the snapshot.\nYour changes are still present but are uncommitted.\n\nError: {commit_res['error']}")
                     
                     messagebox.showinfo("Work Saved", f"Your unsaved work has been safely stored in a new branch named '{branch_name}'. The app will now load this new branch.", parent=self)
                 else:
                     messagebox.showwarning("Unstable State", "The app was closed in an unusual state with no unsaved changes. Returning to the 'main' branch for safety.", parent=self)
-                    self.git_helper.checkout('main')
+                    self._run_git(self.git_helper.checkout, 'main')
 
                 self._clear_session_state()
-                self.update_ui_state()
+                self.request_ui_refresh()
                 return
 
             self._show_detached_view()
+            self._save_ui_cache(has_changes, self.detached_from_branch)
         else:
             self._clear_session_state()
             self.active_branch = state_res["data"]["current_ref"]
             self._show_main_view()
+            self._save_ui_cache(has_changes, self.active_branch)
 
-    def _load_historical_version(self):
+    def _get_selected_history_entry(self):
         selected_items = self.hist_list.selection()
-        if not selected_items:
-            self._show_error("Please select a version from the history list to view.")
-            return
-        selected_item = selected_items[0]
+        if not selected_items: return None
+        try:
+            return self.history[self.hist_list.get_children('').index(selected_items[0])]
+        except (ValueError, IndexError):
+            return None
 
-        unsaved_status = self._handle_unsaved_changes()
-        if unsaved_status in ["cancel", "branch_created"]:
+    @user_action
+    def _preview_selected_snapshot(self, event=None):
+        commit_info = self._get_selected_history_entry()
+        if not commit_info:
+            self._show_error("Please select a version from the history list to preview.")
             return
+        self._open_preview(commit_info)
 
-        all_items = self.hist_list.get_children('')
-        try:
-            selected_index = all_items.index(selected_item)
-        except ValueError:
-            self._show_error("Could not find the selected item. Please refresh and try again.")
+    def _open_preview(self, commit_info):
+        if self._preview_window and self._preview_window.winfo_exists(): self._preview_window.destroy()
+        branch = self.detached_from_branch if self.is_detached else self.active_branch
+        is_latest = bool(self.history) and self.history[0]['hash'] == commit_info['hash']
+        from preview_window import SnapshotPreviewWindow # Window modules load on first use, keeping them out of startup.
+        self._preview_window = SnapshotPreviewWindow(self, commit_info, branch, is_latest)
+
+    def _open_search_window(self, event=None):
+        if not self.git_helper: return
+        if self._search_window and self._search_window.winfo_exists():
+            self._search_window.lift()
             return
+        from search_window import HistorySearchWindow
+        self._search_window = HistorySearchWindow(self)
 
-        self.detached_commit_info = self.history[selected_index]
+    @user_action
+    def _load_historical_version(self, commit_info):
+        """Checks a past snapshot out into the project folder. Returns True once it is loaded."""
+        unsaved_status = self._handle_unsaved_changes()
+        if unsaved_status in ["cancel", "branch_created"]:
+            return False
+
+        self.detached_commit_info = commit_info
         
         if not self.is_detached:
             self.detached_from_branch = self.active_branch
 
-        self.is_viewing_latest = (selected_index == 0)
+        self.is_viewing_latest = bool(self.history) and self.history[0]['hash'] == commit_info['hash']
 
         self._save_session_state()
 
-        result = self.git_helper.checkout(self.detached_commit_info['hash'])
+        result = self._run_git(self.git_helper.checkout, self.detached_commit_info['hash'])
         if result["success"]:
-            self.update_ui_state()
-        else:
-            self._clear_session_state() # Clear potentially bad state
-            self._show_error(result["error"])
-            self.update_ui_state() # Refresh to a safe state
-
+            self.request_ui_refresh()
+            return True
+        self._clear_session_state() # Clear potentially bad state
+        self._show_error(result["error"])
+        self.request_ui_refresh() # Refresh to a safe state
+        return False
+
+    @user_action
     def _return_to_current(self):
         unsaved_status = self._handle_unsaved_changes()
         if unsaved_status in ["cancel", "branch_created"]:
             return
 
-        result = self.git_helper.checkout(self.detached_from_branch)
+        result = self._run_git(self.git_helper.checkout, self.detached_from_branch)
         if result["success"]:
             self._clear_session_state()
-            self.update_ui_state()
+            self.request_ui_refresh()
         else:
             self._show_error(result["error"])
 
-    def _restore_state_as_new_snapshot(self):
-        confirm_msg = f"This will create a new snapshot on the '{self.detached_from_branch}' branch that is an exact copy of the version you are viewing. Proceed?"
-        if not messagebox.askyesno("Confirm Restore", confirm_msg, parent=self): return
+    @user_action
+    def _restore_state_as_new_snapshot(self, commit_info=None):
+        """Restores a snapshot (the loaded past version by default) as a new snapshot. Returns True on success."""
+        commit_info = commit_info or self.detached_commit_info
+        target_branch = self.detached_from_branch if self.is_detached else self.active_branch
+        confirm_msg = f"This will create a new snapshot on the '{target_branch}' branch that is an exact copy of the version you are viewing. Proceed?"
+        if not messagebox.askyesno("Confirm Restore", confirm_msg, parent=self): return False
         
         unsaved_status = self._handle_unsaved_changes()
         if unsaved_status in ["cancel", "branch_created"]:
-            return
+            return False
 
-        old_subject = self.detached_commit_info.get('subject', 'an old version')
+        old_subject = commit_info.get('subject', 'an old version')
         new_commit_message = f"Restored state to: '{old_subject}'"
-        result = self.git_helper.restore_and_commit_past_state(
-            branch_to_restore_on=self.detached_from_branch,
-            old_commit_hash=self.detached_commit_info['hash'],
+        result = self._run_git(
+            self.git_helper.restore_and_commit_past_state,
+            branch_to_restore_on=target_branch,
+            old_commit_hash=commit_info['hash'],
             new_commit_message=new_commit_message
         )
         if result["success"]:
             self._clear_session_state()
-            self.update_ui_state()
+            self.request_ui_refresh()
             self.status_bar.config(text="Successfully restored state as a new snapshot.")
-        else:
+            return True
+        self._show_error(result["error"])
+        if self.is_detached: self._return_to_current()
+        return False
+
+    @user_action
+    def _restore_paths_from_snapshot(self, commit_info, paths, save_snapshot=False):
+        """Copies some files or folders of a past snapshot into the project folder, without loading the snapshot. Returns True on success."""
+        if self.is_detached:
+            self._show_error("Return to the current version before restoring files from a snapshot.")
+            return False
+        subject = commit_info.get('subject', 'an old version')
+        listed = "\n".join(paths[:10]) + (f"\n...and {len(paths) - 10} more" if len(paths) > 10 else "")
+        confirm_msg = f"Replace these files in your project folder with their versions from '{subject}'?\n\n{listed}"
+        if not messagebox.askyesno("Confirm Restore", confirm_msg, parent=self): return False
+        name = paths[0] if len(paths) == 1 else f"{len(paths)} items"
+        message = f"Restored {name} from: '{subject}'" if save_snapshot else None
+        result = self._run_git(self.git_helper.restore_snapshot_paths, commit_info['hash'], paths, commit_message=message)
+        self.request_ui_refresh()
+        if not result["success"]:
+            self._show_error(result["error"])
+            return False
+        count = len(result["data"]["paths"])
+        saved = " and saved them as a snapshot" if result["data"]["commit"] else ""
+        self.status_bar.config(text=f"Restored {count} file(s) from '{subject}'{saved}.")
+        return True
+
+    @user_action
+    def _new_branch_from_snapshot(self, commit_info):
+        """Creates a branch starting at a past snapshot and switches to it. Returns True on success."""
+        unsaved_status = self._handle_unsaved_changes()
+        if unsaved_status in ["cancel", "branch_created"]:
+            return False
+
+        branch_name = self._prompt_for_new_branch_name(
+            "New Branch From Snapshot",
+            f"Create a new branch starting from the snapshot '{commit_info.get('subject', '')}'.\n\nEnter a name for the new branch:"
+        )
+        if not branch_name: return False
+
+        result = self._run_git(self.git_helper.create_branch, branch_name, start_point=commit_info['hash'])
+        if result["success"]: result = self._run_git(self.git_helper.checkout, branch_name)
+        if not result["success"]:
             self._show_error(result["error"])
-            self._return_to_current()
+            self.request_ui_refresh()
+            return False
+        self._clear_session_state()
+        self.request_ui_refresh()
+        return True
 
+    @user_action
     def _new_branch_from_detached(self):
         branch_name = self._prompt_for_new_branch_name(
             "New Branch From Past",
@@ -264,35 +608,225 @@ class PermutationManager(tk.Tk):
         if not branch_name:
             return False
 
-        result = self.git_helper.create_branch(branch_name, start_point=self.detached_commit_info['hash'])
+        result = self._run_git(self.git_helper.create_branch, branch_name, start_point=self.detached_commit_info['hash'])
         if not result["success"]:
             self._show_error(result['error'])
-            self.update_ui_state()
+            self.request_ui_refresh()
             return False
 
-        if self.git_helper.has_changes():
+        if self._run_git(self.git_helper.has_changes, mutating=False):
             commit_message = simpledialog.askstring("Save Initial Snapshot", f"You have changes made while viewing the past.\n\nEnter a description to save them as the first snapshot on branch '{branch_name}':", parent=self)
             if commit_message:
-                commit_res = self.git_helper.commit(commit_message)
+                commit_res = self._run_git(self.git_helper.commit, commit_message)
                 if not commit_res["success"]:
                     self._show_error(f"Created branch '{branch_name}' but failed to save snapshot:\n{commit_res['error']}")
             else:
                  messagebox.showwarning("Changes Not Saved", f"Branch '{branch_name}' was created, but your unsaved changes were NOT saved as a snapshot. They remain as uncommitted changes.", parent=self)
         
         self._clear_session_state()
-        self.update_ui_state()
+        self.request_ui_refresh()
         return True
 
     def _load_config(self):
         try:
-            with open(APP_CONFIG_FILE, "r") as f: self.project_root = json.load(f).get("project_root")
-        except (FileNotFoundError, json.JSONDecodeError): self.project_root = None
+            with open(APP_CONFIG_FILE, "r") as f: config = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError): config = {}
+        self.project_root = config.get("project_root")
+        for root in config.get("projects", []): self.workspace.add(root)
+        if self.project_root: self.workspace.add(self.project_root)
 
     def _save_config(self):
         os.makedirs(os.path.dirname(APP_CONFIG_FILE), exist_ok=True)
-        with open(APP_CONFIG_FILE, "w") as f: json.dump({"project_root": self.project_root}, f, indent=2)
+        config = {"project_root": self.project_root, "projects": self.workspace.projects()}
+        with open(APP_CONFIG_FILE, "w") as f: json.dump(config, f, indent=2)
+
+    def _create_menu(self):
+        menubar = tk.Menu(self)
+        project_menu = tk.Menu(menubar, tearoff=False)
+        project_menu.add_command(label="Open Project Folder...", command=self._select_project)
+        project_menu.add_command(label="Workspace Dashboard...", accelerator="Ctrl+Shift+W", command=self._open_workspace_window)
+        menubar.add_cascade(label="Projects", menu=project_menu)
+        self.bind_all("<Control-Shift-W>", self._open_workspace_window)
+        history_menu = tk.Menu(menubar, tearoff=False)
+        history_menu.add_command(label="Search Snapshots...", accelerator="Ctrl+F", command=self._open_search_window)
+        history_menu.add_command(label="Export Selected Snapshot...", command=self._export_selected_snapshot)
+        menubar.add_cascade(label="History", menu=history_menu)
+        self.bind_all("<Control-f>", self._open_search_window)
+        settings_menu = tk.Menu(menubar, tearoff=False)
+        self.performance_profile_var = tk.BooleanVar(value=True)
+        settings_menu.add_checkbutton(label="Tune Git for Large Projects", variable=self.performance_profile_var, command=self._toggle_performance_profile)
+        settings_menu.add_command(label="Performance Report...", command=self._show_performance_report)
+        settings_menu.add_command(label="Tidy Up Repository Now", command=self._run_maintenance_now)
+        settings_menu.add_separator()
+        self.autosave_var = tk.BooleanVar(value=False)
+        settings_menu.add_checkbutton(label="Autosave Snapshots", variable=self.autosave_var, command=self._toggle_autosave)
+        settings_menu.add_command(label="Autosave Timing...", command=self._configure_autosave)
+        settings_menu.add_separator()
+        self.large_assets_var = tk.BooleanVar(value=False)
+        settings_menu.add_checkbutton(label="Large Asset Mode", variable=self.large_assets_var, command=self._toggle_large_assets)
+        settings_menu.add_command(label="Large Asset Settings...", command=self._configure_large_assets)
+        menubar.add_cascade(label="Settings", menu=settings_menu)
+        debug_menu = tk.Menu(menubar, tearoff=False)
+        debug_menu.add_command(label="Export Performance Trace...", command=self._export_performance_trace)
+        debug_menu.add_command(label="Clear Performance Trace", command=tracer.clear)
+        menubar.add_cascade(label="Debug", menu=debug_menu)
+        self.config(menu=menubar)
+
+    @user_action
+    def _toggle_performance_profile(self):
+        if not self.git_helper: return
+        report = self._run_git(self.git_helper.set_performance_profile_enabled, self.performance_profile_var.get())
+        self.git_helper.last_performance_report = report
+        self.status_bar.config(text=f"Git performance tuning {'enabled' if self.performance_profile_var.get() else 'disabled'} ({len(report)} setting(s) changed).")
+
+    @user_action
+    def _toggle_large_assets(self):
+        if not self.git_helper: return
+        enabled = self.large_assets_var.get()
+        self.status_bar.config(text=f"{'Moving' if enabled else 'Returning'} large files {'into' if enabled else 'from'} chunk storage...")
+        result = self._run_git(self.git_helper.set_large_asset_mode, enabled)
+        if not result["success"]:
+            self.large_assets_var.set(not enabled)
+            self._show_error(f"Could not change large-asset mode.\n\n{result['error']}")
+            return
+        self.status_bar.config(text=f"Large-asset mode {'enabled' if enabled else 'disabled'}.")
+        self.request_ui_refresh()
+
+    def _configure_large_assets(self):
+        if not self.git_helper: return
+        settings = self.git_helper.load_project_settings()
+        threshold = simpledialog.askinteger("Large Asset Settings", "Store matching files as chunks once they are bigger than how many MB?",
+                                            initialvalue=settings.get("large_asset_threshold_mb", LARGE_ASSET_THRESHOLD_MB), minvalue=1, maxvalue=100000, parent=self)
+        if threshold is None: return
+        settings["large_asset_threshold_mb"] = threshold
+        try:
+            self.git_helper.save_project_settings(settings)
+        except OSError as e:
+            self._show_error(f"Could not save the large-asset settings.\n\nError: {e}")
+            return
+        self.status_bar.config(text=f"Files over {threshold} MB are stored as chunks from their next snapshot on." if settings.get("large_assets") else f"Large-asset threshold set to {threshold} MB.")
+
+    def _save_autosave_settings(self, **changes):
+        settings = self.git_helper.load_project_settings()
+        settings.update(changes)
+        try:
+            self.git_helper.save_project_settings(settings)
+        except OSError as e:
+            self._show_error(f"Could not save the autosave settings.\n\nError: {e}")
+        self._autosave_policy = AutosavePolicy.from_settings(settings)
+
+    def _toggle_autosave(self):
+        if not self.git_helper: return
+        enabled = self.autosave_var.get()
+        self._save_autosave_settings(autosave=enabled)
+        self._cancel_autosave()
+        policy = self._autosave_policy
+        self.status_bar.config(text=f"Autosave {'enabled' if enabled else 'disabled'}." + (
+            f" Changes are saved after {policy.debounce_seconds}s without edits, at most every {policy.min_interval_seconds // 60} minute(s)." if enabled else ""))
+
+    def _configure_autosave(self):
+        if not self.git_helper: return
+        policy = self._autosave_policy or AutosavePolicy()
+        debounce = simpledialog.askinteger("Autosave Timing", "Save after how many seconds without further edits?",
+                                           initialvalue=policy.debounce_seconds, minvalue=1, maxvalue=3600, parent=self)
+        if debounce is None: return
+        interval = simpledialog.askinteger("Autosave Timing", "Make at most one autosave every how many minutes?",
+                                           initialvalue=max(1, policy.min_interval_seconds // 60), minvalue=1, maxvalue=1440, parent=self)
+        if interval is None: return
+        self._save_autosave_settings(autosave_debounce_seconds=debounce, autosave_min_interval_seconds=interval * 60)
+        if self.autosave_var.get(): self._schedule_autosave()
+
+    def _cancel_autosave(self):
+        if self._autosave_after_id: self.after_cancel(self._autosave_after_id)
+        self._autosave_after_id = None
+        if self._autosave_policy: self._autosave_policy.clear()
+
+    def _schedule_autosave(self, delay_ms=None):
+        if self._autosave_after_id: self.after_cancel(self._autosave_after_id)
+        self._autosave_after_id = None
+        if delay_ms is None:
+            due = self._autosave_policy.seconds_until_due()
+            if due is None: return
+            delay_ms = int(due * 1000)
+        self._autosave_after_id = self.after(delay_ms, self._run_autosave)
+
+    def _run_autosave(self):
+        """Commits the pending edits in the background. Past versions (detached mode) are never autosaved."""
+        self._autosave_after_id = None
+        if not self.git_helper or not self.autosave_var.get(): return
+        if self.is_detached:
+            self._autosave_policy.clear()
+            return
+        if self._action_depth or self.task_runner.is_busy():
+            self._schedule_autosave(AUTOSAVE_RETRY_MS)
+            return
+        helper, policy = self.git_helper, self._autosave_policy
+        started_at = policy.now()
+        def on_saved(save_res, error):
+            if helper is not self.git_helper: return
+            if error or not save_res["success"]:
+                self.status_bar.config(text=f"Autosave failed: {error or save_res['error'].splitlines()[-1]}")
+                policy.clear(started_at)
+            elif save_res["skipped"] == "conflicts":
+                policy.clear(started_at)
+                self.status_bar.config(text="Autosave paused: the project has unresolved conflicts.")
+            elif save_res["skipped"]:
+                policy.clear(started_at)
+            else:
+                policy.mark_saved(started_at)
+                self.status_bar.config(text=f"Autosaved {save_res['files']} file(s) at {time.strftime('%I:%M %p')}.")
+                self.request_ui_refresh()
+            # Edits made while the autosave ran get their own turn.
+            if policy is self._autosave_policy and policy.has_pending_changes(): self._schedule_autosave()
+        self.task_runner.submit(helper.autosave, mutating=True, quiet=True, on_done=on_saved)
+
+    def _show_performance_report(self):
+        if not self.git_helper: return
+        report = self.git_helper.last_performance_report
+        if not report:
+            messagebox.showinfo("Performance Report", "No Git settings were changed the last time this project was opened.", parent=self)
+            return
+        lines = [f"{item['setting']} = {item['value']}  ({item['action']})" for item in report]
+        messagebox.showinfo("Performance Report", "Git settings changed for this project:\n\n" + "\n".join(lines), parent=self)
+
+    def _export_selected_snapshot(self):
+        commit_info = self._get_selected_history_entry()
+        if not commit_info:
+            self._show_error("Please select a version from the history list to export.")
+            return
+        self._export_snapshot(commit_info)
+
+    @user_action
+    def _export_snapshot(self, commit_info):
+        """Saves a snapshot as an archive straight from the history; the project folder is not touched. Returns True on success."""
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{os.path.basename(self.project_root)}_{commit_info.get('subject', '')}")[:80].strip("_")
+        path = filedialog.asksaveasfilename(
+            title="Export Snapshot", defaultextension=".zip", initialfile=f"{name}.zip",
+            filetypes=[("Zip archive", "*.zip"), ("Gzipped tar", "*.tar.gz"), ("Zstandard tar", "*.tar.zst")], parent=self)
+        if not path: return False
+        self.status_bar.config(text=f"Exporting '{commit_info.get('subject', '')}'...")
+        result = self._run_git(self.git_helper.export_snapshot, commit_info['hash'], path, mutating=False)
+        if not result["success"]:
+            if not result.get("cancelled"): self._show_error(f"Could not export the snapshot.\n\n{result['error']}")
+            self.status_bar.config(text="Export cancelled." if result.get("cancelled") else "Export failed.")
+            return False
+        self.status_bar.config(text=f"Exported to {path} ({result['data']['bytes'] / (1024 * 1024):.1f} MB).")
+        return True
+
+    def _export_performance_trace(self):
+        path = filedialog.asksaveasfilename(
+            title="Export Performance Trace", defaultextension=".json", initialfile="gitsimply_trace.json",
+            filetypes=[("Chrome trace (JSON)", "*.json")], parent=self)
+        if not path: return
+        try:
+            count = tracer.export_chrome_trace(path)
+        except OSError as e:
+            self._show_error(f"Could not write the trace file.\n\nError: {e}")
+            return
+        self.status_bar.config(text=f"Exported {count} trace event(s). Open it in chrome://tracing or ui.perfetto.dev and attach it to your bug report.")
 
     def _create_widgets(self):
+        self._create_menu()
         # --- Welcome Screen (initially hidden) ---
         self.welcome_frame = ttk.Frame(self, padding=40)
         ttk.Label(self.welcome_frame, text="Welcome to GitSimply", font=("Segoe UI", 24, "bold")).pack(pady=(0, 10))
@@ -315,8 +849,18 @@ class PermutationManager(tk.Tk):
         # --- Main (Branch) View ---
         self.main_view_frame = ttk.Frame(self.left_pane)
         exp_frame = ttk.LabelFrame(self.main_view_frame, text="Branches", padding=10); exp_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        self.exp_list = tk.Listbox(exp_frame, exportselection=False, font=("Segoe UI Bold", 10)); self.exp_list.pack(fill=tk.BOTH, expand=True, pady=(0,5))
-        self.exp_list.bind("<<ListboxSelect>>", self._on_branch_select)
+        filter_frame = ttk.Frame(exp_frame); filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.branch_filter_var = tk.StringVar()
+        self.branch_filter_var.trace_add("write", lambda *args: self._render_branch_rows())
+        ttk.Entry(filter_frame, textvariable=self.branch_filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        self.exp_list = ttk.Treeview(exp_frame, columns=("name", "updated", "vs_main", "subject"), show="headings", selectmode="browse", height=6)
+        for column, title, width in (("name", "Branch", 150), ("updated", "Last Snapshot", 140), ("vs_main", "vs. main", 80), ("subject", "Latest Description", 160)):
+            self.exp_list.heading(column, text=title, command=lambda c=column: self._sort_branches_by(c))
+            self.exp_list.column(column, width=width, stretch=column in ("name", "subject"))
+        self.exp_list.tag_configure("active", background="#e0e8f0", font=("Segoe UI Bold", 10))
+        self.exp_list.pack(fill=tk.BOTH, expand=True, pady=(0,5))
+        self.exp_list.bind("<<TreeviewSelect>>", self._on_branch_select)
         exp_action_frame = ttk.Frame(exp_frame); exp_action_frame.pack(fill=tk.X)
         self.switch_button = ttk.Button(exp_action_frame, text="Switch to Selected Branch", command=self._switch_branch, state=tk.DISABLED); self.switch_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 2))
         self.delete_button = ttk.Button(exp_action_frame, text="Delete Selected Branch", command=self._delete_branch, state=tk.DISABLED); self.delete_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(2, 0))
@@ -347,37 +891,83 @@ class PermutationManager(tk.Tk):
         self.discard_button = ttk.Button(self.unsaved_changes_frame, text="Discard All Changes", command=self._discard_changes, style="Danger.TButton")
         self.discard_button.pack(side=tk.LEFT)
 
-        hist_tree_container = ttk.Frame(hist_frame)
-        hist_tree_container.pack(fill=tk.BOTH, expand=True, pady=5)
+        hist_pane = ttk.PanedWindow(hist_frame, orient=tk.VERTICAL)
+        hist_pane.pack(fill=tk.BOTH, expand=True, pady=5)
+        hist_tree_container = ttk.Frame(hist_pane)
+        hist_pane.add(hist_tree_container, weight=3)
         self.hist_list = ttk.Treeview(hist_tree_container, columns=('date', 'subject'), show='headings', selectmode='browse')
         self.hist_list.heading('date', text='Timestamp')
         self.hist_list.heading('subject', text='Snapshot Description')
         self.hist_list.column('date', width=160, stretch=tk.NO, anchor=tk.W)
         self.hist_list.column('subject', stretch=tk.YES, anchor=tk.W)
         self.hist_list.bind("<<TreeviewSelect>>", self._on_history_select)
-        scrollbar = ttk.Scrollbar(hist_tree_container, orient="vertical", command=self.hist_list.yview)
-        self.hist_list.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hist_list.bind("<Double-1>", self._preview_selected_snapshot)
+        self.hist_scrollbar = ttk.Scrollbar(hist_tree_container, orient="vertical", command=self.hist_list.yview)
+        self.hist_list.configure(yscrollcommand=self._on_history_scrolled)
+        self.hist_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.hist_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.hist_list.tag_configure('oddrow', background='#E6F2FF')
         self.hist_list.tag_configure('evenrow', background="#C2CDD6")
         self.hist_list.tag_configure('current_snapshot', background="#E4FFDD", font=('Segoe UI', 10, 'bold'))
         
+        # --- Changes of the selected snapshot ---
+        diff_frame = ttk.Frame(hist_pane); hist_pane.add(diff_frame, weight=2)
+        diff_header = ttk.Frame(diff_frame); diff_header.pack(fill=tk.X, pady=(5, 2))
+        ttk.Label(diff_header, text="Changes compared with:").pack(side=tk.LEFT)
+        self.diff_mode_var = tk.StringVar(value=DIFF_AGAINST_PARENT)
+        for mode, label in ((DIFF_AGAINST_PARENT, "Previous snapshot"), (DIFF_AGAINST_HEAD, "Current snapshot"), (DIFF_AGAINST_MARKED, "Marked snapshot")):
+            ttk.Radiobutton(diff_header, text=label, value=mode, variable=self.diff_mode_var, command=self._show_snapshot_diff).pack(side=tk.LEFT, padx=(5, 0))
+        self.diff_summary_label = ttk.Label(diff_header, text="", foreground="#666666"); self.diff_summary_label.pack(side=tk.RIGHT)
+        diff_tree_container = ttk.Frame(diff_frame); diff_tree_container.pack(fill=tk.BOTH, expand=True)
+        self.diff_list = ttk.Treeview(diff_tree_container, columns=('added', 'deleted'), selectmode='browse')
+        self.diff_list.heading('#0', text='File (expand to see the changed lines)')
+        self.diff_list.heading('added', text='Added'); self.diff_list.heading('deleted', text='Removed')
+        self.diff_list.column('added', width=70, stretch=tk.NO, anchor=tk.E); self.diff_list.column('deleted', width=70, stretch=tk.NO, anchor=tk.E)
+        self.diff_list.tag_configure('line_added', foreground="#1A7F37", font=('Consolas', 9))
+        self.diff_list.tag_configure('line_removed', foreground="#CF222E", font=('Consolas', 9))
+        self.diff_list.tag_configure('line_context', foreground="#444444", font=('Consolas', 9))
+        self.diff_list.bind("<<TreeviewOpen>>", self._on_diff_file_open)
+        diff_scrollbar = ttk.Scrollbar(diff_tree_container, orient="vertical", command=self.diff_list.yview)
+        self.diff_list.configure(yscrollcommand=diff_scrollbar.set)
+        diff_scrollbar.pack(side=tk.RIGHT, fill=tk.Y); self.diff_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
         hist_action_frame = ttk.Frame(hist_frame); hist_action_frame.pack(fill=tk.X)
-        self.history_action_button = ttk.Button(hist_action_frame, text="Enter Selected Snapshot", command=self._load_historical_version)
-        self.history_action_button.pack(expand=True, fill=tk.X)
-        self.status_bar = ttk.Label(self, text="Welcome!", relief=tk.SUNKEN, anchor=tk.W, padding=5)
+        self.history_action_button = ttk.Button(hist_action_frame, text="Preview Selected Snapshot", command=self._preview_selected_snapshot)
+        self.history_action_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 2))
+        self.mark_button = ttk.Button(hist_action_frame, text="Mark Selected for Comparison", command=self._mark_snapshot_for_diff)
+        self.mark_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(2, 0))
+        self.status_frame = ttk.Frame(self, relief=tk.SUNKEN)
+        self.latency_label = ttk.Label(self.status_frame, text="", anchor=tk.E, padding=5, foreground="#666666")
+        self.latency_label.pack(side=tk.RIGHT)
+        self.status_bar = ttk.Label(self.status_frame, text="Welcome!", anchor=tk.W, padding=5)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # Shown next to the status text only while a slow operation runs, see _show_progress_controls.
+        self.progress_bar = ttk.Progressbar(self.status_frame, length=180, mode="determinate", maximum=100)
+        self.cancel_button = ttk.Button(self.status_frame, text="Cancel", command=self._cancel_running_operation)
 
     def _get_selected_branch_name(self):
-        indices = self.exp_list.curselection()
-        if not indices:
-            return None
-        full_text = self.exp_list.get(indices[0])
-        return full_text.split(':')[-1].strip()
+        selected = self.exp_list.selection()
+        return selected[0] if selected else None # Rows are keyed by branch name.
 
     def _select_project(self):
         path = filedialog.askdirectory(title="Select Your Single Project Folder", parent=self)
-        if path: self._initialize_project(path)
+        if path: self._switch_project(path)
+
+    def _switch_project(self, path):
+        """Loads another project folder. Unsaved changes stay in their own folder, so nothing needs saving first."""
+        if self._action_depth or self.task_runner.is_busy(): return False
+        if not os.path.isdir(path):
+            self._show_error(f"The project folder no longer exists:\n{path}")
+            return False
+        self._initialize_project(path)
+        return True
+
+    def _open_workspace_window(self, event=None):
+        if self._workspace_window and self._workspace_window.winfo_exists():
+            self._workspace_window.lift(); self._workspace_window.refresh()
+            return
+        from workspace_window import WorkspaceWindow
+        self._workspace_window = WorkspaceWindow(self)
 
     def _open_project_folder(self):
         if not self.project_root or not os.path.isdir(self.project_root):
@@ -395,59 +985,109 @@ class PermutationManager(tk.Tk):
             self._show_error(f"Could not open the project folder.\n\nError: {e}")
 
     def _show_main_view(self):
-        self.detached_view_frame.pack_forget(); self.main_view_frame.pack(fill=tk.BOTH, expand=True)
-        branch_res = self.git_helper.get_all_branches()
+        branch_res = self._run_git(self.git_helper.get_branch_metadata, mutating=False)
         if not branch_res["success"]: self._show_error(branch_res["error"]); return
-        self.exp_list.delete(0, tk.END)
-        branches = sorted([b for b in branch_res["output"].split('\n') if b])
-        for i, branch in enumerate(branches):
-            is_active = branch == self.active_branch
-            display_text = f" << CURRENTLY LOADED>>: {branch}" if is_active else f"   {branch}"
-            self.exp_list.insert(tk.END, display_text)
-            if is_active:
-                self.exp_list.itemconfig(i, bg='#e0e8f0')
+        self._render_branch_list(branch_res["data"])
         self._update_history_for_branch(self.active_branch)
         self._on_branch_select()
 
+    def _render_branch_list(self, branches):
+        self.detached_view_frame.pack_forget(); self.main_view_frame.pack(fill=tk.BOTH, expand=True)
+        self._branches = branches
+        self._render_branch_rows()
+
+    def _sort_branches_by(self, column):
+        key, descending = self._branch_sort
+        self._branch_sort = (column, not descending if key == column else column in ("updated", "vs_main"))
+        self._render_branch_rows()
+
+    def _render_branch_rows(self):
+        """Redraws the branch list from the metadata in memory, applying the filter and sort order."""
+        selected = self._get_selected_branch_name()
+        needle = self.branch_filter_var.get().strip().lower()
+        rows = [b for b in self._branches if not needle or needle in b["name"].lower() or needle in b["subject"].lower()]
+        column, descending = self._branch_sort
+        sort_keys = {"name": lambda b: b["name"].lower(), "updated": lambda b: b["author_time"],
+                     "vs_main": lambda b: (b["ahead"] or 0, -(b["behind"] or 0)), "subject": lambda b: b["subject"].lower()}
+        rows.sort(key=sort_keys[column], reverse=descending)
+        self.exp_list.delete(*self.exp_list.get_children())
+        for branch in rows:
+            is_active = branch["name"] == self.active_branch
+            name = f"{branch['name']}  (loaded)" if is_active else branch["name"]
+            if branch["ahead"] is None: versus = ""
+            elif branch["name"] == "main": versus = "base"
+            else: versus = f"+{branch['ahead']} / -{branch['behind']}"
+            self.exp_list.insert("", "end", iid=branch["name"], values=(f" {name}", f" {branch['date']}", f" {versus}", f" {branch['subject']}"),
+                                 tags=("active",) if is_active else ())
+        if selected and self.exp_list.exists(selected): self.exp_list.selection_set(selected)
+        else: self._on_branch_select()
+
     def _show_detached_view(self):
+        self._render_detached_info()
+        self._update_history_for_branch(self.detached_from_branch)
+
+    def _render_detached_info(self):
         self.main_view_frame.pack_forget(); self.detached_view_frame.pack(fill=tk.BOTH, expand=True)
         info_text = (f"WITHIN BRANCH: {self.detached_from_branch}\n" f"LOADED SNAPSHOT: '{self.detached_commit_info.get('subject', 'N/A')}'")
         self.detached_info_label.config(text=info_text)
         self.restore_button.config(state=tk.DISABLED if self.is_viewing_latest else tk.NORMAL)
-        self._update_history_for_branch(self.detached_from_branch)
 
     def _update_history_for_branch(self, branch_name):
+        """Shows the first page of a branch's history; more rows load as the list is scrolled."""
         self.hist_label.config(text=f"'{branch_name}'")
-        hist_res = self.git_helper.get_history(branch_name)
         for item in self.hist_list.get_children():
             self.hist_list.delete(item)
-        if hist_res["success"]:
-            self.history = hist_res["data"]
-            for i, item in enumerate(self.history):
-                is_current_snapshot = False
-                if self.is_detached:
-                    # In detached mode, highlight the specific commit being viewed
-                    if item['hash'] == self.detached_commit_info.get('hash'):
-                        is_current_snapshot = True
-                else:
-                    # In normal mode, the "current" snapshot is the latest one (HEAD)
-                    if i == 0:
-                        is_current_snapshot = True
-                
-                tags_to_apply = []
-                if is_current_snapshot:
-                    tags_to_apply.append('current_snapshot')
-                else:
-                    tags_to_apply.append('oddrow' if i % 2 != 0 else 'evenrow')
-
-                self.hist_list.insert('', 'end', values=(f" {item['date']}", f" {item['subject']}"), tags=tuple(tags_to_apply))
+        if self._history_cursor: self._history_cursor.close()
+        self.history, self._history_loading = [], False
+        self._history_cursor = self.git_helper.open_history(branch_name)
+        page_res = self._run_git(self._history_cursor.next_page, HISTORY_PAGE_SIZE, mutating=False)
+        if page_res["success"]:
+            self._append_history_rows(page_res["data"])
         else:
-            self.history = []
-            self._show_error(hist_res["error"])
+            self._history_cursor = None
+            self._show_error(page_res["error"])
         self._on_history_select()
 
+    def _append_history_rows(self, entries):
+        for item in entries:
+            i = len(self.history)
+            self.history.append(item)
+            is_current_snapshot = False
+            if self.is_detached:
+                # In detached mode, highlight the specific commit being viewed
+                if item['hash'] == self.detached_commit_info.get('hash'):
+                    is_current_snapshot = True
+            else:
+                # In normal mode, the "current" snapshot is the latest one (HEAD)
+                if i == 0:
+                    is_current_snapshot = True
+
+            tags_to_apply = []
+            if is_current_snapshot:
+                tags_to_apply.append('current_snapshot')
+            else:
+                tags_to_apply.append('oddrow' if i % 2 != 0 else 'evenrow')
+
+            self.hist_list.insert('', 'end', values=(f" {item['date']}", f" {item['subject']}"), tags=tuple(tags_to_apply))
+
+    def _on_history_scrolled(self, first, last):
+        self.hist_scrollbar.set(first, last)
+        if float(last) >= HISTORY_PREFETCH_FRACTION: self._load_more_history()
+
+    def _load_more_history(self):
+        cursor = self._history_cursor
+        if not cursor or cursor.exhausted or self._history_loading: return
+        self._history_loading = True
+        def on_page(page_res, error):
+            if cursor is not self._history_cursor: return # The view moved on to another branch.
+            self._history_loading = False
+            if error or not page_res["success"]: return
+            self._append_history_rows(page_res["data"])
+        self.task_runner.submit(cursor.next_page, HISTORY_PAGE_SIZE, mutating=False, quiet=True, on_done=on_page)
+
     def _on_history_select(self, event=None):
         if not self.history_action_button.winfo_exists(): return
+        self._show_snapshot_diff()
         
         selected_items = self.hist_list.selection()
         if not selected_items:
@@ -471,13 +1111,91 @@ class PermutationManager(tk.Tk):
             if selected_hash == self.current_head_hash:
                 is_currently_viewed = True
 
+        # Previewing never touches the project folder, so even the current snapshot can be browsed.
         if is_currently_viewed:
-            self.history_action_button.config(state=tk.DISABLED, text="Currently Inside Snapshot")
+            self.history_action_button.config(state=tk.NORMAL, text="Preview Current Snapshot")
         else:
-            self.history_action_button.config(state=tk.NORMAL, text="Enter Selected Snapshot")
+            self.history_action_button.config(state=tk.NORMAL, text="Preview Selected Snapshot")
     
+    def _mark_snapshot_for_diff(self):
+        commit_info = self._get_selected_history_entry()
+        if not commit_info: return
+        self._diff_base = commit_info
+        self.mark_button.config(text=f"Marked: '{commit_info['subject'][:30]}'")
+        self.diff_mode_var.set(DIFF_AGAINST_MARKED)
+
+    def _show_snapshot_diff(self):
+        """Fills the changes list for the selected snapshot. Rows stream in from a background diff."""
+        self._diff_request += 1
+        request, self._diff_sides = self._diff_request, None
+        for item in self.diff_list.get_children(): self.diff_list.delete(item)
+        commit_info = self._get_selected_history_entry()
+        if not commit_info or not self.git_helper:
+            self.diff_summary_label.config(text="")
+            return
+        mode = self.diff_mode_var.get()
+        if mode == DIFF_AGAINST_MARKED and not self._diff_base:
+            self.diff_summary_label.config(text="Select a snapshot and click 'Mark Selected for Comparison' first.")
+            return
+        if mode == DIFF_AGAINST_HEAD and not self.current_head_hash:
+            self.diff_summary_label.config(text="There is no current snapshot to compare with yet. Save a snapshot first.")
+            return
+        if mode == DIFF_AGAINST_PARENT: old, new = None, commit_info['hash']
+        elif mode == DIFF_AGAINST_HEAD: old, new = commit_info['hash'], self.current_head_hash
+        else: old, new = self._diff_base['hash'], commit_info['hash']
+        self.diff_summary_label.config(text="Comparing...")
+        totals = {"files": 0, "added": 0, "deleted": 0}
+
+        def on_rows(rows):
+            if request != self._diff_request: return # The selection moved on.
+            for row in rows:
+                name = f"{row['old_path']} -> {row['path']}" if row['old_path'] else row['path']
+                added, deleted = ("binary", "") if row['binary'] else (f"+{row['added']}", f"-{row['deleted']}")
+                node = self.diff_list.insert('', 'end', text=name, values=(added, deleted))
+                self._diff_files[node] = row
+                self.diff_list.insert(node, 'end', iid=node + "::loading", text="Loading...")
+                totals["files"] += 1; totals["added"] += row['added']; totals["deleted"] += row['deleted']
+            self.diff_summary_label.config(text=f"{totals['files']} file(s)  +{totals['added']}  -{totals['deleted']}  (comparing...)")
+
+        def on_done(diff_res, error):
+            if request != self._diff_request: return
+            if error or not diff_res["success"]:
+                self.diff_summary_label.config(text=f"Could not compare: {error or diff_res['error']}")
+                return
+            self._diff_sides = (diff_res["data"]["old"], diff_res["data"]["new"])
+            if not totals["files"]: self.diff_summary_label.config(text="No file changes.")
+            else: self.diff_summary_label.config(text=f"{totals['files']} file(s)  +{totals['added']}  -{totals['deleted']}")
+
+        self._diff_files = {}
+        self.task_runner.submit(self.git_helper.get_diff_summary, new, old_hash=old, on_rows=self.task_runner.relay(on_rows),
+                                mutating=False, quiet=True, on_done=on_done)
+
+    def _on_diff_file_open(self, event=None):
+        """Loads a file's full diff the first time its row is expanded."""
+        node = self.diff_list.focus()
+        row = self._diff_files.get(node)
+        if row is None or not self._diff_sides or not self.diff_list.exists(node + "::loading"): return
+        request, (old, new) = self._diff_request, self._diff_sides
+        def on_diff(diff_res, error):
+            if request != self._diff_request or not self.diff_list.exists(node): return
+            for child in self.diff_list.get_children(node): self.diff_list.delete(child)
+            if error or not diff_res["success"]:
+                self.diff_list.insert(node, 'end', text=f"Could not load the changes: {error or diff_res['error']}")
+                return
+            lines = diff_res["data"]["text"].splitlines()
+            # Skip the diff header, everything from the first hunk on is shown.
+            start = next((i for i, line in enumerate(lines) if line.startswith("@@")), len(lines))
+            for line in lines[start:start + DIFF_MAX_LINES]:
+                tag = 'line_added' if line.startswith("+") else 'line_removed' if line.startswith("-") else 'line_context'
+                self.diff_list.insert(node, 'end', text=line.replace("\t", "    "), tags=(tag,))
+            if start == len(lines): self.diff_list.insert(node, 'end', text="(no line changes: renamed, binary or permissions only)")
+            if len(lines) - start > DIFF_MAX_LINES or diff_res["data"]["truncated"]:
+                self.diff_list.insert(node, 'end', text="... (diff too long, open the snapshot preview for the full file)")
+        self.task_runner.submit(self.git_helper.get_file_diff, new, row['path'], old_hash=old, old_path=row['old_path'],
+                                mutating=False, quiet=True, on_done=on_diff)
+
     def _handle_unsaved_changes(self):
-        if self.git_helper.has_changes():
+        if self._run_git(self.git_helper.has_changes, mutating=False):
             if self.is_detached:
                 msg = ("You have made changes while viewing a past version.\n\n"
                        "YES - Create a new branch from this point to save them.\n"
@@ -486,7 +1204,7 @@ class PermutationManager(tk.Tk):
                 response = messagebox.askyesnocancel("Unsaved Changes", msg, parent=self)
                 if response is None: return "cancel"
                 if response is True: return "branch_created" if self._new_branch_from_detached() else "cancel"
-                else: self.git_helper.discard_changes(); return "discarded"
+                else: self._run_git(self.git_helper.discard_changes); return "discarded"
             else:
                 msg = (f"You have unsaved changes in '{self.active_branch}'.\n\n"
                        "YES - Save them as a snapshot first.\n"
@@ -495,7 +1213,7 @@ class PermutationManager(tk.Tk):
                 response = messagebox.askyesnocancel("Unsaved Changes", msg, parent=self)
                 if response is None: return "cancel"
                 if response is True: return "saved" if self._save_snapshot() else "cancel"
-                else: self.git_helper.discard_changes(); return "discarded"
+                else: self._run_git(self.git_helper.discard_changes); return "discarded"
         return "clean"
     
     def _on_branch_select(self, event=None):
@@ -510,6 +1228,7 @@ class PermutationManager(tk.Tk):
         self.switch_button.config(state=tk.DISABLED if is_active else tk.NORMAL)
         self.delete_button.config(state=tk.DISABLED if is_active or is_main else tk.NORMAL)
 
+    @user_action
     def _switch_branch(self):
         target_branch = self._get_selected_branch_name()
         if not target_branch or target_branch == self.active_branch:
@@ -519,14 +1238,14 @@ class PermutationManager(tk.Tk):
         if unsaved_status in ["cancel", "branch_created"]:
             return
 
-        result = self.git_helper.checkout(target_branch)
-        if result["success"]: self.update_ui_state()
+        result = self._run_git(self.git_helper.checkout, target_branch)
+        if result["success"]: self.request_ui_refresh()
         else: self._show_error(result["error"])
 
     def _prompt_for_new_branch_name(self, title, prompt):
         """Prompts user for a new branch name with validation, returns name or None."""
         all_branches = []
-        branch_res = self.git_helper.get_all_branches()
+        branch_res = self._run_git(self.git_helper.get_all_branches, mutating=False)
         if branch_res["success"]:
             all_branches = branch_res["output"].split('\n')
 
@@ -552,6 +1271,7 @@ class PermutationManager(tk.Tk):
                 continue
             return name
 
+    @user_action
     def _new_branch(self):
         branch_name = self._prompt_for_new_branch_name(
             "Create New Branch",
@@ -559,39 +1279,41 @@ class PermutationManager(tk.Tk):
         )
         if not branch_name: return
 
-        result = self.git_helper.create_branch(branch_name, start_point=self.active_branch)
+        result = self._run_git(self.git_helper.create_branch, branch_name, start_point=self.active_branch)
         if not result["success"]:
             self._show_error(result['error'])
             return
         
-        if self.git_helper.has_changes():
+        if self._run_git(self.git_helper.has_changes, mutating=False):
             commit_message = simpledialog.askstring("Save Initial Snapshot", f"You have uncommitted changes.\n\nEnter a description to save them as the first snapshot on the new branch '{branch_name}':", parent=self)
             if commit_message:
-                commit_res = self.git_helper.commit(commit_message)
+                commit_res = self._run_git(self.git_helper.commit, commit_message)
                 if not commit_res["success"]:
                     self._show_error(f"Created branch '{branch_name}' but failed to save snapshot:\n{commit_res['error']}")
             else:
                 messagebox.showwarning("Changes Not Saved", f"Branch '{branch_name}' was created, but your unsaved changes were NOT saved as a snapshot. They remain as uncommitted changes.", parent=self)
         
-        self.update_ui_state()
+        self.request_ui_refresh()
 
+    @user_action
     def _save_snapshot(self):
-        if not self.git_helper.has_changes():
+        if not self._run_git(self.git_helper.has_changes, mutating=False):
             messagebox.showinfo("No Changes", "There are no changes to save.", parent=self)
             return False
             
         message = simpledialog.askstring(f"Save Snapshot in '{self.active_branch}'", "Enter a short description for the history:", parent=self)
         if not message: return False
-        result = self.git_helper.commit(message)
-        if result["success"]: self.update_ui_state(); return True
+        result = self._run_git(self.git_helper.commit, message)
+        if result["success"]: self.request_ui_refresh(); return True
         else: self._show_error(result['error']); return False
 
+    @user_action
     def _delete_branch(self):
         branch_to_delete = self._get_selected_branch_name()
         if not branch_to_delete or branch_to_delete == self.active_branch or branch_to_delete == 'main':
             return
         
-        is_merged_res = self.git_helper.is_branch_merged_into_any_other(branch_to_delete)
+        is_merged_res = self._run_git(self.git_helper.is_branch_merged_into_any_other, branch_to_delete, mutating=False)
         if not is_merged_res["success"]:
             self._show_error(f"Could not determine if branch is safe to delete.\n{is_merged_res['error']}")
             return
@@ -606,12 +1328,13 @@ class PermutationManager(tk.Tk):
             if not messagebox.askyesno("Confirm Deletion", f"Permanently delete the branch '{branch_to_delete}'? This cannot be undone.", parent=self):
                 return
         
-        result = self.git_helper.delete_branch(branch_to_delete)
+        result = self._run_git(self.git_helper.delete_branch, branch_to_delete)
         if result["success"]: 
-            self.update_ui_state()
+            self.request_ui_refresh()
         else: 
             self._show_error(result["error"])
 
+    @user_action
     def _discard_changes(self):
         confirm_msg = (
             "Are you sure you want to permanently discard all unsaved changes?\n\n"
@@ -619,10 +1342,10 @@ class PermutationManager(tk.Tk):
             "This action CANNOT be undone."
         )
         if messagebox.askyesno("Confirm Discard Changes", confirm_msg, icon='warning', parent=self):
-            result = self.git_helper.discard_changes()
+            result = self._run_git(self.git_helper.discard_changes)
             if result["success"]:
                 self.status_bar.config(text="All unsaved changes have been discarded.")
-                self.update_ui_state()
+                self.request_ui_refresh()
             else:
                 self._show_error(f"Failed to discard changes:\n{result['error']}")
         
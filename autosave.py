@@ -0,0 +1,55 @@
+# autosave.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import time
+
+AUTOSAVE_DEBOUNCE_SECONDS = 30 # Quiet time after the last change before an autosave.
+AUTOSAVE_MIN_INTERVAL_SECONDS = 300 # At most one autosave per this many seconds.
+AUTOSAVE_MAX_DELAY_FACTOR = 10 # Changes never wait longer than this many debounce windows, even during nonstop editing.
+
+class AutosavePolicy:
+    """
+    Decides when an autosave is due. Changes reset a debounce window, so a burst
+    of saves (an IDE's save-all, a formatter run) becomes one snapshot, and a
+    minimum interval between autosaves caps how many snapshots a busy session makes.
+    """
+    def __init__(self, debounce_seconds=AUTOSAVE_DEBOUNCE_SECONDS, min_interval_seconds=AUTOSAVE_MIN_INTERVAL_SECONDS, clock=time.monotonic):
+        self.debounce_seconds = debounce_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self._clock = clock
+        self._first_change, self._last_change, self._last_save = None, None, None
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get("autosave_debounce_seconds", AUTOSAVE_DEBOUNCE_SECONDS),
+                   settings.get("autosave_min_interval_seconds", AUTOSAVE_MIN_INTERVAL_SECONDS))
+
+    def record_change(self):
+        now = self._clock()
+        if self._first_change is None: self._first_change = now
+        self._last_change = now
+
+    def has_pending_changes(self):
+        return self._first_change is not None
+
+    def seconds_until_due(self):
+        """Seconds until an autosave should run, 0 if it is due now, or None if nothing changed."""
+        if self._first_change is None: return None
+        now = self._clock()
+        quiet_at = min(self._last_change + self.debounce_seconds, self._first_change + self.debounce_seconds * AUTOSAVE_MAX_DELAY_FACTOR)
+        allowed_at = self._last_save + self.min_interval_seconds if self._last_save is not None else now
+        return max(0.0, max(quiet_at, allowed_at) - now)
+
+    def now(self):
+        return self._clock()
+
+    def mark_saved(self, started_at=None):
+        """Records an autosave that started at `started_at`; changes made while it ran stay pending."""
+        self._last_save = self._clock()
+        self.clear(started_at)
+
+    def clear(self, started_at=None):
+        """Forgets the pending changes, except those recorded after `started_at`."""
+        if started_at is not None and self._last_change is not None and self._last_change > started_at:
+            self._first_change = started_at
+            return
+        self._first_change, self._last_change = None, None
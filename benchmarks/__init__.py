@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# Performance benchmarks for GitHelper and the UI refresh path.
+# Run from the project folder with: python -m benchmarks.run_benchmarks --help
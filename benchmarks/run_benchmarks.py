@@ -0,0 +1,178 @@
+# benchmarks/run_benchmarks.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import contextlib
+import platform
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from git_helper import GitHelper
+import gitsimply_api
+from benchmarks.synthetic_repo import generate_repo, DEFAULT_SPEC
+
+HISTORY_PAGE_SIZE = 200 # Same first page the history list shows.
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Runs in a fresh interpreter: the part of a launch that happens before the first paint, minus Tk itself.
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app, gitsimply_api
+imported = time.perf_counter()
+gitsimply_api.load_ui_cache(sys.argv[2])
+print((imported - start) * 1000, (time.perf_counter() - imported) * 1000, app.STARTUP_BUDGET_MS)
+"""
+
+def headless_refresh(helper, branch):
+    """The git work one PermutationManager.update_ui_state cycle does, minus the widgets."""
+    status = helper.get_repo_status()
+    branches = helper.get_branch_metadata()
+    cursor = helper.open_history(branch)
+    page = cursor.next_page(HISTORY_PAGE_SIZE)
+    cursor.close()
+    return status["success"] and branches["success"] and page["success"]
+
+def _time(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return _summarize(runs)
+
+def _summarize(runs):
+    return {"runs_ms": [round(r, 3) for r in runs], "median_ms": round(statistics.median(runs), 3), "min_ms": round(min(runs), 3), "max_ms": round(max(runs), 3)}
+
+def run_suite(repo, repeat):
+    results = {}
+    helper = GitHelper(repo)
+    try:
+        results["initialize_repo (existing)"] = _time(helper.initialize_repo, repeat)
+        results["get_history (full)"] = _time(lambda: helper.get_history("main"), repeat)
+        results["history first page"] = _time(lambda: helper.open_history("main").next_page(HISTORY_PAGE_SIZE), repeat)
+        results["has_changes"] = _time(helper.has_changes, repeat)
+        results["update_ui_state (headless)"] = _time(lambda: headless_refresh(helper, "main"), repeat)
+
+        counter = iter(range(1_000_000))
+        def touch_file():
+            with open(os.path.join(repo, "src", "bench_edit.txt"), "a", encoding="utf-8") as f:
+                f.write(f"edit {next(counter)}\n")
+        results["commit"] = _time(lambda: helper.commit("Benchmark snapshot"), repeat, setup=touch_file)
+
+        targets = iter(["experiment-000", "main"] * repeat)
+        results["checkout"] = _time(lambda: helper.checkout(next(targets)), repeat)
+        helper.checkout("main")
+
+        def cold_merge_check():
+            # A fresh helper per run, closed again so its cat-file workers don't pile up and skew later timings.
+            with contextlib.closing(GitHelper(repo)) as cold_helper:
+                return cold_helper.is_branch_merged_into_any_other("experiment-001")
+        results["is_branch_merged_into_any_other (cold)"] = _time(cold_merge_check, repeat)
+        results["is_branch_merged_into_any_other (warm)"] = _time(
+            lambda: helper.is_branch_merged_into_any_other("experiment-001"), repeat)
+
+        results["update_search_index (first run)"] = _time(helper.update_search_index, 1)
+        results["search_history"] = _time(lambda: helper.search_history("function_7_0_3"), repeat)
+
+        helper.start_watching()
+        helper.has_changes() # Seeds the watcher's dirty set.
+        results["has_changes (watched)"] = _time(helper.has_changes, repeat)
+        results["update_ui_state (headless, watched)"] = _time(lambda: headless_refresh(helper, "main"), repeat)
+    finally:
+        helper.close()
+    return results
+
+def run_startup(repo, repeat):
+    """Times importing the app and reading its warm-start cache in fresh processes, against the app's startup budget."""
+    helper = GitHelper(repo)
+    try:
+        page = helper.open_history("main").next_page(HISTORY_PAGE_SIZE)["data"]
+        branches = sorted(helper.get_branch_metadata()["data"], key=lambda b: b["name"])
+    finally:
+        helper.close()
+    gitsimply_api.save_ui_cache(repo, {
+        "head": page[0]["hash"], "is_detached": False, "active_branch": "main", "has_changes": False,
+        "detached_from_branch": "", "detached_commit_info": {}, "is_viewing_latest": False,
+        "branches": branches, "history_branch": "main",
+        "history": [{"hash": e["hash"], "date": e["date"], "subject": e["subject"]} for e in page]})
+    imports, cache_reads, budget = [], [], None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, PACKAGE_DIR, repo], capture_output=True, text=True, check=True).stdout.split()
+        imports.append(float(out[0])); cache_reads.append(float(out[1])); budget = int(out[2])
+    return {"startup: import app": _summarize(imports), "startup: load ui cache": _summarize(cache_reads)}, budget
+
+def run_initialize_new(workdir, spec, repeat):
+    """Times initialize_repo on a plain folder that has never been under git."""
+    def make_plain_copy():
+        target = os.path.join(workdir, "plain")
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(os.path.join(workdir, "repo"), target, ignore=shutil.ignore_patterns(".git"))
+        make_plain_copy.target = target
+    def init():
+        helper = GitHelper(make_plain_copy.target)
+        helper.initialize_repo()
+        helper.close()
+    return _time(init, repeat, setup=make_plain_copy)
+
+def compare(previous_path, current):
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"{'benchmark':45} {'before':>10} {'after':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before: continue
+        change = (result["median_ms"] / before["median_ms"] - 1) * 100 if before["median_ms"] else 0
+        print(f"{name:45} {before['median_ms']:>9.1f}ms {result['median_ms']:>9.1f}ms {change:>+7.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GitSimply against a generated repository.")
+    for key, value in DEFAULT_SPEC.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=value)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="A previous --output file to compare against.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated repository.")
+    args = parser.parse_args(argv)
+    spec = {key: getattr(args, key) for key in DEFAULT_SPEC}
+
+    workdir = tempfile.mkdtemp(prefix="gitsimply-bench-")
+    try:
+        repo = os.path.join(workdir, "repo")
+        start = time.perf_counter()
+        generate_repo(repo, **spec)
+        generation_s = time.perf_counter() - start
+        results = run_suite(repo, args.repeat)
+        startup_results, startup_budget_ms = run_startup(repo, args.repeat)
+        results.update(startup_results)
+        results["initialize_repo (new)"] = run_initialize_new(workdir, spec, min(args.repeat, 3))
+    finally:
+        if args.keep: print(f"Repository kept at {workdir}", file=sys.stderr)
+        else: shutil.rmtree(workdir, ignore_errors=True)
+
+    git_version = subprocess.run(["git", "version"], capture_output=True, text=True).stdout.strip()
+    report = {
+        "meta": {
+            "time": int(time.time()), "git": git_version, "python": platform.python_version(),
+            "platform": platform.platform(), "spec": spec, "repeat": args.repeat, "generation_s": round(generation_s, 2),
+            "startup_budget_ms": startup_budget_ms,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(args.compare, report)
+    else:
+        json.dump(report, sys.stdout, indent=2); print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/synthetic_repo.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import random
+import subprocess
+
+DEFAULT_SPEC = {
+    "commits": 500, # Snapshots on main.
+    "branches": 20, # Experiment branches, each forked from a random point on main.
+    "commits_per_branch": 10,
+    "files": 2000, # Tracked text files in the project.
+    "files_per_commit": 3, # Files edited by each snapshot.
+    "binary_files": 4, # Large tracked binaries (textures, audio...).
+    "binary_size_kb": 2048,
+    "untracked_files": 200, # Untracked noise left in the working tree.
+    "seed": 1,
+}
+
+def _file_path(index):
+    # Spread files over nested folders the way real projects are laid out.
+    return f"src/module_{index % 50:02d}/part_{index % 7}/file_{index:05d}.txt"
+
+def _text_blob(rng, index, revision):
+    lines = [f"def function_{index}_{revision}_{n}(value):\n    return value * {rng.randint(1, 1000)}\n" for n in range(12)]
+    return "".join(lines).encode("utf-8")
+
+def generate_repo(path, **overrides):
+    """
+    Builds a local GitSimply-style repository at `path` (which must not exist):
+    a long linear 'main' of snapshots, experiment branches forked off it,
+    large binaries and untracked files. History is written with
+    `git fast-import`, so thousands of commits take seconds rather than minutes.
+    Returns the spec that was used.
+    """
+    spec = dict(DEFAULT_SPEC, **overrides)
+    rng = random.Random(spec["seed"])
+    os.makedirs(path)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=path, check=True)
+    subprocess.run(["git", "config", "user.name", "GitSimply Bench"], cwd=path, check=True)
+    subprocess.run(["git", "config", "user.email", "bench@gitsimply.local"], cwd=path, check=True)
+
+    proc = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+    out = proc.stdin
+    mark, timestamp = 0, 1_600_000_000
+
+    def blob(data):
+        nonlocal mark
+        mark += 1
+        out.write(b"blob\nmark :%d\ndata %d\n" % (mark, len(data)) + data + b"\n")
+        return mark
+
+    def commit(ref, message, changes, parent=None):
+        nonlocal mark, timestamp
+        mark += 1; timestamp += 60
+        msg = message.encode("utf-8")
+        out.write(b"commit %s\nmark :%d\n" % (ref.encode(), mark))
+        out.write(b"committer GitSimply Bench <bench@gitsimply.local> %d +0000\n" % timestamp)
+        out.write(b"data %d\n" % len(msg) + msg + b"\n")
+        if parent: out.write(b"from :%d\n" % parent)
+        for file_path, blob_mark in changes:
+            out.write(b"M 100644 :%d %s\n" % (blob_mark, file_path.encode("utf-8")))
+        out.write(b"\n")
+        return mark
+
+    initial = [(_file_path(i), blob(_text_blob(rng, i, 0))) for i in range(spec["files"])]
+    for i in range(spec["binary_files"]):
+        initial.append((f"assets/texture_{i}.bin", blob(rng.randbytes(spec["binary_size_kb"] * 1024))))
+    main_commits = [commit("refs/heads/main", "Initial Project State", initial)]
+    for n in range(1, spec["commits"]):
+        changes = [(_file_path(i), blob(_text_blob(rng, i, n))) for i in rng.sample(range(spec["files"]), spec["files_per_commit"])]
+        main_commits.append(commit("refs/heads/main", f"Snapshot {n}: tweak parameters", changes, parent=main_commits[-1]))
+    for b in range(spec["branches"]):
+        tip = rng.choice(main_commits)
+        for n in range(spec["commits_per_branch"]):
+            changes = [(_file_path(i), blob(_text_blob(rng, i, 100000 + b * 1000 + n))) for i in rng.sample(range(spec["files"]), spec["files_per_commit"])]
+            tip = commit(f"refs/heads/experiment-{b:03d}", f"Experiment {b} step {n}", changes, parent=tip)
+    out.close()
+    if proc.wait() != 0: raise RuntimeError("git fast-import failed")
+
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=path, check=True)
+    for i in range(spec["untracked_files"]):
+        noise_path = os.path.join(path, "scratch", f"notes_{i:04d}.txt")
+        os.makedirs(os.path.dirname(noise_path), exist_ok=True)
+        with open(noise_path, "w", encoding="utf-8") as f:
+            f.write(f"scratch note {i}\n")
+    return spec
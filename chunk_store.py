@@ -0,0 +1,164 @@
+# chunk_store.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import sys
+import json
+import zlib
+import hashlib
+import itertools
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+# Large-asset mode. Files matching the managed .gitattributes patterns pass
+# through git's clean/smudge filters (main.py chunk-clean / chunk-smudge). Above a
+# size threshold, the clean side splits a file into content-defined chunks, stores
+# each chunk once under .gitsimply_meta/chunks and gives git a small pointer file
+# instead. The smudge side puts the file back together from the chunks.
+# Only imports the standard library, because git starts one of these per file.
+
+FILTER_NAME = "gitsimply-chunks"
+POINTER_HEADER = b"gitsimply-chunked v1\n"
+CHUNKS_DIR = "chunks"
+SETTINGS_PATH = os.path.join(".gitsimply_meta", "settings.json")
+DEFAULT_THRESHOLD_MB = 8 # Smaller matching files are stored in git as they are.
+CHUNK_MIN_BYTES = 256 * 1024
+CHUNK_MAX_BYTES = 4 * 1024 * 1024
+# Cut points: an occurrence of the anchor (every ~64 KB in compressed media) whose
+# preceding window hashes to 0 mod CHUNK_ACCEPT_ONE_IN. Both depend only on nearby
+# bytes, so an edit moves only the cuts next to it; chunks average about 1 MB.
+CHUNK_ANCHOR = b"\x5a\xc3"
+CHUNK_WINDOW_BYTES = 64
+CHUNK_ACCEPT_ONE_IN = 12
+READ_BLOCK_BYTES = 1024 * 1024
+SMUDGE_READ_WORKERS = 4
+SMUDGE_READ_AHEAD = 8 # Chunks read ahead of the one being written; bounds memory to a few MB.
+
+class ChunkStoreError(Exception):
+    pass
+
+def _find_cut(buffer):
+    limit = min(len(buffer), CHUNK_MAX_BYTES)
+    pos = buffer.find(CHUNK_ANCHOR, CHUNK_MIN_BYTES, limit)
+    while pos != -1:
+        if zlib.crc32(buffer[pos - CHUNK_WINDOW_BYTES:pos]) % CHUNK_ACCEPT_ONE_IN == 0: return pos
+        pos = buffer.find(CHUNK_ANCHOR, pos + 1, limit)
+    return limit
+
+def iter_chunks(read, initial=b""):
+    """Splits the stream behind `read(n)` (after `initial`) into content-defined chunks, holding at most CHUNK_MAX_BYTES."""
+    buffer, eof = bytearray(initial), False
+    while True:
+        while not eof and len(buffer) < CHUNK_MAX_BYTES:
+            block = read(READ_BLOCK_BYTES)
+            if block: buffer += block
+            else: eof = True
+        if not buffer: return
+        cut = _find_cut(buffer) if len(buffer) > CHUNK_MIN_BYTES else len(buffer)
+        yield bytes(buffer[:cut])
+        del buffer[:cut]
+
+def is_pointer(data):
+    return data.startswith(POINTER_HEADER)
+
+def parse_pointer(data):
+    """Returns (size, sha256, [(chunk_id, length), ...]) from a pointer file's bytes."""
+    try:
+        lines = data[len(POINTER_HEADER):].decode("ascii").split("\n")
+        size, digest = int(lines[0].split(" ")[1]), lines[1].split(" ")[1]
+        chunks = [(chunk_id, int(length)) for chunk_id, length in (line.split(" ") for line in lines[2:] if line)]
+    except (UnicodeDecodeError, IndexError, ValueError) as e:
+        raise ChunkStoreError(f"Damaged large-asset pointer: {e}")
+    return size, digest, chunks
+
+class ChunkStore:
+    """Content-addressed chunk files: <store>/<first two hex digits>/<rest of the sha256>."""
+    def __init__(self, path):
+        self.path = path
+
+    def _chunk_path(self, chunk_id):
+        return os.path.join(self.path, chunk_id[:2], chunk_id[2:])
+
+    def has(self, chunk_id):
+        return os.path.exists(self._chunk_path(chunk_id))
+
+    def put(self, data):
+        chunk_id = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(chunk_id)
+        if os.path.exists(path): return chunk_id # Already stored by an earlier version of some file.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f: f.write(data)
+        os.replace(temp_path, path)
+        return chunk_id
+
+    def get(self, chunk_id, length):
+        with open(self._chunk_path(chunk_id), "rb") as f: data = f.read()
+        if len(data) != length or hashlib.sha256(data).hexdigest() != chunk_id:
+            raise ChunkStoreError(f"Chunk {chunk_id} is damaged.")
+        return data
+
+    def clean(self, source, sink, threshold_bytes):
+        """Writes a pointer for the file on `source` to `sink`, storing its chunks. Small files and pointers pass through."""
+        initial = source.read(threshold_bytes)
+        if len(initial) < threshold_bytes or is_pointer(initial):
+            sink.write(initial)
+            for block in iter(lambda: source.read(READ_BLOCK_BYTES), b""): sink.write(block)
+            return False
+        whole, size, entries = hashlib.sha256(), 0, []
+        for chunk in iter_chunks(source.read, initial):
+            whole.update(chunk)
+            size += len(chunk)
+            entries.append(f"{self.put(chunk)} {len(chunk)}")
+        sink.write(POINTER_HEADER + f"size {size}\nsha256 {whole.hexdigest()}\n".encode("ascii") + "\n".join(entries).encode("ascii") + b"\n")
+        return True
+
+    def smudge(self, source, sink):
+        """Writes the file a pointer on `source` stands for to `sink`, reading chunks in parallel. Other content passes through."""
+        data = source.read(len(POINTER_HEADER))
+        if not is_pointer(data):
+            sink.write(data)
+            for block in iter(lambda: source.read(READ_BLOCK_BYTES), b""): sink.write(block)
+            return False
+        data += source.read()
+        size, digest, chunks = parse_pointer(data)
+        missing = [chunk_id for chunk_id, _ in chunks if not self.has(chunk_id)]
+        if missing:
+            # Leave the pointer in place (git sees it as unchanged) rather than write a broken file.
+            sink.write(data)
+            raise ChunkStoreError(f"{len(missing)} chunk(s) of this file are missing from {self.path}.")
+        whole, pending = hashlib.sha256(), collections.deque()
+        with ThreadPoolExecutor(max_workers=SMUDGE_READ_WORKERS) as pool:
+            queue = iter(chunks)
+            for chunk_id, length in itertools.islice(queue, SMUDGE_READ_AHEAD):
+                pending.append(pool.submit(self.get, chunk_id, length))
+            while pending:
+                chunk = pending.popleft().result()
+                for chunk_id, length in itertools.islice(queue, 1):
+                    pending.append(pool.submit(self.get, chunk_id, length))
+                whole.update(chunk)
+                sink.write(chunk)
+        if whole.hexdigest() != digest or sum(length for _, length in chunks) != size: raise ChunkStoreError("The reassembled file does not match its recorded checksum.")
+        return True
+
+def _threshold_bytes(project_root):
+    try:
+        with open(os.path.join(project_root, SETTINGS_PATH), "r", encoding="utf-8") as f:
+            threshold_mb = json.load(f).get("large_asset_threshold_mb", DEFAULT_THRESHOLD_MB)
+    except (OSError, ValueError, AttributeError):
+        threshold_mb = DEFAULT_THRESHOLD_MB
+    return max(1, int(float(threshold_mb) * 1024 * 1024))
+
+def filter_main(argv):
+    """Entry point for git's clean/smudge filters: `chunk-clean <path>` or `chunk-smudge <path>`, run in the project root."""
+    mode, path = argv[0], argv[1] if len(argv) > 1 else "?"
+    project_root = os.getcwd() # Git runs filters from the top of the working tree.
+    store = ChunkStore(os.path.join(project_root, ".gitsimply_meta", CHUNKS_DIR))
+    try:
+        if mode == "chunk-clean": store.clean(sys.stdin.buffer, sys.stdout.buffer, _threshold_bytes(project_root))
+        else: store.smudge(sys.stdin.buffer, sys.stdout.buffer)
+    except (ChunkStoreError, OSError) as e:
+        sys.stdout.buffer.flush()
+        print(f"GitSimply large-asset filter: {path}: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.buffer.flush()
+    return 0
@@ -0,0 +1,88 @@
+# cli.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import sys
+import json
+import argparse
+import gitsimply_api
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gitsimply", description="GitSimply without the window: snapshots and experiments from the command line.")
+    parser.add_argument("-C", "--project", action="append", dest="projects", metavar="FOLDER",
+                        help="Project folder to work on (default: the current folder). Repeat to run on several projects.")
+    parser.add_argument("--projects-from", metavar="FILE", help="Read more project folders from a file, one per line.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser.add_argument("--jobs", type=int, default=None, help="Projects to process in parallel (default: one per CPU).")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    commands.add_parser("init", help="Set a folder up for GitSimply (creates the repository if needed).")
+    commands.add_parser("status", help="Show the loaded branch and unsaved changes.")
+    snapshot = commands.add_parser("snapshot", help="Save the current state as a snapshot.")
+    snapshot.add_argument("-m", "--message", required=True, help="Description for the history.")
+    commands.add_parser("branches", help="List the experiments (branches).")
+    history = commands.add_parser("history", help="List the snapshots of a branch.")
+    history.add_argument("branch", nargs="?", help="Branch to list (default: the loaded one).")
+    history.add_argument("-n", "--limit", type=int, default=gitsimply_api.DEFAULT_HISTORY_LIMIT)
+    enter = commands.add_parser("enter", help="Load a past snapshot into the project folder.")
+    enter.add_argument("commit")
+    commands.add_parser("return", help="Return from a past snapshot to the branch it was entered from.")
+    restore = commands.add_parser("restore", help="Add a snapshot that is an exact copy of a past one.")
+    restore.add_argument("commit")
+    restore.add_argument("--branch", help="Branch to restore onto (default: the loaded or originating branch).")
+    restore.add_argument("-m", "--message")
+    branch_from = commands.add_parser("branch-from", help="Start a new branch at a past snapshot and switch to it.")
+    branch_from.add_argument("commit")
+    branch_from.add_argument("name")
+    commands.add_parser("discard", help="Permanently discard all unsaved changes.")
+    export = commands.add_parser("export", help="Write a snapshot to a .zip, .tar.gz or .tar.zst archive without loading it.")
+    export.add_argument("commit")
+    export.add_argument("destination", help="Archive path; the extension picks the format. {project} becomes the folder name.")
+    return parser
+
+def _operation_kwargs(args):
+    if args.command == "snapshot": return {"message": args.message}
+    if args.command == "history": return {"branch": args.branch, "limit": args.limit}
+    if args.command == "enter": return {"commit": args.commit}
+    if args.command == "restore": return {"commit": args.commit, "branch": args.branch, "message": args.message}
+    if args.command == "branch-from": return {"commit": args.commit, "name": args.name}
+    if args.command == "export": return {"commit": args.commit, "destination": os.path.abspath(args.destination)}
+    return {}
+
+def _print_result(command, result, show_project):
+    prefix = f"[{result['project']}] " if show_project else ""
+    if not result["success"]:
+        print(f"{prefix}error: {result['error']}", file=sys.stderr)
+        return
+    data = result.get("data")
+    if command == "status":
+        past = data["viewing_past"]
+        where = f"viewing past snapshot '{past['detached_commit_info'].get('subject', '')}' of '{past['detached_from_branch']}'" if past else f"on branch '{data['current_ref']}'"
+        print(f"{prefix}{where}, {len(data['entries'])} unsaved change(s)")
+        for entry in data["entries"]: print(f"{prefix}  {entry['index']}{entry['worktree']} {entry['path']}")
+    elif command == "branches":
+        for branch in data["details"]:
+            versus = "" if branch["ahead"] is None or branch["name"] == "main" else f"  (+{branch['ahead']}/-{branch['behind']} vs main)"
+            print(f"{prefix}{'*' if branch['name'] == data['current'] else ' '} {branch['name']:20} {branch['date']}  {branch['subject']}{versus}")
+    elif command == "history":
+        for entry in data: print(f"{prefix}{entry['hash'][:10]}  {entry['date']}  {entry['subject']}")
+    elif command == "export":
+        print(f"{prefix}wrote {data['path']} ({data['bytes'] / (1024 * 1024):.1f} MB, '{data['snapshot']['subject']}')")
+    else:
+        print(f"{prefix}{result.get('output') or 'done'}")
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    projects = list(args.projects or [])
+    if args.projects_from:
+        with open(args.projects_from, "r", encoding="utf-8") as f:
+            projects.extend(line.strip() for line in f if line.strip())
+    if not projects: projects = [os.getcwd()]
+    results = gitsimply_api.run_batch(projects, args.command, max_workers=args.jobs, **_operation_kwargs(args))
+    if args.json:
+        json.dump(results if len(results) > 1 else results[0], sys.stdout, indent=2); print()
+    else:
+        for result in results: _print_result(args.command, result, len(results) > 1)
+    return 0 if all(result["success"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
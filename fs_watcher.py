@@ -0,0 +1,254 @@
+# fs_watcher.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import sys
+import time
+import select
+import struct
+import fnmatch
+import threading
+
+DEBOUNCE_SECONDS = 0.2 # Quiet period before a batch of changes is handed out.
+MAX_BATCH_DELAY_SECONDS = 1.0 # A steady stream of writes still gets reported this often.
+POLL_INTERVAL_SECONDS = 2.0
+# Files inside .git that change whenever HEAD moves: a checkout rewrites HEAD and every
+# commit, reset or checkout appends to the HEAD reflog. info/exclude holds ignore rules,
+# so editing it changes what status reports. The index is left out on purpose,
+# since `git status` itself rewrites it to refresh stat data.
+REPOSITORY_STATE_FILES = {"HEAD", "logs/HEAD", "info/exclude"}
+GIT_STATE_DIRS = (".git", ".git/logs", ".git/info")
+
+class IgnoreRules:
+    """
+    A small matcher for the GitSimply-managed .gitignore patterns. It is only a
+    cheap pre-filter for watcher events: git itself stays the authority on
+    what is ignored, so unsupported syntax just lets events through.
+    """
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._rules = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith(("#", "!")): continue
+            dir_only = pattern.endswith("/")
+            # Like git: a leading slash, or a slash in the middle, ties the pattern to the root.
+            anchored = pattern.startswith("/") or "/" in pattern.rstrip("/")
+            pattern = pattern.strip("/")
+            self._rules.append((pattern, dir_only, anchored))
+
+    def is_ignored(self, rel_path, is_dir=False):
+        parts = rel_path.split("/")
+        for i, name in enumerate(parts):
+            component_is_dir = is_dir or i < len(parts) - 1
+            prefix = "/".join(parts[:i + 1])
+            for pattern, dir_only, anchored in self._rules:
+                if dir_only and not component_is_dir: continue
+                if fnmatch.fnmatchcase(prefix if anchored else name, pattern): return True
+        return False
+
+class WorktreeWatcher:
+    """
+    Watches a project folder and reports changed paths in debounced batches.
+    Uses inotify on Linux and falls back to periodic scanning elsewhere (or when
+    the inotify watch limit is reached).
+
+    `on_batch(paths, repository_changed, overflow)` is called on the watcher
+    thread: `paths` are changed worktree paths relative to the project root,
+    `repository_changed` means HEAD/index/refs changed, and `overflow` means
+    events were lost and the caller should do a full rescan.
+    """
+    def __init__(self, project_root, ignore_rules, on_batch):
+        self.project_root = project_root
+        self.ignore_rules = ignore_rules
+        self.on_batch = on_batch
+        self.backend_name = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._new_ignore_rules = None # Set from other threads; the watcher thread rebuilds its backend.
+        self._pending = False # Events seen but not yet handed to on_batch.
+
+    def _create_backend(self):
+        if sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(self.project_root, self.ignore_rules)
+            except OSError:
+                pass # No inotify, or out of watches.
+        return _PollingBackend(self.project_root, self.ignore_rules)
+
+    def start(self):
+        backend = self._create_backend()
+        self.backend_name = backend.name
+        self._thread = threading.Thread(target=self._run, args=(backend,), name="gitsimply-watcher", daemon=True)
+        self._thread.start()
+
+    def has_pending_events(self):
+        """True while changes have been seen that on_batch has not been told about yet."""
+        return self._pending
+
+    def set_ignore_rules(self, ignore_rules):
+        """Swaps in new ignore rules. Folders they no longer ignore start being watched from the next batch."""
+        self._new_ignore_rules = ignore_rules
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread(): self._thread.join(timeout=2)
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, backend):
+        try:
+            paths, repository_changed, overflow, first_event = set(), False, False, None
+            while not self._stop.is_set():
+                if self._new_ignore_rules is not None:
+                    self.ignore_rules, self._new_ignore_rules = self._new_ignore_rules, None
+                    backend.close()
+                    backend = self._create_backend()
+                    self.backend_name = backend.name
+                events = backend.read_events(timeout=DEBOUNCE_SECONDS, stop=self._stop)
+                for path, is_repository, is_overflow in events:
+                    if first_event is None: first_event, self._pending = time.monotonic(), True
+                    if is_overflow: overflow = True
+                    elif is_repository: repository_changed = True
+                    else: paths.add(path)
+                quiet = not events or backend.batches_are_settled
+                if first_event is not None and (quiet or time.monotonic() - first_event >= MAX_BATCH_DELAY_SECONDS):
+                    self.on_batch(paths, repository_changed, overflow)
+                    paths, repository_changed, overflow, first_event = set(), False, False, None
+                    self._pending = False
+        finally:
+            backend.close()
+
+class _InotifyBackend:
+    name = "inotify"
+    batches_are_settled = False
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW, IN_IGNORED = 0x400, 0x800, 0x4000, 0x8000
+    IN_ONLYDIR, IN_ISDIR, IN_CLOEXEC = 0x01000000, 0x40000000, 0o2000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+                  IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, project_root, ignore_rules):
+        import ctypes, ctypes.util
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.project_root = project_root
+        self.ignore_rules = ignore_rules
+        self._fd = self._libc.inotify_init1(self.IN_CLOEXEC)
+        if self._fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {} # watch descriptor -> directory path relative to the root ("" for the root).
+        try:
+            self._watch_tree("")
+            # Only the folders holding HEAD state are watched inside .git; the rest is noise.
+            for git_dir in GIT_STATE_DIRS: self._add_watch(git_dir)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir):
+        full = os.path.join(self.project_root, rel_dir) if rel_dir else self.project_root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(full), self.WATCH_MASK)
+        if wd < 0:
+            errno = self._ctypes.get_errno()
+            if errno in (2, 20): return # The folder vanished or was replaced by a file meanwhile.
+            raise OSError(errno, f"inotify_add_watch failed for {full}")
+        self._dirs[wd] = rel_dir
+
+    def _watch_tree(self, rel_dir):
+        self._add_watch(rel_dir)
+        full = os.path.join(self.project_root, rel_dir) if rel_dir else self.project_root
+        try:
+            entries = list(os.scandir(full))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False): continue
+            child = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if child == ".git" or self.ignore_rules.is_ignored(child, is_dir=True): continue
+            self._watch_tree(child)
+
+    def read_events(self, timeout, stop):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready: return []
+        data = os.read(self._fd, 64 * 1024)
+        events, offset = [], 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                events.append((None, False, True)); continue
+            if mask & self.IN_IGNORED:
+                self._dirs.pop(wd, None); continue
+            rel_dir = self._dirs.get(wd)
+            if rel_dir is None or not name: continue
+            if rel_dir in GIT_STATE_DIRS:
+                if f"{rel_dir}/{name}"[len(".git/"):] in REPOSITORY_STATE_FILES: events.append((None, True, False))
+                continue
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            is_dir = bool(mask & self.IN_ISDIR)
+            if rel_path == ".git" or self.ignore_rules.is_ignored(rel_path, is_dir=is_dir): continue
+            if is_dir and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                try:
+                    self._watch_tree(rel_path)
+                except OSError:
+                    events.append((None, False, True)) # Out of watches: ask for a full rescan.
+            events.append((rel_path, False, False))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd); self._fd = -1
+
+class _PollingBackend:
+    name = "polling"
+    batches_are_settled = True # Each scan already spans a whole poll interval.
+
+    def __init__(self, project_root, ignore_rules):
+        self.project_root = project_root
+        self.ignore_rules = ignore_rules
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        found, stack = {}, [""]
+        for name in REPOSITORY_STATE_FILES:
+            try:
+                st = os.stat(os.path.join(self.project_root, ".git", name))
+                found[f".git/{name}"] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = list(os.scandir(os.path.join(self.project_root, rel_dir) if rel_dir else self.project_root))
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if rel_path == ".git": continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if self.ignore_rules.is_ignored(rel_path, is_dir=is_dir): continue
+                    if is_dir:
+                        stack.append(rel_path)
+                    else:
+                        st = entry.stat(follow_symlinks=False)
+                        found[rel_path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def read_events(self, timeout, stop):
+        if stop.wait(POLL_INTERVAL_SECONDS): return []
+        previous, self._snapshot = self._snapshot, self._scan()
+        events = []
+        for path in previous.keys() | self._snapshot.keys():
+            if previous.get(path) == self._snapshot.get(path): continue
+            events.append((None, True, False) if path.startswith(".git/") else (path, False, False))
+        return events
+
+    def close(self):
+        pass
@@ -3,28 +3,163 @@
 import subprocess
 import os
 import shlex
+import time
+import threading
+import json
+import re
+import struct
+import platform
+import fnmatch
+import io
+import sys
+from contextlib import contextmanager
+from git_pool import GitProcessPool, CatFileError, hidden_startupinfo
+from reachability import ReachabilityIndex
+from history_cache import HistoryCache
+from snapshot_tree import SnapshotTree, SnapshotPathError, resolve_pointer_sizes
+from snapshot_diff import SnapshotDiffer, SnapshotDiffError
+from fs_watcher import WorktreeWatcher, IgnoreRules
+from git_stream import GitStream
+from maintenance import RepositoryMaintenance, MAINTENANCE_LOG_FILE
+from snapshot_export import format_for_path, format_error, write_archive
+from tracing import tracer
+from chunk_store import ChunkStore, ChunkStoreError, is_pointer, FILTER_NAME, CHUNKS_DIR, DEFAULT_THRESHOLD_MB as LARGE_ASSET_THRESHOLD_MB
 
 SESSION_META_DIR = ".gitsimply_meta"
+GITIGNORE_BLOCK_START = "# --- GitSimply Managed ---"
+GITIGNORE_BLOCK_END = "# --- End GitSimply Managed ---"
+SETTINGS_FILE = "settings.json"
+PERFORMANCE_REPORT_FILE = "performance_report.json"
+HISTORY_CACHE_FILE = "history_cache.json"
+SEARCH_INDEX_FILE = "search_index.sqlite"
+WATCH_RECHECK_LIMIT = 2000 # Bigger bursts (checkouts, unzips) are cheaper to resolve with one full status.
+RECHECK_COMMAND_CHARS = 24000 # Pathspec characters per recheck `status`; Windows caps a command line at 32767.
+# Tracked-file counts at which the heavier git accelerators start paying for themselves.
+MANY_FILES_THRESHOLD = 10000
+SPLIT_INDEX_THRESHOLD = 50000
+FSMONITOR_THRESHOLD = 10000
+HISTORY_DATE_FORMAT = "%Y-%m-%d %I:%M %p"
+RESTORE_BATCH_BYTES = 32 * 1024 * 1024 # File contents read from cat-file per batch when restoring; bounds memory.
+# Binary formats whose files are stored as chunks in large-asset mode (one .gitattributes pattern each).
+LARGE_ASSET_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.tif", "*.tiff", "*.bmp", "*.psd", "*.tga", "*.exr", "*.hdr", "*.kra",
+    "*.wav", "*.mp3", "*.ogg", "*.flac", "*.aif", "*.aiff", "*.mp4", "*.mov", "*.avi", "*.mkv", "*.webm",
+    "*.fbx", "*.obj", "*.blend", "*.max", "*.ma", "*.mb", "*.glb", "*.gltf", "*.ttf", "*.otf",
+    "*.zip", "*.7z", "*.rar", "*.pdf", "*.dll", "*.exe", "*.so", "*.dylib",
+]
+# Seconds before a streamed command is stopped. Override per project with the "operation_timeouts" setting.
+OPERATION_TIMEOUTS = {"checkout": 900, "add": 900, "reset": 900, "clean": 600, "log": 300, "archive": 3600}
 
 class GitHelper:
     def __init__(self, project_root):
         if not os.path.isdir(project_root): raise FileNotFoundError(f"Project root does not exist: {project_root}")
         self.project_root = project_root
+        # Read-only lookups go through long-lived cat-file workers instead of a new git per call.
+        self._pool = GitProcessPool(project_root)
+        # Status is cached only while a status_snapshot() block is open (one user action).
+        self._status_lock = threading.Lock()
+        self._status_cache, self._status_scope_depth = None, 0
+        self._reachability = ReachabilityIndex(self._run_command)
+        # Live dirty-path tracking, used once start_watching() has been called.
+        self._watcher, self._on_watch_change = None, None
+        self._dirty, self._dirty_valid, self._dirty_generation = {}, False, 0
+        self._verified_ignore_stamp = None # _ignore_stamp() as of the last full status.
+        self.last_performance_report = []
+        store_path = self._meta_path(HISTORY_CACHE_FILE) if self.load_project_settings().get("history_cache_on_disk", True) else None
+        self._history_cache = HistoryCache(self._read_commit, self._history_entry, store_path=store_path)
+        self._snapshot_tree = SnapshotTree(self._pool, project_root, pointer_candidate=self._large_asset_candidate)
+        self._differ = SnapshotDiffer(project_root)
+        self._search_index, self._search_index_lock = None, threading.Lock() # Opened on first use; see _get_search_index().
+        # Long commands run as GitStreams so they can report progress and be cancelled.
+        self._streams, self._streams_lock, self._progress = set(), threading.Lock(), None
+        self._maintenance = RepositoryMaintenance(project_root, self._meta_path(MAINTENANCE_LOG_FILE))
+        self._maintenance_thread, self._maintenance_result = None, None
 
-    def _run_command(self, command):
-        try:
-            cmd_list = ["git"] + shlex.split(command)
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO(); startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            result = subprocess.run(
-                cmd_list, cwd=self.project_root, capture_output=True, text=True, check=True, encoding='utf-8', startupinfo=startupinfo)
-            return {"success": True, "output": result.stdout.strip()}
-        except subprocess.CalledProcessError as e:
-            cmd_str = " ".join(e.cmd)
-            error_message = f"Command failed:\n`{cmd_str}`\n\nError Details:\n{e.stderr.strip()}"
-            return {"success": False, "error": error_message}
+    def close(self):
+        """Shuts down the pooled git processes, the watcher and any maintenance, and saves the history cache. Safe to call more than once."""
+        self._maintenance.stop()
+        self.stop_watching()
+        try:
+            self._history_cache.save()
+        except OSError:
+            pass # The cache is only an accelerator; losing it costs one slower first load.
+        if self._search_index: self._search_index.close()
+        self._pool.close()
+
+    def _run_command(self, command, input_text=None):
+        with tracer.span(f"git {command}", "subprocess") as trace:
+            try:
+                cmd_list = ["git"] + shlex.split(command)
+                result = subprocess.run(
+                    cmd_list, cwd=self.project_root, capture_output=True, text=True, check=True, encoding='utf-8', input=input_text, startupinfo=hidden_startupinfo())
+                trace["stdout_bytes"], trace["exit_status"] = len(result.stdout.encode('utf-8')), 0
+                return {"success": True, "output": result.stdout.strip()}
+            except subprocess.CalledProcessError as e:
+                trace["exit_status"] = e.returncode
+                cmd_str = " ".join(e.cmd)
+                error_message = f"Command failed:\n`{cmd_str}`\n\nError Details:\n{e.stderr.strip()}"
+                return {"success": False, "error": error_message}
+            except FileNotFoundError: return {"success": False, "error": "Git command not found. Is Git installed and in your system's PATH?"}
+
+    def stream_command(self, args, operation=None, input_bytes=None):
+        """
+        Starts `git <args>` and returns its GitStream handle for reading output as it
+        arrives. The command's timeout is looked up by `operation` (default: the
+        git subcommand); cancel_running() stops it. Call wait() or close() when done.
+        """
+        operation = operation or args[0]
+        timeouts = self.load_project_settings().get("operation_timeouts", {})
+        timeout = timeouts.get(operation, OPERATION_TIMEOUTS.get(operation)) if isinstance(timeouts, dict) else OPERATION_TIMEOUTS.get(operation)
+        stream = GitStream(self.project_root, args, timeout=timeout, input_bytes=input_bytes, on_progress=self._set_progress)
+        with self._streams_lock:
+            self._streams.add(stream)
+        return stream
+
+    def _finish_stream(self, stream, keep_output=False):
+        try:
+            result = stream.wait(keep_output=keep_output)
+        finally:
+            with self._streams_lock:
+                self._streams.discard(stream)
+                if not self._streams: self._progress = None
+        if result.get("cancelled") or result.get("timed_out"): self._remove_stale_index_lock(stream.started_at)
+        return result
+
+    def _run_streaming(self, args, operation=None, input_bytes=None, count_phase=None):
+        """
+        Runs a command through stream_command and returns the usual result dict.
+        For commands without --progress, `count_phase` reports each stdout line
+        (one per file for `clean`) as progress with an unknown total.
+        """
+        try:
+            stream = self.stream_command(args, operation=operation, input_bytes=input_bytes)
         except FileNotFoundError: return {"success": False, "error": "Git command not found. Is Git installed and in your system's PATH?"}
+        if count_phase:
+            for done, _ in enumerate(stream.lines(), 1):
+                self._set_progress({"phase": count_phase, "done": done, "total": None, "percent": None})
+        return self._finish_stream(stream)
+
+    def _set_progress(self, progress):
+        self._progress = progress
+
+    def current_progress(self):
+        """The latest {"phase", "done", "total", "percent"} of the running streamed command, or None."""
+        return self._progress
+
+    def cancel_running(self):
+        """Stops every streamed command in flight. Returns how many were stopped."""
+        with self._streams_lock:
+            streams = list(self._streams)
+        for stream in streams: stream.cancel()
+        return len(streams)
+
+    def _remove_stale_index_lock(self, started_at):
+        # A killed git can leave its index.lock behind, which would block every later command.
+        lock_path = os.path.join(self.project_root, ".git", "index.lock")
+        try:
+            if os.path.getmtime(lock_path) >= started_at - 1: os.remove(lock_path)
+        except OSError:
+            pass
 
     def initialize_repo(self):
         """
@@ -32,8 +167,18 @@ class GitHelper:
         existing one is configured correctly for this app.
         - Creates a comprehensive .gitignore to exclude common and app-specific files.
         - Creates an initial commit with the project's current state.
+        - Applies (or re-checks) the performance profile, unless the project opted out.
         """
+        result = self._initialize_repo_contents()
+        if result["success"] and "large_assets" in self.load_project_settings(): # Ever turned on: old snapshots may hold pointers.
+            self._apply_large_asset_filter() # Re-pointed in case the app has moved.
+        if result["success"]:
+            self.last_performance_report = self.apply_performance_profile()
+        return result
+
+    def _initialize_repo_contents(self):
         is_new_repo = not os.path.exists(os.path.join(self.project_root, ".git"))
+        self._invalidate_status()
 
         if is_new_repo:
             init_res = self._run_command("init -b main")
@@ -44,7 +189,7 @@ class GitHelper:
         gitignore_path = os.path.join(self.project_root, ".gitignore")
         
         gitignore_block = f"""
-# --- GitSimply Managed ---
+{GITIGNORE_BLOCK_START}
 # These entries are automatically managed by GitSimply to ignore app files,
 # caches, and other common files that should not be versioned.
 
@@ -78,14 +223,14 @@ yarn-error.log*
 # OS-specific
 .DS_Store
 Thumbs.db
-# --- End GitSimply Managed ---
+{GITIGNORE_BLOCK_END}
 """
         
         needs_write = True
         if os.path.exists(gitignore_path):
             with open(gitignore_path, "r", encoding='utf-8') as f:
                 content = f.read()
-                if "# --- GitSimply Managed ---" in content:
+                if GITIGNORE_BLOCK_START in content:
                     needs_write = False
         
         if needs_write:
@@ -108,8 +253,7 @@ Thumbs.db
 
         if is_new_repo:
             # We already committed .gitignore. Now, add all other files that might exist.
-            self._run_command("add .")
-            commit_res = self._run_command("commit -m 'Initial Project State'")
+            commit_res = self.commit("Initial Project State")
             # It's not an error if there were no other files to commit.
             if not commit_res["success"] and "nothing to commit" in commit_res.get("error", ""):
                 return {"success": True}
@@ -117,88 +261,933 @@ Thumbs.db
         
         return {"success": True}
 
+    def _resolve(self, rev):
+        """Resolves a revision to a full object id via the pool. Returns None if it doesn't exist."""
+        found = self._pool.query(rev, check_only=True)
+        return found[0] if found else None
+
+    def _read_head_ref(self):
+        """
+        Reads .git/HEAD directly, which is what `rev-parse --abbrev-ref HEAD` does
+        under the hood. Returns None when the layout is unusual (worktrees, etc.)
+        so callers can fall back to asking git.
+        """
+        head_path = os.path.join(self.project_root, ".git", "HEAD")
+        try:
+            with open(head_path, "r", encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if content.startswith("ref: refs/heads/"): return content[len("ref: refs/heads/"):]
+        if len(content) in (40, 64) and all(c in "0123456789abcdef" for c in content): return "HEAD"
+        return None
+
+    def _meta_path(self, name):
+        return os.path.join(self.project_root, SESSION_META_DIR, name)
+
+    def load_project_settings(self):
+        """Returns this project's GitSimply settings from .gitsimply_meta, or {} if there are none."""
+        try:
+            with open(self._meta_path(SETTINGS_FILE), "r", encoding='utf-8') as f:
+                settings = json.load(f)
+                return settings if isinstance(settings, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save_project_settings(self, settings):
+        os.makedirs(os.path.join(self.project_root, SESSION_META_DIR), exist_ok=True)
+        with open(self._meta_path(SETTINGS_FILE), "w", encoding='utf-8') as f:
+            json.dump(settings, f, indent=2)
+
+    def _filter_command(self, mode):
+        """The command git runs for one side of the large-asset filter, e.g. `"python" "main.py" chunk-clean %f`."""
+        if getattr(sys, "frozen", False): parts = [sys.executable] # Packaged build: the executable handles chunk-* itself.
+        else: parts = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")]
+        return " ".join(f'"{part.replace(os.sep, "/")}"' for part in parts) + f" {mode} %f"
+
+    def _large_asset_candidate(self, name):
+        """Whether a file name matches the large-asset patterns of a project that has ever used large-asset mode."""
+        settings = self.load_project_settings()
+        if "large_assets" not in settings: return False
+        return any(fnmatch.fnmatch(name, pattern) for pattern in settings.get("large_asset_patterns") or LARGE_ASSET_PATTERNS)
+
+    def _apply_large_asset_filter(self):
+        # Local config only: the commands point at this machine's Python and app folder.
+        for key, mode in (("clean", "chunk-clean"), ("smudge", "chunk-smudge")):
+            config_res = self._run_command(f"config filter.{FILTER_NAME}.{key} {shlex.quote(self._filter_command(mode))}")
+            if not config_res["success"]: return config_res
+        return {"success": True}
+
+    def _write_attributes_block(self, patterns):
+        """Rewrites the GitSimply-managed block of .gitattributes (removes it when `patterns` is empty). Returns True if the file changed."""
+        path = os.path.join(self.project_root, ".gitattributes")
+        try:
+            with open(path, "r", encoding='utf-8') as f: content = f.read()
+        except FileNotFoundError:
+            content = ""
+        kept, inside = [], False
+        for line in content.split('\n'):
+            if line.strip() == GITIGNORE_BLOCK_START: inside = True
+            elif line.strip() == GITIGNORE_BLOCK_END: inside = False
+            elif not inside: kept.append(line)
+        while kept and not kept[-1].strip(): kept.pop()
+        if patterns:
+            if kept: kept.append("")
+            kept += [GITIGNORE_BLOCK_START, "# Large-asset mode: these files are stored as chunks in .gitsimply_meta/chunks."]
+            kept += [f"{pattern} filter={FILTER_NAME} -diff -merge -text" for pattern in patterns]
+            kept.append(GITIGNORE_BLOCK_END)
+        new_content = "\n".join(kept) + "\n" if kept else ""
+        if new_content == content: return False
+        if new_content:
+            with open(path, "w", encoding='utf-8') as f: f.write(new_content)
+        else:
+            os.remove(path)
+        return True
+
+    def set_large_asset_mode(self, enabled, patterns=None, threshold_mb=None):
+        """
+        Turns large-asset mode on or off. Matching files above the size threshold
+        are then stored as deduplicated chunks outside git (git keeps a small
+        pointer), which keeps snapshots of big, often-edited binaries cheap.
+        Every tracked file is re-filtered and the switch is saved as a snapshot.
+        """
+        state_res = self.get_repo_status()
+        if not state_res["success"]: return state_res
+        if state_res["data"]["is_detached"]: return {"success": False, "error": "Return to a branch before changing large-asset mode."}
+        if state_res["data"]["has_changes"]: return {"success": False, "error": "Save or discard your unsaved changes before changing large-asset mode."}
+        settings = self.load_project_settings()
+        patterns = patterns or settings.get("large_asset_patterns") or LARGE_ASSET_PATTERNS
+        settings.update(large_assets=bool(enabled), large_asset_patterns=patterns,
+                        large_asset_threshold_mb=threshold_mb or settings.get("large_asset_threshold_mb", LARGE_ASSET_THRESHOLD_MB))
+        self.save_project_settings(settings)
+        # Configured even when turning the mode off: older snapshots still hold pointers that must be smudged.
+        filter_res = self._apply_large_asset_filter()
+        if not filter_res["success"]: return filter_res
+        self._invalidate_status()
+        if not self._write_attributes_block(patterns if enabled else None): return {"success": True, "output": "unchanged"}
+        # Re-run every tracked file through the new attributes so matching files switch storage now.
+        for stage in (lambda: self._stage_paths([".gitattributes"]), lambda: self._run_streaming(["add", "--renormalize", "."], operation="add")):
+            stage_res = stage()
+            if not stage_res["success"]: return stage_res
+        commit_res = self._commit_index("Turn on large-asset mode" if enabled else "Turn off large-asset mode")
+        if not commit_res["success"] and "nothing to commit" in commit_res.get("error", ""): return {"success": True, "output": "unchanged"}
+        return commit_res
+
+    def _count_tracked_files(self):
+        """Reads the entry count from the index header instead of listing every file."""
+        try:
+            with open(os.path.join(self.project_root, ".git", "index"), "rb") as f:
+                signature, _, count = struct.unpack(">4sII", f.read(12))
+            return count if signature == b"DIRC" else 0
+        except (OSError, struct.error):
+            return 0
+
+    def _git_version(self):
+        version_res = self._run_command("version")
+        match = re.search(r"(\d+)\.(\d+)", version_res.get("output", ""))
+        return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+    def _performance_profile(self, file_count):
+        """Picks the git settings worth enabling for a repository of this size."""
+        profile = {"core.untrackedCache": "true", "core.commitGraph": "true", "gc.writeCommitGraph": "true"}
+        if file_count >= MANY_FILES_THRESHOLD: profile["feature.manyFiles"] = "true"
+        if file_count >= SPLIT_INDEX_THRESHOLD: profile["core.splitIndex"] = "true"
+        # The built-in fsmonitor daemon only exists on Windows and macOS, from git 2.37 on.
+        if file_count >= FSMONITOR_THRESHOLD and platform.system() in ("Windows", "Darwin") and self._git_version() >= (2, 37):
+            profile["core.fsmonitor"] = "true"
+        return profile
+
+    def _local_config(self):
+        config_res = self._run_command("config --local --list -z")
+        config = {}
+        for item in config_res.get("output", "").split("\0"):
+            key, _, value = item.partition("\n")
+            if key: config[key.lower()] = value
+        return config
+
+    def apply_performance_profile(self):
+        """
+        Turns on git's own status/log accelerators (untracked cache, commit-graph,
+        manyFiles, split index, fsmonitor) sized to the repository, or removes them
+        if the project has turned the profile off. Values the user set themselves
+        are never touched. Returns a report: [{"setting", "value", "action"}].
+        """
+        settings = self.load_project_settings()
+        enabled = settings.get("performance_profile", True)
+        applied = dict(settings.get("performance_applied", {}))
+        config = self._local_config()
+        wanted = self._performance_profile(self._count_tracked_files()) if enabled else {}
+        report = []
+        for key, value in wanted.items():
+            current = config.get(key.lower())
+            if current == value: continue
+            if current is not None and applied.get(key) != current:
+                report.append({"setting": key, "value": current, "action": "kept existing value"})
+                continue
+            if self._run_command(f"config {key} {value}")["success"]:
+                applied[key] = value
+                report.append({"setting": key, "value": value, "action": "enabled"})
+        for key in [k for k in applied if k not in wanted]:
+            # Only undo what GitSimply set; a value changed by hand since then stays.
+            if config.get(key.lower()) == applied[key]:
+                self._run_command(f"config --unset {key}")
+                report.append({"setting": key, "value": applied[key], "action": "removed"})
+            del applied[key]
+        if enabled and config.get("core.commitgraph", "true") != "false" and not self._has_commit_graph():
+            if self._run_command("commit-graph write --reachable")["success"]:
+                report.append({"setting": "commit-graph", "value": "written", "action": "enabled"})
+        if applied != settings.get("performance_applied", {}) or "performance_profile" not in settings:
+            settings["performance_profile"], settings["performance_applied"] = enabled, applied
+            self.save_project_settings(settings)
+        if report:
+            with open(self._meta_path(PERFORMANCE_REPORT_FILE), "w", encoding='utf-8') as f:
+                json.dump({"time": int(time.time()), "changes": report}, f, indent=2)
+        return report
+
+    def set_performance_profile_enabled(self, enabled):
+        settings = self.load_project_settings()
+        settings["performance_profile"] = bool(enabled)
+        self.save_project_settings(settings)
+        return self.apply_performance_profile()
+
+    def _has_commit_graph(self):
+        info_dir = os.path.join(self.project_root, ".git", "objects", "info")
+        return os.path.exists(os.path.join(info_dir, "commit-graph")) or os.path.isdir(os.path.join(info_dir, "commit-graphs"))
+
     def get_current_state(self):
+        current_ref = self._read_head_ref()
+        if current_ref is not None:
+            return {"success": True, "data": {"current_ref": current_ref, "is_detached": current_ref == "HEAD"}}
         branch_res = self._run_command("rev-parse --abbrev-ref HEAD")
         if not branch_res["success"]: return branch_res
         current_ref = branch_res["output"]
         return {"success": True, "data": {"current_ref": current_ref, "is_detached": current_ref == "HEAD"}}
 
+    @contextmanager
+    def status_snapshot(self):
+        """
+        Within this block get_repo_status() runs git once and reuses the result, so
+        a single user action costs one status call no matter how many checks it
+        makes. Anything that changes the repository drops the cached result.
+        """
+        with self._status_lock:
+            self._status_scope_depth += 1
+        try:
+            yield
+        finally:
+            with self._status_lock:
+                self._status_scope_depth -= 1
+                if not self._status_scope_depth: self._status_cache = None
+
+    def _invalidate_status(self):
+        with self._status_lock:
+            self._status_cache = None
+            self._dirty_valid = False
+
+    def _managed_ignore_patterns(self):
+        """Returns the patterns inside the GitSimply-managed block of .gitignore."""
+        try:
+            with open(os.path.join(self.project_root, ".gitignore"), "r", encoding='utf-8') as f:
+                lines = f.read().split('\n')
+        except OSError:
+            return []
+        patterns, inside = [], False
+        for line in lines:
+            if line.strip() == GITIGNORE_BLOCK_START: inside = True
+            elif line.strip() == GITIGNORE_BLOCK_END: inside = False
+            elif inside: patterns.append(line)
+        return patterns
+
+    def start_watching(self, on_change=None):
+        """
+        Starts a filesystem watcher that keeps the set of dirty paths up to date,
+        so has_changes() and get_repo_status() can answer without a full
+        `git status`. `on_change(repository_changed)` is called from the watcher
+        thread after each batch of changes has been applied.
+        Returns the name of the watcher backend in use.
+        """
+        self.stop_watching()
+        self._on_watch_change = on_change
+        self._watcher = WorktreeWatcher(self.project_root, IgnoreRules(self._managed_ignore_patterns()), self._on_watch_batch)
+        self._watcher.start()
+        return self._watcher.backend_name
+
+    def stop_watching(self):
+        watcher, self._watcher = self._watcher, None
+        if watcher: watcher.stop()
+        self._invalidate_status()
+
+    def _is_watching(self):
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def _on_watch_batch(self, paths, repository_changed, overflow):
+        # A changed .gitignore (at any depth) can un-ignore or ignore whole folders, which a
+        # per-path recheck would never see; only a full status gets the dirty set right again.
+        ignore_rules_changed = any(_is_ignore_file(p) for p in paths)
+        if ".gitignore" in paths and self._watcher:
+            patterns = self._managed_ignore_patterns()
+            if patterns != self._watcher.ignore_rules.patterns: self._watcher.set_ignore_rules(IgnoreRules(patterns))
+        with self._status_lock:
+            self._status_cache = None
+            if repository_changed or overflow or ignore_rules_changed or len(paths) > WATCH_RECHECK_LIMIT: self._dirty_valid = False
+            recheck, generation = set(), self._dirty_generation
+            if self._dirty_valid and paths:
+                recheck = set(paths)
+                # An untracked folder is a single "dir/" entry; recheck it along with whatever changed inside.
+                for key in self._dirty:
+                    if key.endswith("/") and any(p.startswith(key) for p in paths): recheck.add(key.rstrip("/"))
+        if recheck: self._recheck_dirty_paths(recheck, generation)
+        if self._on_watch_change: self._on_watch_change(repository_changed or overflow)
+
+    def _recheck_dirty_paths(self, paths, generation):
+        """Re-runs status for just the changed paths and patches the dirty set with the answer."""
+        # `status` can't read pathspecs from stdin, so they go on the command line in runs
+        # that stay under Windows' 32K command-line limit.
+        batches, batch, length = [], [], 0
+        for path in sorted(paths):
+            pathspec = shlex.quote(f":(literal){path}")
+            if batch and length + len(pathspec) + 1 > RECHECK_COMMAND_CHARS:
+                batches.append(batch); batch, length = [], 0
+            batch.append(pathspec); length += len(pathspec) + 1
+        batches.append(batch)
+        entries = []
+        for batch in batches:
+            result = self._run_command(f"status --porcelain=v2 -z -- {' '.join(batch)}")
+            if not result["success"]: break
+            entries += _parse_status_v2(result["output"])["entries"]
+        with self._status_lock:
+            # A full status ran meanwhile and already saw these changes.
+            if generation != self._dirty_generation: return
+            if not result["success"]: self._dirty_valid = False; return
+            for key in list(self._dirty):
+                parts = key.rstrip("/").split("/")
+                if any("/".join(parts[:i]) in paths for i in range(1, len(parts) + 1)): del self._dirty[key]
+            for entry in entries: self._dirty[entry["path"]] = entry
+
+    def get_repo_status(self):
+        """
+        Returns branch, HEAD and working tree state from one
+        `git status --porcelain=v2 --branch -z` call. `data` holds:
+        - branch / current_ref / head / is_detached
+        - staged / unstaged / untracked / unmerged counts and has_changes
+        - entries: one dict per changed path
+        """
+        with self._status_lock:
+            if self._status_cache is not None: return self._status_cache
+            watched_entries = list(self._dirty.values()) if self._is_watching() and self._dirty_valid else None
+        status = self._status_from_watcher(watched_entries) if watched_entries is not None else None
+        if status is None:
+            status = self._full_status()
+            if not status["success"]: return status
+        with self._status_lock:
+            if self._status_scope_depth: self._status_cache = status
+        return status
+
+    def _full_status(self):
+        """Runs a full `git status` (never the watcher's dirty set) and reseeds the dirty set from it."""
+        with self._status_lock:
+            generation = self._dirty_generation
+        ignore_stamp = self._ignore_stamp()
+        result = self._run_command("status --porcelain=v2 --branch -z")
+        if not result["success"]: return result
+        status = {"success": True, "data": _parse_status_v2(result["output"])}
+        with self._status_lock:
+            self._verified_ignore_stamp = ignore_stamp
+            if self._is_watching() and generation == self._dirty_generation:
+                # Reseed the live set; later watcher batches patch it incrementally.
+                self._dirty = {entry["path"]: entry for entry in status["data"]["entries"]}
+                self._dirty_valid = True
+                self._dirty_generation += 1
+        return status
+
+    def _ignore_stamp(self):
+        """Modification times of the top-level ignore files, to notice edits the watcher hasn't reported yet."""
+        stamp = []
+        for path in (os.path.join(self.project_root, ".gitignore"), os.path.join(self.project_root, ".git", "info", "exclude")):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _status_for_staging(self):
+        """
+        The status a snapshot stages from. The watcher's dirty set is only used when
+        the ignore rules can't have moved under it; otherwise files that were just
+        un-ignored would never have entered the set and would be left out of the
+        snapshot. With a changed .gitignore among the entries, an invalid set, events
+        not yet delivered, or ignore files edited since the last full status, a full
+        status decides instead.
+        """
+        state_res = self.get_repo_status()
+        if not state_res["success"]: return state_res
+        if not self._is_watching(): return state_res # Already a full status.
+        with self._status_lock:
+            trusted = self._dirty_valid and self._verified_ignore_stamp == self._ignore_stamp()
+        watcher = self._watcher
+        if trusted and watcher and not watcher.has_pending_events() and not any(_is_ignore_file(e["path"]) for e in state_res["data"]["entries"]):
+            return state_res
+        with self._status_lock: self._status_cache = None
+        return self._full_status()
+
+    def _status_from_watcher(self, entries):
+        """Builds the get_repo_status() result from the live dirty set, without running `git status`."""
+        current_ref = self._read_head_ref()
+        if current_ref is None: return None
+        try:
+            head = self._resolve("HEAD")
+        except CatFileError:
+            return None
+        state = {
+            "branch": None if current_ref == "HEAD" else current_ref, "current_ref": current_ref,
+            "head": head, "is_detached": current_ref == "HEAD", "entries": sorted(entries, key=lambda e: e["path"]),
+        }
+        return {"success": True, "data": _tally_status(state)}
+
     def commit(self, message):
-        self._run_command("add .")
-        return self._run_command(f"commit -m {shlex.quote(message)}")
+        """
+        Snapshots the working tree. Only the paths `get_repo_status` reports as changed
+        are staged and hashed, so the cost follows the size of the change, not the project.
+        """
+        state_res = self._status_for_staging()
+        if not state_res["success"]: return state_res
+        return self._commit_entries(state_res["data"]["entries"], message)
+
+    def _commit_entries(self, entries, message):
+        self._invalidate_status()
+        stage_res = self._stage_entries(entries)
+        if not stage_res["success"]: return stage_res
+        return self._commit_index(message)
+
+    def _stage_entries(self, entries):
+        """
+        Stages status entries. Files go through one `update-index --add --remove --stdin`,
+        which hashes just those files (and drops deleted ones) without scanning the tree.
+        New folders, which status reports collapsed as "dir/", need `add` to apply .gitignore inside them.
+        """
+        # Fully staged entries have nothing left to add (and a staged deletion is no longer on disk or in the index).
+        pending = [entry["path"] for entry in entries if entry["kind"] == "untracked" or entry["worktree"] != "."]
+        files = [path for path in pending if not path.endswith("/")]
+        folders = [path for path in pending if path.endswith("/")]
+        if files:
+            update_res = self._run_command("update-index --add --remove -z --stdin", input_text="\0".join(files) + "\0")
+            if not update_res["success"]: return update_res
+        if folders: return self._stage_paths(folders)
+        return {"success": True}
+
+    def _commit_index(self, message):
+        """
+        Commits the index onto the checked-out branch with write-tree, commit-tree and
+        update-ref; write-tree reuses the index's cached trees, so only changed folders are rebuilt.
+        """
+        if os.path.exists(os.path.join(self.project_root, ".git", "MERGE_HEAD")):
+            return self._run_command(f"commit -m {shlex.quote(message)}") # Let git record the merge parents.
+        tree_res = self._run_command("write-tree")
+        if not tree_res["success"]: return tree_res
+        tree = tree_res["output"]
+        try:
+            head = self._resolve("HEAD")
+            head_tree = self._resolve("HEAD^{tree}") if head else None
+        except CatFileError as e:
+            return {"success": False, "error": str(e)}
+        if tree == head_tree: return {"success": False, "error": "nothing to commit, working tree clean"}
+        parent = f"-p {head} " if head else ""
+        commit_res = self._run_command(f"commit-tree {tree} {parent}-m {shlex.quote(message.strip())}")
+        if not commit_res["success"]: return commit_res
+        new_commit = commit_res["output"]
+        subject = message.strip().split("\n")[0]
+        reflog = f"commit: {subject}" if head else f"commit (initial): {subject}"
+        # The expected old value makes this fail instead of overwriting a branch that moved meanwhile.
+        ref_res = self._run_command(f"update-ref -m {shlex.quote(reflog)} HEAD {new_commit} {head or shlex.quote('')}")
+        if not ref_res["success"]: return ref_res
+        return {"success": True, "output": new_commit}
+
+    def _stage_paths(self, paths):
+        """Stages exactly these paths (additions, edits and deletions) instead of the whole tree."""
+        pathspecs = "\0".join(f":(literal){path}" for path in paths)
+        return self._run_streaming(["add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], input_bytes=pathspecs.encode("utf-8"))
+
+    def autosave(self, message=None):
+        """
+        Snapshots the changed paths onto the checked-out branch. Returns the commit
+        result, or {"success": True, "skipped": reason} when there is nothing to do
+        or the project is showing a past version (detached) or has a merge conflict.
+        """
+        state_res = self._status_for_staging()
+        if not state_res["success"]: return state_res
+        state = state_res["data"]
+        if state["is_detached"]: return {"success": True, "skipped": "detached"}
+        if state["unmerged"]: return {"success": True, "skipped": "conflicts"}
+        if not state["has_changes"]: return {"success": True, "skipped": "clean"}
+        paths = sorted(entry["path"] for entry in state["entries"])
+        if message is None:
+            first = paths[0].rstrip("/").rsplit("/", 1)[-1]
+            message = f"Autosave: {first}" + (f" and {len(paths) - 1} other file(s)" if len(paths) > 1 else "")
+        commit_res = self._commit_entries(state["entries"], message)
+        if commit_res["success"]: commit_res.update(skipped=None, files=len(paths))
+        return commit_res
 
     def restore_and_commit_past_state(self, branch_to_restore_on, old_commit_hash, new_commit_message):
-        """Checks out a branch, overwrites its files with an old state, and commits it."""
-        checkout_res = self.checkout(branch_to_restore_on)
-        if not checkout_res["success"]: return checkout_res
+        """
+        Adds a snapshot on a branch that is an exact copy of an old state.
+        The commit is built straight from the old commit's tree object (commit-tree
+        plus update-ref), then HEAD moves onto the branch with a two-tree read-tree,
+        which only rewrites the files that differ from what is checked out now.
+        """
+        self._invalidate_status()
+        branch_ref = f"refs/heads/{branch_to_restore_on}"
+        try:
+            tip, tree = self._resolve(branch_ref), self._resolve(f"{old_commit_hash}^{{tree}}")
+            tip_tree, head = self._resolve(f"{branch_ref}^{{tree}}"), self._resolve("HEAD")
+        except CatFileError as e:
+            return {"success": False, "error": f"Could not read the project history:\n{e}"}
+        if tip is None: return {"success": False, "error": f"Branch '{branch_to_restore_on}' could not be found."}
+        if tree is None: return {"success": False, "error": f"The snapshot to restore could not be found: did not match any file(s) known to git ({old_commit_hash})"}
+        if tree == tip_tree: return {"success": False, "error": "nothing to commit, working tree clean"}
+        # With no checked-out commit (an unborn branch) there is nothing to sync the folder from; stop before any ref moves.
+        if head is None: return {"success": False, "error": "The project has no saved snapshot checked out, so a past state can't be restored onto it. Switch to an existing branch first."}
+
+        commit_res = self._run_command(f"commit-tree {tree} -p {tip} -m {shlex.quote(new_commit_message)}")
+        if not commit_res["success"]: return commit_res
+        new_commit = commit_res["output"]
+        reflog_msg = shlex.quote(f"GitSimply: {new_commit_message}")
+        # Passing the old tip makes the update fail if the branch moved in the meantime.
+        ref_res = self._run_command(f"update-ref -m {reflog_msg} {branch_ref} {new_commit} {tip}")
+        if not ref_res["success"]: return ref_res
 
-        restore_res = self._run_command(f"checkout {shlex.quote(old_commit_hash)} -- .")
-        if not restore_res["success"]: return restore_res
+        # Sync from the commit that was checked out before the ref moved; if HEAD is
+        # attached to this branch, "HEAD" itself already points at the new commit.
+        sync_res = self._run_command(f"read-tree -m -u {head} {new_commit}")
+        if not sync_res["success"]:
+            self._run_command(f"update-ref -m {shlex.quote('GitSimply: undo failed restore')} {branch_ref} {tip} {new_commit}")
+            return sync_res
+        head_res = self._run_command(f"symbolic-ref -m {reflog_msg} HEAD {branch_ref}")
+        if not head_res["success"]: return head_res
+        return {"success": True, "output": new_commit}
 
-        return self.commit(new_commit_message)
-    
     def is_branch_merged_into_any_other(self, branch_to_check):
         """Checks if a branch's history is contained in any other branch."""
-        all_branches_res = self.get_all_branches()
-        if not all_branches_res["success"]:
-            return {"success": False, "error": all_branches_res["error"]}
-        
-        all_branches = all_branches_res["output"].split('\n')
-        other_branches = [b for b in all_branches if b.strip() and b.strip() != branch_to_check]
-
-        if not other_branches:
-            # If there are no other branches, it can't be merged into them.
-            return {"success": True, "is_merged": False}
-
-        # Check if `branch_to_check` is an ancestor of any other branch.
-        for other_branch in other_branches:
-            # Get list of branches that are fully merged into `other_branch`.
-            merged_list_res = self._run_command(f"branch --merged {shlex.quote(other_branch)}")
-            if not merged_list_res["success"]:
-                # If we can't check, assume the worst to be safe.
-                return {"success": False, "error": f"Failed to check merge status against branch '{other_branch}'."}
-            
-            # The output contains branch names, prefixed with '*' if it's the current one.
-            merged_branches = [b.strip().replace('* ', '') for b in merged_list_res["output"].split('\n')]
-            
-            if branch_to_check in merged_branches:
-                # We found one! Its work is contained elsewhere, so it's safe to delete.
-                return {"success": True, "is_merged": True}
-        
-        # We looped through all other branches and none contained this one's work.
-        return {"success": True, "is_merged": False}
+        status_res = self.get_branch_merge_status()
+        if not status_res["success"]:
+            # If we can't check, assume the worst to be safe.
+            return {"success": False, "error": status_res["error"]}
+        return {"success": True, "is_merged": status_res["data"].get(branch_to_check, False)}
 
+    def get_branch_merge_status(self):
+        """
+        Returns {branch: is_merged} for every local branch, answered from the
+        cached reachability index rather than one `branch --merged` per branch.
+        """
+        return self._reachability.merged_status()
 
     def get_all_branches(self):
         return self._run_command("branch --format='%(refname:short)'")
+
+    def get_branch_metadata(self, base="main"):
+        """
+        One row per branch from a single `for-each-ref`: {"name", "hash", "author_time",
+        "date", "subject", "ahead", "behind"}. Ahead/behind count commits against
+        `base` from the reachability index (None if `base` doesn't exist).
+        """
+        fmt = "%(objectname)%00%(refname:short)%00%(authordate:unix)%00%(contents:subject)"
+        refs_res = self._run_command(f"for-each-ref refs/heads --format={shlex.quote(fmt)}")
+        if not refs_res["success"]: return refs_res
+        rows, tips = [], {}
+        for line in refs_res["output"].split("\n"):
+            parts = line.split("\0")
+            if len(parts) != 4: continue
+            oid, name, author_time, subject = parts
+            author_time = int(author_time) if author_time.isdigit() else 0
+            tips[name] = oid
+            rows.append({"name": name, "hash": oid, "author_time": author_time, "subject": subject,
+                         "date": time.strftime(HISTORY_DATE_FORMAT, time.localtime(author_time))})
+        graph_res = self._reachability.update_tips(tips)
+        counts = self._reachability.ahead_behind(base) if graph_res["success"] else {}
+        for row in rows: row["ahead"], row["behind"] = counts.get(row["name"], (None, None))
+        return {"success": True, "data": rows}
     def has_changes(self):
-        return bool(self._run_command("status --porcelain")["output"])
+        status_res = self.get_repo_status()
+        return status_res["success"] and status_res["data"]["has_changes"]
     def checkout(self, target):
-        return self._run_command(f"checkout {shlex.quote(target)}")
+        self._invalidate_status()
+        return self._run_streaming(["checkout", "--progress", target])
     def create_branch(self, new_branch_name, start_point='main'):
         return self._run_command(f"branch {shlex.quote(new_branch_name)} {shlex.quote(start_point)}")
     def delete_branch(self, branch_name):
         return self._run_command(f"branch -D {shlex.quote(branch_name)}")
     def get_current_commit_hash(self):
         """Returns the full hash of the current commit (HEAD)."""
-        return self._run_command("rev-parse HEAD")
+        try:
+            head = self._resolve("HEAD")
+        except CatFileError:
+            return self._run_command("rev-parse HEAD")
+        if head is None: return self._run_command("rev-parse HEAD") # Let git produce the real error message.
+        return {"success": True, "output": head}
+
+    def _read_commit(self, oid):
+        """Reads and parses one commit object through the pool."""
+        found = self._pool.query(oid)
+        if not found or found[1] != "commit": return None
+        return _parse_commit(found[0], found[3])
+
+    def _history_entry(self, commit):
+        return {"hash": commit["hash"], "date": time.strftime(HISTORY_DATE_FORMAT, time.localtime(commit["author_time"])),
+                "subject": commit["subject"], "author_time": commit["author_time"]}
+
+    def get_commit_info(self, rev):
+        """The history entry ({"hash", "date", "subject", "author_time"}) for one snapshot, or None if it doesn't exist."""
+        oid = self._resolve(f"{rev}^{{commit}}")
+        commit = self._read_commit(oid) if oid else None
+        return self._history_entry(commit) if commit else None
+
+    def iter_history(self, branch_name):
+        """
+        Yields history entries ({"hash", "date", "subject"}) newest first, one at a
+        time, so callers only pay for the commits they actually display. Entries
+        come from the history cache when the branch tip hasn't moved.
+        """
+        produced = 0
+        try:
+            tip = self._resolve(branch_name)
+            if tip is None: return
+            history = self._history_cache.history_for(branch_name, tip)
+            for entry in self._history_cache.iter_entries(history):
+                yield entry
+                produced += 1
+            return
+        except CatFileError:
+            pass
+        # The pool is unavailable; continue from where it stopped with a streamed `git log`.
+        yield from self._stream_history_from_log(branch_name, skip=produced)
+
+    def open_history(self, branch_name):
+        """Returns a HistoryCursor that pages through a branch's history on demand."""
+        return HistoryCursor(self.iter_history(branch_name))
+
     def get_history(self, branch_name):
-        sep, date_format = "|||GIT_SEP|||", "--date=format-local:'%Y-%m-%d %I:%M %p'"
-        command = f"log {shlex.quote(branch_name)} --pretty=format:'%H{sep}%ad{sep}%s' {date_format} --"
-        result = self._run_command(command)
-        history = []
-        if result["success"] and result["output"]:
-            for line in result["output"].split('\n'):
+        return {"success": True, "data": list(self.iter_history(branch_name))}
+
+    def _stream_history_from_log(self, branch_name, skip=0):
+        sep, date_format = "|||GIT_SEP|||", f"--date=format-local:{HISTORY_DATE_FORMAT}"
+        try:
+            stream = self.stream_command(["log", branch_name, f"--pretty=format:%H{sep}%ad{sep}%s", date_format, f"--skip={skip}", "--"])
+        except FileNotFoundError:
+            return
+        try:
+            # Git log provides newest first, which is the order we use.
+            for line in stream.lines():
                 parts = line.split(sep)
-                if len(parts) == 3: history.append({"hash": parts[0], "date": parts[1], "subject": parts[2]})
-        # Git log provides newest first, which is the order we use.
-        return {"success": True, "data": history}
+                if len(parts) == 3: yield {"hash": parts[0], "date": parts[1], "subject": parts[2]}
+        finally:
+            stream.close() # Stops git if the reader stopped early.
+            with self._streams_lock: self._streams.discard(stream)
+
+    def list_snapshot_directory(self, commit_hash, path=""):
+        """Lists one folder of a past snapshot without checking it out."""
+        try:
+            return {"success": True, "data": self._snapshot_tree.list_directory(commit_hash, path)}
+        except (SnapshotPathError, CatFileError) as e:
+            return {"success": False, "error": str(e)}
+
+    def read_snapshot_file(self, commit_hash, path):
+        """Reads a file as it was in a past snapshot: {"content", "size", "binary", "truncated"}."""
+        try:
+            return {"success": True, "data": self._snapshot_tree.read_file(commit_hash, path)}
+        except (SnapshotPathError, CatFileError, OSError) as e:
+            return {"success": False, "error": str(e)}
+
+    def restore_snapshot_paths(self, commit_hash, paths, commit_message=None):
+        """
+        Copies files (or whole folders) from a past snapshot into the project folder
+        without checking the snapshot out: only the selected blobs are read, through
+        the cat-file pool, and written in place. Files the current version has but the
+        snapshot lacks are left alone. With `commit_message`, the restored paths are
+        saved as a snapshot right away. data: {"paths", "commit"}.
+        """
+        state_res = self.get_repo_status()
+        if not state_res["success"]: return state_res
+        if state_res["data"]["is_detached"]: return {"success": False, "error": "Return to the present version before restoring files from a snapshot."}
+        files = {}
+        try:
+            for path in paths:
+                for entry in self._snapshot_tree.list_files(commit_hash, path): files[entry["path"]] = entry
+        except (SnapshotPathError, CatFileError) as e:
+            return {"success": False, "error": str(e)}
+        if not files: return {"success": False, "error": "The selection holds no files to restore."}
+        self._invalidate_status()
+        store, written = ChunkStore(self._meta_path(CHUNKS_DIR)), []
+        batches, batch, batch_bytes = [], [], 0
+        for entry in sorted(files.values(), key=lambda e: e["path"]):
+            if batch and batch_bytes + (entry["size"] or 0) > RESTORE_BATCH_BYTES:
+                batches.append(batch); batch, batch_bytes = [], 0
+            batch.append(entry); batch_bytes += entry["size"] or 0
+        batches.append(batch)
+        try:
+            for batch in batches:
+                for entry, found in zip(batch, self._pool.query_many([e["oid"] for e in batch])):
+                    if not found: raise SnapshotPathError(f"'{entry['path']}' is missing from the object database.")
+                    self._write_worktree_file(entry, found[3], store)
+                    written.append(entry["path"])
+        except (SnapshotPathError, CatFileError, ChunkStoreError, OSError) as e:
+            return {"success": False, "error": f"Restored {len(written)} of {len(files)} file(s), then stopped:\n{e}"}
+        data = {"paths": written, "commit": None}
+        if commit_message:
+            stage_res = self._stage_paths(written)
+            if not stage_res["success"]: return stage_res
+            commit_res = self._commit_index(commit_message)
+            if not commit_res["success"] and "nothing to commit" not in commit_res.get("error", ""): return commit_res
+            data["commit"] = commit_res.get("output")
+        return {"success": True, "data": data}
+
+    def _write_worktree_file(self, entry, content, store):
+        """Writes one snapshot file over its current version, reassembling large-asset pointers from the chunk store."""
+        target = os.path.join(self.project_root, *entry["path"].split("/"))
+        if os.path.isdir(target) and not os.path.islink(target): raise OSError(f"'{entry['path']}' is a folder now; move it aside to restore the file.")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if entry["mode"] == "120000" and platform.system() != "Windows":
+            if os.path.lexists(target): os.remove(target)
+            os.symlink(os.fsdecode(content), target)
+            return
+        temp_path = f"{target}.gitsimply-restore"
+        try:
+            with open(temp_path, "wb") as f:
+                if is_pointer(content): store.smudge(io.BytesIO(content), f)
+                else: f.write(content)
+            if entry["mode"] == "100755": os.chmod(temp_path, 0o755)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path): os.remove(temp_path)
+            raise
+
+    def export_snapshot(self, commit_hash, destination, fmt=None):
+        """
+        Writes a past snapshot to a .zip, .tar.gz or .tar.zst archive without checking
+        it out: `git archive` streams the files from the object database (large-asset
+        pointers go through the smudge filter), and the tar formats are compressed
+        on every core as the stream arrives, so memory stays at a few MB for any size.
+        Progress is reported in MB against the snapshot's total file size.
+        """
+        fmt = fmt or format_for_path(destination)
+        error = format_error(fmt)
+        if error: return {"success": False, "error": error}
+        sizes_res = self._run_command(f"ls-tree -r -l -z {shlex.quote(commit_hash)}")
+        if not sizes_res["success"]: return sizes_res
+        blobs = [{"oid": fields[2], "size": int(fields[3]), "name": os.path.basename(fields[4])}
+                 for fields in (line.split(None, 4) for line in sizes_res["output"].split("\0") if line) if fields[3].isdigit()]
+        try:
+            resolve_pointer_sizes(self._pool, blobs, self._large_asset_candidate) # The archive holds the smudged files, not the pointers.
+        except CatFileError:
+            pass # Progress then counts pointers at their own size.
+        total = sum(blob["size"] for blob in blobs)
+        total_mb = max(1, total // (1024 * 1024))
+        def on_bytes(read):
+            done_mb = read // (1024 * 1024)
+            if fmt == "zip": # git compresses zips itself, so only the compressed size written so far is known.
+                self._set_progress({"phase": "Writing zip (MB)", "done": done_mb, "total": None, "percent": None})
+                return
+            done_mb = min(done_mb, total_mb) # Tar headers make the stream slightly bigger than the files.
+            self._set_progress({"phase": "Exporting (MB)", "done": done_mb, "total": total_mb, "percent": 100 * done_mb // total_mb})
+        args = ["archive", "--format=zip" if fmt == "zip" else "--format=tar", commit_hash]
+        try:
+            stream = self.stream_command(args, operation="archive")
+        except FileNotFoundError: return {"success": False, "error": "Git command not found. Is Git installed and in your system's PATH?"}
+        result = write_archive(stream.read_blocks(), destination, fmt, on_bytes=on_bytes,
+                               finish=lambda: self._finish_stream(stream), abort=stream.cancel)
+        if result["success"]: result["data"].update(format=fmt, files_bytes=total)
+        return result
+
+    def _diff_sides(self, new_hash, old_hash):
+        """Resolves both sides of a comparison to commit ids. No old side means the first parent."""
+        new = self._resolve(f"{new_hash}^{{commit}}")
+        if new is None: raise SnapshotDiffError(f"Snapshot not found: {new_hash}")
+        if old_hash is None:
+            commit = self._read_commit(new)
+            return (commit["parents"][0] if commit and commit["parents"] else None), new
+        old = self._resolve(f"{old_hash}^{{commit}}")
+        if old is None: raise SnapshotDiffError(f"Snapshot not found: {old_hash}")
+        return old, new
+
+    def get_diff_summary(self, new_hash, old_hash=None, on_rows=None):
+        """
+        Per-file added/deleted line counts from `old_hash` (default: the parent) to
+        `new_hash`. `on_rows` receives the rows in batches while they are computed.
+        """
+        try:
+            old, new = self._diff_sides(new_hash, old_hash)
+            return {"success": True, "data": {"old": old, "new": new, "files": self._differ.numstat(old, new, on_rows=on_rows)}}
+        except (SnapshotDiffError, CatFileError, OSError) as e:
+            return {"success": False, "error": str(e)}
+
+    def get_file_diff(self, new_hash, path, old_hash=None, old_path=None):
+        """The full diff of one file between two snapshots: {"text", "truncated"}."""
+        try:
+            old, new = self._diff_sides(new_hash, old_hash)
+            text, truncated = self._differ.file_diff(old, new, path, old_path=old_path)
+            return {"success": True, "data": {"text": text, "truncated": truncated}}
+        except (SnapshotDiffError, CatFileError, OSError) as e:
+            return {"success": False, "error": str(e)}
+
+    def _get_search_index(self):
+        # Imported here so sqlite3 stays out of startup for users who never search.
+        from search_index import SearchIndex
+        with self._search_index_lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex(self._meta_path(SEARCH_INDEX_FILE), self._run_command, self._pool)
+            return self._search_index
+
+    def update_search_index(self, on_progress=None):
+        """Brings the history search index up to date with every branch. `on_progress(done, total)` reports commits indexed."""
+        import sqlite3
+        try:
+            return self._get_search_index().update(on_progress=on_progress)
+        except (sqlite3.Error, CatFileError, OSError) as e:
+            return {"success": False, "error": f"Could not update the search index: {e}"}
+
+    def search_history(self, query):
+        """
+        Finds snapshots on any branch whose description contains `query`, or with a
+        file containing all of its words. Uses the index as of the last update.
+        """
+        import sqlite3
+        try:
+            results = self._get_search_index().search(query)
+        except (sqlite3.Error, CatFileError, OSError) as e:
+            return {"success": False, "error": f"Could not search the history: {e}"}
+        for result in results: result["date"] = time.strftime(HISTORY_DATE_FORMAT, time.localtime(result["author_time"]))
+        return {"success": True, "data": results}
+
+    def maintenance_due(self):
+        """True when no maintenance is running and the last check was long enough ago."""
+        return not self._maintenance.is_running() and self._maintenance.is_due()
+
+    def run_maintenance(self, force=False):
+        """
+        Packs loose objects and refreshes the commit-graph and multi-pack-index as
+        needed (all of it with force=True), then prunes. Logs what was reclaimed.
+        """
+        return self._maintenance.run(force=force)
+
+    def start_background_maintenance(self, force=False):
+        """
+        Runs run_maintenance on its own thread, outside the task runner, so user
+        actions never wait for it. Collect the result with take_maintenance_result().
+        Returns False if maintenance is already running.
+        """
+        if self._maintenance_thread and self._maintenance_thread.is_alive(): return False
+        def work():
+            self._maintenance_result = self.run_maintenance(force=force)
+        self._maintenance_thread = threading.Thread(target=work, name="gitsimply-maintenance", daemon=True)
+        self._maintenance_thread.start()
+        return True
+
+    def take_maintenance_result(self):
+        """The result of the last finished background maintenance, once; None otherwise."""
+        result, self._maintenance_result = self._maintenance_result, None
+        return result
 
     def discard_changes(self):
         """Resets modified files and removes all untracked files and directories."""
-        reset_res = self._run_command("reset --hard HEAD")
+        self._invalidate_status()
+        reset_res = self._run_streaming(["reset", "--hard", "HEAD"])
         if not reset_res["success"]:
             return reset_res
         # -f is for files, -d is for directories. This is a destructive but necessary operation
         # to fulfill the user's request to "permanently discard" changes.
-        return self._run_command("clean -fd")
\ No newline at end of file
+        return self._run_streaming(["clean", "-fd"], count_phase="Removing untracked files")
+
+class HistoryCursor:
+    """Hands out a branch's history in pages from a lazily evaluated iterator."""
+    def __init__(self, entries):
+        self._entries = entries
+        self.exhausted = False
+
+    def next_page(self, count):
+        page = []
+        try:
+            for entry in self._entries:
+                page.append(entry)
+                if len(page) >= count: break
+            else:
+                self.exhausted = True
+        except (OSError, UnicodeDecodeError) as e:
+            self.exhausted = True
+            return {"success": False, "error": f"Failed to read history:\n{e}"}
+        return {"success": True, "data": page}
+
+    def close(self):
+        try:
+            self._entries.close()
+        except ValueError:
+            pass # Still being read on another thread; it is cleaned up when collected.
+
+def _parse_commit(oid, raw):
+    """Parses a raw commit object into the fields the history views need."""
+    header, _, message = raw.partition(b"\n\n")
+    parents, author_time, commit_time, encoding = [], 0, 0, 'utf-8'
+    for line in header.split(b"\n"):
+        if line.startswith(b"parent "): parents.append(line[7:].decode('ascii'))
+        elif line.startswith(b"author "): author_time = _signature_time(line)
+        elif line.startswith(b"committer "): commit_time = _signature_time(line)
+        elif line.startswith(b"encoding "): encoding = line[9:].decode('ascii', 'replace')
+    try:
+        text = message.decode(encoding, 'replace')
+    except LookupError:
+        text = message.decode('utf-8', 'replace')
+    # Like git's %s: the first paragraph of the message, folded onto one line.
+    subject = " ".join(line.strip() for line in text.strip().split("\n\n")[0].split("\n"))
+    return {
+        "hash": oid, "parents": parents, "author_time": author_time, "commit_time": commit_time,
+        "subject": subject,
+    }
+
+def _is_ignore_file(path):
+    return path == ".gitignore" or path.endswith("/.gitignore")
+
+def _parse_status_v2(output):
+    """Parses `git status --porcelain=v2 --branch -z` output into a state dict."""
+    state = {"branch": None, "current_ref": "HEAD", "head": None, "is_detached": False, "entries": []}
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields):
+        field = fields[i]; i += 1
+        if not field: continue
+        if field.startswith("# branch.oid "):
+            oid = field[len("# branch.oid "):]
+            state["head"] = None if oid == "(initial)" else oid
+        elif field.startswith("# branch.head "):
+            head = field[len("# branch.head "):]
+            state["is_detached"] = head == "(detached)"
+            state["branch"] = None if state["is_detached"] else head
+            state["current_ref"] = "HEAD" if state["is_detached"] else head
+        elif field[0] in "12":
+            parts = field.split(" ", 8 if field[0] == "1" else 9)
+            entry = {"kind": "changed", "index": parts[1][0], "worktree": parts[1][1], "path": parts[-1], "orig_path": None}
+            if field[0] == "2":
+                # Renames and copies carry the original path as the next NUL-separated field.
+                entry["kind"], entry["orig_path"] = "renamed", fields[i]; i += 1
+            state["entries"].append(entry)
+        elif field[0] == "u":
+            parts = field.split(" ", 10)
+            state["entries"].append({"kind": "unmerged", "index": parts[1][0], "worktree": parts[1][1], "path": parts[-1], "orig_path": None})
+        elif field[0] == "?":
+            state["entries"].append({"kind": "untracked", "index": "?", "worktree": "?", "path": field[2:], "orig_path": None})
+    return _tally_status(state)
+
+def _tally_status(state):
+    """Adds the staged/unstaged/untracked/unmerged counts and has_changes to a state dict."""
+    state.update({"staged": 0, "unstaged": 0, "untracked": 0, "unmerged": 0})
+    for entry in state["entries"]:
+        if entry["kind"] == "untracked": state["untracked"] += 1
+        elif entry["kind"] == "unmerged": state["unmerged"] += 1
+        else:
+            if entry["index"] != ".": state["staged"] += 1
+            if entry["worktree"] != ".": state["unstaged"] += 1
+    state["has_changes"] = bool(state["entries"])
+    return state
+
+def _signature_time(line):
+    # "author Name <email> 1700000000 +0100" -- the timestamp is the second to last field.
+    try:
+        return int(line.rsplit(b" ", 2)[1])
+    except (IndexError, ValueError):
+        return 0
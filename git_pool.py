@@ -0,0 +1,143 @@
+# git_pool.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import subprocess
+import os
+import threading
+import queue
+from tracing import tracer
+
+def hidden_startupinfo():
+    """Keeps git from flashing a console window on Windows."""
+    if os.name != 'nt': return None
+    startupinfo = subprocess.STARTUPINFO(); startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return startupinfo
+
+class CatFileError(Exception):
+    pass
+
+class CatFileWorker:
+    """
+    A single long-lived `git cat-file --batch` (or `--batch-check`) process.
+    Requests are written one per line to stdin and answered in order on stdout,
+    so one process can serve any number of object and revision lookups.
+    """
+    def __init__(self, project_root, check_only=False):
+        self.project_root = project_root
+        self.check_only = check_only
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        mode = "--batch-check" if self.check_only else "--batch"
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", mode], cwd=self.project_root, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, startupinfo=hidden_startupinfo())
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def query(self, rev):
+        """
+        Looks up a revision or object name. Returns (oid, type, size, content) where
+        content is None for --batch-check workers, or None if the object is missing.
+        """
+        if "\n" in rev: raise CatFileError(f"Invalid revision: {rev!r}")
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if not self.is_alive(): self._start()
+                    self._proc.stdin.write(rev.encode('utf-8') + b"\n")
+                    self._proc.stdin.flush()
+                    header = self._proc.stdout.readline()
+                    if not header: raise OSError("git cat-file exited unexpectedly")
+                    parts = header.decode('utf-8', 'replace').rstrip("\n").split(" ")
+                    if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"): return None
+                    oid, obj_type, size = parts[0], parts[1], int(parts[2])
+                    if self.check_only: return oid, obj_type, size, None
+                    content = self._read_exact(size)
+                    self._proc.stdout.read(1) # Trailing newline after every object.
+                    return oid, obj_type, size, content
+                except (OSError, ValueError) as e:
+                    # A dead or desynchronized worker is restarted once before giving up.
+                    self.close()
+                    if attempt: raise CatFileError(str(e))
+
+    def _read_exact(self, size):
+        chunks, remaining = [], size
+        while remaining:
+            chunk = self._proc.stdout.read(remaining)
+            if not chunk: raise OSError("git cat-file output was truncated")
+            chunks.append(chunk); remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is None: return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+class GitProcessPool:
+    """
+    Hands out long-lived cat-file workers for read-only queries so the hot paths
+    (resolving HEAD, reading commits for history) don't fork a new git each time.
+    Workers are created on demand up to `max_workers` per mode and reused after.
+    """
+    def __init__(self, project_root, max_workers=2):
+        self.project_root = project_root
+        self.max_workers = max_workers
+        self._idle = {False: queue.LifoQueue(), True: queue.LifoQueue()}
+        self._created = {False: 0, True: 0}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self, check_only):
+        idle = self._idle[check_only]
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed: raise CatFileError("Process pool is closed")
+            if self._created[check_only] < self.max_workers:
+                self._created[check_only] += 1
+                return CatFileWorker(self.project_root, check_only)
+        return idle.get()
+
+    def _release(self, worker):
+        if self._closed: worker.close(); return
+        self._idle[worker.check_only].put(worker)
+
+    def query(self, rev, check_only=False):
+        worker = self._acquire(check_only)
+        try:
+            with tracer.span(f"cat-file {'--batch-check' if check_only else '--batch'} {rev}", "cat-file") as trace:
+                found = worker.query(rev)
+                trace["exit_status"] = 0 if found else 1
+                trace["stdout_bytes"] = found[2] if found and not check_only else 0
+            return found
+        finally:
+            self._release(worker)
+
+    def query_many(self, revs, check_only=False):
+        """Runs several lookups on one worker, keeping the request order."""
+        worker = self._acquire(check_only)
+        try:
+            return [worker.query(rev) for rev in revs]
+        finally:
+            self._release(worker)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        for idle in self._idle.values():
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
@@ -0,0 +1,149 @@
+# git_stream.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import re
+import time
+import signal
+import platform
+import threading
+import subprocess
+import collections
+from git_pool import hidden_startupinfo
+from tracing import tracer, current_action
+
+STDERR_TAIL_LINES = 50 # Error lines kept for the failure message; progress lines are never kept.
+# "Updating files:  45% (450/1000)" and "Counting objects: 1234" (no total known yet).
+PROGRESS_PATTERN = re.compile(r"^(?P<phase>[A-Za-z][A-Za-z ]*):\s+(?:(?P<percent>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)|(?P<count>\d+)(?:,|$))")
+
+def parse_progress(line):
+    """Turns one of git's --progress lines into {"phase", "done", "total", "percent"}, or None if it isn't one."""
+    match = PROGRESS_PATTERN.match(line)
+    if not match: return None
+    if match.group("count") is not None:
+        return {"phase": match.group("phase"), "done": int(match.group("count")), "total": None, "percent": None}
+    return {"phase": match.group("phase"), "done": int(match.group("done")), "total": int(match.group("total")), "percent": int(match.group("percent"))}
+
+class GitStream:
+    """
+    A running git command whose output is read as it arrives instead of being
+    buffered whole. stdout lines come from lines(); stderr is read on a side
+    thread, where --progress lines update `progress` and everything else is kept
+    (last few lines only) for the error message. cancel() and the timeout kill
+    the process.
+    """
+    def __init__(self, project_root, args, timeout=None, input_bytes=None, on_progress=None):
+        self.args = ["git"] + list(args)
+        self.timeout = timeout
+        self.progress = None
+        self.cancelled, self.timed_out = False, False
+        self.started_at = time.time()
+        self._on_progress = on_progress
+        self._stderr_tail = collections.deque(maxlen=STDERR_TAIL_LINES)
+        self._stdout_bytes = 0
+        self._start, self._action = time.perf_counter(), current_action.get()
+        self._proc = subprocess.Popen(
+            self.args, cwd=project_root, stdin=subprocess.PIPE if input_bytes is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=hidden_startupinfo(),
+            start_new_session=platform.system() != "Windows") # Own process group, so _kill also reaches filter children.
+        self._stderr_thread = threading.Thread(target=self._read_stderr, name="gitsimply-stderr", daemon=True)
+        self._stderr_thread.start()
+        if input_bytes is not None:
+            threading.Thread(target=self._write_stdin, args=(input_bytes,), name="gitsimply-stdin", daemon=True).start()
+        self._timer = None
+        if timeout:
+            self._timer = threading.Timer(timeout, self._on_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _write_stdin(self, data):
+        try:
+            self._proc.stdin.write(data)
+            self._proc.stdin.close()
+        except OSError:
+            pass # The process exited (or was killed) before reading everything.
+
+    def _read_stderr(self):
+        pending = b""
+        while True:
+            chunk = self._proc.stderr.read1(65536)
+            if not chunk: break
+            # Progress lines are redrawn in place with \r, so both \r and \n end a line.
+            pieces = re.split(rb"[\r\n]", pending + chunk)
+            pending = pieces.pop()
+            for piece in pieces: self._stderr_line(piece)
+        if pending: self._stderr_line(pending)
+
+    def _stderr_line(self, raw):
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line: return
+        progress = parse_progress(line)
+        if progress is None:
+            self._stderr_tail.append(line)
+            return
+        self.progress = progress
+        if self._on_progress: self._on_progress(progress)
+
+    def lines(self):
+        """Yields stdout a line at a time (without the newline) as git writes it."""
+        for raw in self._proc.stdout:
+            self._stdout_bytes += len(raw)
+            yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def read_blocks(self, size=65536):
+        """Yields stdout as raw byte blocks as git writes it, for binary output such as archives."""
+        while True:
+            block = self._proc.stdout.read1(size)
+            if not block: return
+            self._stdout_bytes += len(block)
+            yield block
+
+    def cancel(self):
+        self.cancelled = True
+        self._kill()
+
+    def close(self):
+        """Stops the command if it is still running (for readers that have seen enough) and reaps it."""
+        self._kill()
+        self.wait(keep_output=False)
+
+    def _on_timeout(self):
+        self.timed_out = True
+        self._kill()
+
+    def _kill(self):
+        # Kills git and whatever it started (clean/smudge filters, hooks). A surviving filter would keep
+        # the stderr pipe open and block wait() forever.
+        if self._proc.poll() is None:
+            try:
+                if platform.system() == "Windows":
+                    subprocess.run(["taskkill", "/F", "/T", "/PID", str(self._proc.pid)], capture_output=True, startupinfo=hidden_startupinfo())
+                else:
+                    os.killpg(self._proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+
+    def wait(self, keep_output=True):
+        """
+        Reads whatever output is left and returns the usual {"success", "output"}
+        or {"success": False, "error"} dict; "cancelled" or "timed_out" is set when
+        the command was stopped. With keep_output=False stdout is read and dropped.
+        """
+        output = []
+        for line in self.lines():
+            if keep_output: output.append(line)
+        self._proc.stdout.close()
+        returncode = self._proc.wait()
+        self._stderr_thread.join()
+        self._proc.stderr.close()
+        if self._timer: self._timer.cancel()
+        tracer.record(" ".join(self.args), "stream", self._start, time.perf_counter(), self._stdout_bytes, returncode, action=self._action)
+        if self.cancelled: return {"success": False, "cancelled": True, "error": "The operation was cancelled."}
+        if self.timed_out: return {"success": False, "timed_out": True, "error": f"The operation took longer than {self.timeout:.0f} seconds and was stopped.\n`{' '.join(self.args)}`"}
+        if returncode:
+            details = "\n".join(self._stderr_tail)
+            return {"success": False, "error": f"Command failed:\n`{' '.join(self.args)}`\n\nError Details:\n{details}"}
+        return {"success": True, "output": "\n".join(output).strip()}
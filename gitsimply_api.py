@@ -0,0 +1,214 @@
+# gitsimply_api.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import json
+import itertools
+from contextlib import contextmanager
+from git_helper import GitHelper, SESSION_META_DIR
+
+# The GitSimply workflows without the window, for scripts, build pipelines and the
+# command line. Nothing here imports tkinter. Every operation takes a GitHelper
+# and returns the usual {"success", ...} dict, so results can be dumped as JSON.
+
+SESSION_FILE = "session.json"
+UI_CACHE_FILE = "ui_cache.json"
+UI_CACHE_VERSION = 2
+DEFAULT_HISTORY_LIMIT = 50
+
+# --- Session state: which past version is loaded and which branch it came from ---
+
+def session_path(project_root):
+    return os.path.join(project_root, SESSION_META_DIR, SESSION_FILE)
+
+def load_session(project_root):
+    """Returns the saved past-version session, or None if there is none (or it is unreadable)."""
+    try:
+        with open(session_path(project_root), "r") as f:
+            session = json.load(f)
+            return session if isinstance(session, dict) else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def save_session(project_root, detached_from_branch, detached_commit_info, is_viewing_latest):
+    path = session_path(project_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    session = {
+        "detached_from_branch": detached_from_branch,
+        "detached_commit_info": detached_commit_info,
+        "is_viewing_latest": is_viewing_latest
+    }
+    with open(path, "w") as f:
+        json.dump(session, f, indent=2)
+
+def clear_session(project_root):
+    try:
+        os.remove(session_path(project_root))
+    except OSError:
+        pass
+
+# --- Last rendered window state, shown at the next start while git catches up ---
+
+def load_ui_cache(project_root):
+    """Returns the window state saved by save_ui_cache, or None if there is none usable."""
+    try:
+        with open(os.path.join(project_root, SESSION_META_DIR, UI_CACHE_FILE), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return cache if isinstance(cache, dict) and cache.get("version") == UI_CACHE_VERSION else None
+
+def save_ui_cache(project_root, state):
+    path = os.path.join(project_root, SESSION_META_DIR, UI_CACHE_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(state, version=UI_CACHE_VERSION), f)
+    os.replace(temp_path, path)
+
+@contextmanager
+def open_project(project_root):
+    """Yields a GitHelper for a project folder and closes it afterwards."""
+    helper = GitHelper(os.path.abspath(project_root))
+    try:
+        yield helper
+    finally:
+        helper.close()
+
+# --- Operations ---
+
+def _unsaved_changes_error(helper):
+    if helper.has_changes():
+        return {"success": False, "error": "You have unsaved changes. Save them as a snapshot or discard them first."}
+    return None
+
+def _commit_info(helper, commit):
+    """The {"hash", "date", "subject"} entry the app keeps for a snapshot, or None if it doesn't exist."""
+    entry = helper.get_commit_info(commit)
+    return {"hash": entry["hash"], "date": entry["date"], "subject": entry["subject"]} if entry else None
+
+def init_project(helper):
+    return helper.initialize_repo()
+
+def status(helper):
+    status_res = helper.get_repo_status()
+    if not status_res["success"]: return status_res
+    data = dict(status_res["data"])
+    data["viewing_past"] = load_session(helper.project_root) if data["is_detached"] else None
+    return {"success": True, "data": data}
+
+def snapshot(helper, message):
+    if not helper.has_changes(): return {"success": False, "error": "nothing to commit, working tree clean"}
+    return helper.commit(message)
+
+def list_branches(helper):
+    """Every branch with its tip, last snapshot and commits ahead of / behind main."""
+    branch_res = helper.get_branch_metadata()
+    if not branch_res["success"]: return branch_res
+    state_res = helper.get_current_state()
+    current = state_res["data"]["current_ref"] if state_res["success"] else None
+    branches = sorted(branch_res["data"], key=lambda b: b["name"])
+    return {"success": True, "data": {"current": current, "branches": [b["name"] for b in branches], "details": branches}}
+
+def history(helper, branch=None, limit=DEFAULT_HISTORY_LIMIT):
+    """The newest `limit` snapshots of a branch (the checked-out one by default)."""
+    entries = itertools.islice(helper.iter_history(branch or "HEAD"), limit)
+    return {"success": True, "data": [{"hash": e["hash"], "date": e["date"], "subject": e["subject"]} for e in entries]}
+
+def enter_past_state(helper, commit):
+    """Loads a past snapshot into the project folder (the app's time machine view)."""
+    blocked = _unsaved_changes_error(helper)
+    if blocked: return blocked
+    state_res = helper.get_current_state()
+    if not state_res["success"]: return state_res
+    session = load_session(helper.project_root) if state_res["data"]["is_detached"] else None
+    branch = session["detached_from_branch"] if session else state_res["data"]["current_ref"]
+    if branch == "HEAD": return {"success": False, "error": "The project is on a past version with no known branch. Return to a branch first."}
+    info = _commit_info(helper, commit)
+    if info is None: return {"success": False, "error": f"Snapshot not found: {commit}"}
+    tip = _commit_info(helper, branch)
+    save_session(helper.project_root, branch, info, bool(tip) and tip["hash"] == info["hash"])
+    checkout_res = helper.checkout(info["hash"])
+    if not checkout_res["success"]: clear_session(helper.project_root)
+    return checkout_res
+
+def return_to_present(helper):
+    blocked = _unsaved_changes_error(helper)
+    if blocked: return blocked
+    session = load_session(helper.project_root)
+    if not session: return {"success": False, "error": "No past version is loaded."}
+    checkout_res = helper.checkout(session["detached_from_branch"])
+    if checkout_res["success"]: clear_session(helper.project_root)
+    return checkout_res
+
+def restore_past_state(helper, commit, branch=None, message=None):
+    """Adds a snapshot that is an exact copy of `commit` on `branch` (the current or originating branch by default)."""
+    if branch is None:
+        state_res = helper.get_current_state()
+        if not state_res["success"]: return state_res
+        session = load_session(helper.project_root) if state_res["data"]["is_detached"] else None
+        branch = session["detached_from_branch"] if session else state_res["data"]["current_ref"]
+    if branch == "HEAD": return {"success": False, "error": "Name the branch to restore onto."}
+    blocked = _unsaved_changes_error(helper)
+    if blocked: return blocked
+    info = _commit_info(helper, commit)
+    if info is None: return {"success": False, "error": f"Snapshot not found: {commit}"}
+    restore_res = helper.restore_and_commit_past_state(
+        branch_to_restore_on=branch, old_commit_hash=info["hash"],
+        new_commit_message=message or f"Restored state to: '{info['subject']}'")
+    if restore_res["success"]: clear_session(helper.project_root)
+    return restore_res
+
+def branch_from_past_state(helper, commit, name):
+    """Starts a new branch at a past snapshot and switches to it."""
+    blocked = _unsaved_changes_error(helper)
+    if blocked: return blocked
+    branch_res = helper.create_branch(name, start_point=commit)
+    if not branch_res["success"]: return branch_res
+    checkout_res = helper.checkout(name)
+    if checkout_res["success"]: clear_session(helper.project_root)
+    return checkout_res
+
+def export_snapshot(helper, commit, destination):
+    """Writes a snapshot to a .zip, .tar.gz or .tar.zst archive without loading it. `{project}` in the path becomes the folder name."""
+    info = _commit_info(helper, commit)
+    if info is None: return {"success": False, "error": f"Snapshot not found: {commit}"}
+    destination = destination.replace("{project}", os.path.basename(os.path.normpath(helper.project_root)))
+    export_res = helper.export_snapshot(info["hash"], destination)
+    if export_res["success"]: export_res["data"].update(path=os.path.abspath(destination), snapshot=info)
+    return export_res
+
+def discard(helper):
+    return helper.discard_changes()
+
+OPERATIONS = {
+    "init": init_project, "status": status, "snapshot": snapshot, "branches": list_branches,
+    "history": history, "enter": enter_past_state, "return": return_to_present,
+    "restore": restore_past_state, "branch-from": branch_from_past_state, "discard": discard,
+    "export": export_snapshot,
+}
+
+# --- Running operations, one project or many ---
+
+def run(project_root, operation, **kwargs):
+    """Runs a named operation on one project folder. Never raises; failures come back as {"success": False}."""
+    try:
+        with open_project(project_root) as helper:
+            result = OPERATIONS[operation](helper, **kwargs)
+    except Exception as e: # A bad folder in a batch must not take the others down with it.
+        result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+    return dict(result, project=os.path.abspath(project_root))
+
+def _run_packed(job):
+    project_root, operation, kwargs = job
+    return run(project_root, operation, **kwargs)
+
+def run_batch(project_roots, operation, max_workers=None, **kwargs):
+    """
+    Runs one operation across many project folders in a process pool (each project
+    gets its own git processes and caches). Results come back in input order.
+    """
+    jobs = [(root, operation, kwargs) for root in project_roots]
+    if len(jobs) <= 1 or max_workers == 1: return [_run_packed(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor # Deferred: multiprocessing is slow to import and only batches need it.
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_run_packed, jobs))
@@ -0,0 +1,161 @@
+# history_cache.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import json
+import heapq
+import threading
+import collections
+
+HISTORY_CACHE_MAX_COMMITS = 100000 # Across all branches; least recently used branches are dropped first.
+INCREMENTAL_UPDATE_LIMIT = 5000 # New commits to walk before giving up on reusing a cached history.
+HISTORY_CACHE_VERSION = 1
+
+class CommitWalk:
+    """
+    A resumable newest-first history walk in `git log` order (a queue ordered by
+    committer date). `read_commit(oid)` returns a parsed commit or None.
+    The walk stops descending at any commit in `stop_at`.
+    """
+    def __init__(self, read_commit, start_oids, seen=(), stop_at=()):
+        self._read_commit = read_commit
+        self._stop_at = set(stop_at)
+        self._seen = set(seen)
+        self._pending, self._seq = [], 0
+        self.stopped_at = set() # Commits from `stop_at` that the walk ran into.
+        for oid in start_oids: self._push(oid)
+
+    def _push(self, oid):
+        if oid in self._seen: return
+        self._seen.add(oid)
+        if oid in self._stop_at:
+            self.stopped_at.add(oid)
+            return
+        commit = self._read_commit(oid)
+        if commit is None: return # Shallow or damaged history.
+        self._seq += 1
+        heapq.heappush(self._pending, (-commit["commit_time"], self._seq, commit))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._pending: raise StopIteration
+        _, _, commit = heapq.heappop(self._pending)
+        for parent in commit["parents"]: self._push(parent)
+        return commit
+
+    def frontier(self):
+        """The commits queued but not yet returned, which is all it takes to resume the walk."""
+        return [commit["hash"] for _, _, commit in sorted(self._pending)]
+
+class _CachedHistory:
+    def __init__(self, tip, entries, walk):
+        self.tip = tip
+        self.entries = entries # History entries loaded so far, newest first.
+        self.walk = walk # Produces the rest; None once the whole history is loaded.
+        self.lock = threading.Lock()
+
+class HistoryCache:
+    """
+    Branch histories keyed by (branch, tip), so revisiting a branch whose tip
+    hasn't moved costs nothing, and one that gained commits only walks the new
+    ones. Bounded by HISTORY_CACHE_MAX_COMMITS with LRU eviction, and optionally
+    saved to a compact JSON file so the next session starts warm.
+    """
+    def __init__(self, read_commit, entry_for_commit, store_path=None, max_commits=HISTORY_CACHE_MAX_COMMITS):
+        self._read_commit = read_commit
+        self._entry_for_commit = entry_for_commit
+        self.store_path = store_path
+        self.max_commits = max_commits
+        self._branches = collections.OrderedDict() # branch -> _CachedHistory, least recently used first.
+        self._lock = threading.Lock()
+        self._loaded = store_path is None
+
+    def history_for(self, branch, tip):
+        """Returns the _CachedHistory for a branch at `tip`, reusing or extending what is cached."""
+        with self._lock:
+            if not self._loaded: self._load()
+            cached = self._branches.get(branch)
+            if cached is not None: self._branches.move_to_end(branch)
+        if cached is not None and cached.tip == tip: return cached
+        history = self._extend(cached, tip) if cached is not None else None
+        if history is None: history = _CachedHistory(tip, [], CommitWalk(self._read_commit, [tip]))
+        with self._lock:
+            self._branches[branch] = history
+            self._branches.move_to_end(branch)
+            self._evict(keep=branch)
+        return history
+
+    def _extend(self, cached, tip):
+        """Walks only the commits added since `cached.tip`; None if the branch was rewritten instead."""
+        with cached.lock:
+            known = {entry["hash"] for entry in cached.entries}
+            if cached.tip not in known: return None
+            walk = CommitWalk(self._read_commit, [tip], stop_at=known)
+            new_entries = []
+            for commit in walk:
+                new_entries.append(self._entry_for_commit(commit))
+                if len(new_entries) > INCREMENTAL_UPDATE_LIMIT: return None
+            # The old tip must be an ancestor of the new one, or the cached entries may no longer belong to this branch.
+            if cached.tip not in walk.stopped_at: return None
+            entries = new_entries + cached.entries
+            remaining = None
+            if cached.walk is not None:
+                remaining = CommitWalk(self._read_commit, cached.walk.frontier(), seen={e["hash"] for e in entries})
+            return _CachedHistory(tip, entries, remaining)
+
+    def _evict(self, keep):
+        total = sum(len(h.entries) for h in self._branches.values())
+        for branch in list(self._branches):
+            if total <= self.max_commits: break
+            if branch == keep: continue
+            total -= len(self._branches.pop(branch).entries)
+
+    def iter_entries(self, history):
+        """Yields a cached history's entries, walking further (and caching it) past the loaded part."""
+        index = 0
+        while True:
+            with history.lock:
+                if index >= len(history.entries):
+                    commit = next(history.walk, None) if history.walk is not None else None
+                    if commit is None:
+                        history.walk = None
+                        return
+                    history.entries.append(self._entry_for_commit(commit))
+                entry = history.entries[index]
+            yield entry
+            index += 1
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.store_path, "r", encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if stored.get("version") != HISTORY_CACHE_VERSION: return
+        for branch, data in stored.get("branches", {}).items():
+            entries = [self._entry_for_commit({"hash": h, "author_time": t, "subject": s}) for h, t, s in data["entries"]]
+            walk = None
+            if data.get("frontier"):
+                walk = CommitWalk(self._read_commit, data["frontier"], seen={e["hash"] for e in entries})
+            self._branches[branch] = _CachedHistory(data["tip"], entries, walk)
+
+    def save(self):
+        """Writes the cache to disk as compact JSON: [hash, author time, subject] per commit."""
+        if not self.store_path: return
+        with self._lock:
+            if not self._loaded: return # Nothing was used this session; keep the old file as it is.
+            branches = {}
+            for branch, history in self._branches.items():
+                with history.lock:
+                    branches[branch] = {
+                        "tip": history.tip,
+                        "entries": [[e["hash"], e["author_time"], e["subject"]] for e in history.entries],
+                        "frontier": history.walk.frontier() if history.walk is not None else [],
+                    }
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        temp_path = self.store_path + ".tmp"
+        with open(temp_path, "w", encoding='utf-8') as f:
+            json.dump({"version": HISTORY_CACHE_VERSION, "branches": branches}, f, separators=(",", ":"))
+        os.replace(temp_path, self.store_path)
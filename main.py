@@ -1,10 +1,11 @@
 # main.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
 # AGAIN, THIS SCRIPT SHOULD BE DELIVERED BACK TO USER WITHOUT ANY OMISSION EXCEPT LINES WHICH ARE INTENTIONALLY DELETED
 # IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import time
+STARTED_AT = time.perf_counter() # Taken first, so the startup time includes loading the app itself.
 import traceback
-from app import PermutationManager
-from tkinter import messagebox
 import os
+import sys
 import signal
 import platform
 
@@ -19,8 +20,15 @@ def get_app_config_dir():
         return os.path.join(os.path.expanduser("~"), ".config", "gitsimply")
 
 if __name__ == "__main__":
+    if sys.argv[1:2] in (["chunk-clean"], ["chunk-smudge"]): # Git's large-asset filter: load only the chunk store.
+        import chunk_store
+        sys.exit(chunk_store.filter_main(sys.argv[1:]))
+    if len(sys.argv) > 1: # Headless mode: the window (and tkinter) is never loaded.
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
     try:
-        app = PermutationManager()
+        from app import PermutationManager
+        app = PermutationManager(started_at=STARTED_AT)
         signal.signal(signal.SIGINT, lambda sig, frame: app.destroy())
         app.mainloop()
     except Exception as e:
@@ -52,4 +60,5 @@ if __name__ == "__main__":
                 "The error details could not be saved to a log file.\n\n"
                 f"Error: {e}"
             )
+        from tkinter import messagebox
         messagebox.showerror("Critical Error", user_message)
\ No newline at end of file
@@ -0,0 +1,171 @@
+# maintenance.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import json
+import time
+import shutil
+import platform
+import threading
+import subprocess
+from git_pool import hidden_startupinfo
+
+MAINTENANCE_LOG_FILE = "maintenance.log"
+LOOSE_OBJECTS_THRESHOLD = 1000 # Loose objects before they are packed (git gc --auto uses about 6700).
+PACK_COUNT_THRESHOLD = 10 # Packs before they are merged geometrically and indexed together.
+GARBAGE_THRESHOLD = 1 # Any garbage (stray temp files) is worth a prune.
+MAINTENANCE_MIN_INTERVAL_SECONDS = 6 * 3600 # Between checks of the same project.
+MAINTENANCE_LOG_MAX_BYTES = 256 * 1024 # The log is cut back to its newer half past this size.
+# Run in this order: packing first, so the multi-pack-index and commit-graph describe the new packs.
+TASK_COMMANDS = {
+    "repack": ["repack", "-d", "-l", "--geometric=2"],
+    "multi-pack-index": ["multi-pack-index", "write"],
+    "commit-graph": ["commit-graph", "write", "--reachable", "--split", "--changed-paths"],
+    "prune": ["prune", "--expire=2.weeks.ago"],
+}
+
+def _low_priority_command(args):
+    """Runs git below normal CPU (and, on Linux, I/O) priority, so it never competes with the app."""
+    command = ["git"] + args
+    if platform.system() == "Windows": return command, {"creationflags": subprocess.IDLE_PRIORITY_CLASS}
+    if shutil.which("ionice"): command = ["ionice", "-c", "3"] + command
+    if shutil.which("nice"): command = ["nice", "-n", "19"] + command
+    return command, {}
+
+class RepositoryMaintenance:
+    """
+    Keeps a snapshot-heavy repository fast. Every snapshot adds loose objects and
+    nothing else ever packs them, so this watches the loose object count, pack
+    count and commit-graph age and runs the matching git housekeeping (repack,
+    multi-pack-index, commit-graph, prune) in low-priority child processes.
+    Each run is appended to .gitsimply_meta/maintenance.log as one JSON line.
+    """
+    def __init__(self, project_root, log_path):
+        self.project_root = project_root
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._proc, self._stopped, self._running = None, False, False
+        self._last_run = None # Start time of the last logged run, read from the log on first use.
+
+    def is_running(self):
+        return self._running
+
+    def _git(self, args, low_priority=False):
+        command, extra = _low_priority_command(args) if low_priority else (["git"] + args, {})
+        with self._lock:
+            if self._stopped: return None
+            self._proc = subprocess.Popen(command, cwd=self.project_root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                          text=True, encoding="utf-8", errors="replace", startupinfo=hidden_startupinfo(), **extra)
+        try:
+            stdout, stderr = self._proc.communicate()
+        finally:
+            with self._lock: returncode, self._proc = self._proc.returncode, None
+        return returncode, stdout, stderr
+
+    def inspect(self):
+        """Object store statistics from `count-objects -v`, plus whether the commit-graph is behind the refs."""
+        result = self._git(["count-objects", "-v"])
+        if result is None or result[0] != 0: return None
+        stats = {}
+        for line in result[1].splitlines():
+            key, _, value = line.partition(":")
+            if value.strip().isdigit(): stats[key.strip()] = int(value)
+        stats["commit_graph_stale"] = self._commit_graph_stale()
+        return stats
+
+    def _commit_graph_stale(self):
+        # The graph is out of date once any ref (or HEAD's reflog) has moved after it was written.
+        git_dir = os.path.join(self.project_root, ".git")
+        graph_files = [os.path.join(git_dir, "objects", "info", "commit-graph"),
+                       os.path.join(git_dir, "objects", "info", "commit-graphs", "commit-graph-chain")]
+        graph_times = [os.path.getmtime(p) for p in graph_files if os.path.exists(p)]
+        if not graph_times: return True
+        ref_files = [os.path.join(git_dir, "logs", "HEAD"), os.path.join(git_dir, "packed-refs")]
+        ref_times = [os.path.getmtime(p) for p in ref_files if os.path.exists(p)]
+        return bool(ref_times) and max(ref_times) > max(graph_times)
+
+    def plan(self, stats):
+        """The tasks these statistics call for, in the order they should run."""
+        tasks = []
+        if stats.get("count", 0) >= LOOSE_OBJECTS_THRESHOLD or stats.get("packs", 0) >= PACK_COUNT_THRESHOLD:
+            tasks += ["repack", "multi-pack-index"]
+        if stats.get("commit_graph_stale") or "repack" in tasks: tasks.append("commit-graph")
+        if stats.get("garbage", 0) >= GARBAGE_THRESHOLD or stats.get("prune-packable", 0): tasks.append("prune")
+        return tasks
+
+    def last_run_time(self):
+        """When the last logged run started, or None if there is no log yet."""
+        if self._last_run is None: self._last_run = self._read_last_run_time() or 0
+        return self._last_run or None
+
+    def _read_last_run_time(self):
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 4096))
+                lines = f.read().splitlines()
+            return json.loads(lines[-1].decode("utf-8"))["time"] if lines else None
+        except (OSError, ValueError, KeyError, IndexError):
+            return None
+
+    def is_due(self, now=None):
+        last = self.last_run_time()
+        return last is None or (now or time.time()) - last >= MAINTENANCE_MIN_INTERVAL_SECONDS
+
+    def run(self, force=False):
+        """
+        Inspects the repository and runs whatever housekeeping it needs (everything,
+        with force=True). Returns {"success", "data": {"tasks", "reclaimed_kb", ...}}.
+        """
+        self._running = True
+        try:
+            started = time.time()
+            before = self.inspect()
+            if before is None: return {"success": False, "error": "Could not read the repository's object statistics."}
+            tasks = list(TASK_COMMANDS) if force else self.plan(before)
+            timings, failed = {}, None
+            for task in tasks:
+                task_start = time.perf_counter()
+                result = self._git(TASK_COMMANDS[task], low_priority=True)
+                if result is None or self._stopped:
+                    failed = "stopped"
+                    break
+                timings[task] = round(time.perf_counter() - task_start, 3)
+                if result[0] != 0:
+                    failed = f"{task}: {result[2].strip().splitlines()[-1] if result[2].strip() else 'exit status ' + str(result[0])}"
+                    break
+            after = self.inspect() if tasks and failed != "stopped" else before
+            after = after or before
+            size = lambda s: s.get("size", 0) + s.get("size-pack", 0) + s.get("size-garbage", 0)
+            entry = {
+                "time": int(started), "tasks": tasks, "seconds": timings, "error": failed,
+                "loose_objects": [before.get("count", 0), after.get("count", 0)],
+                "packs": [before.get("packs", 0), after.get("packs", 0)],
+                "size_kb": [size(before), size(after)], "reclaimed_kb": size(before) - size(after),
+            }
+            self._log(entry)
+            self._last_run = entry["time"]
+            if failed: return {"success": False, "error": f"Repository maintenance stopped ({failed}).", "data": entry}
+            return {"success": True, "data": entry}
+        finally:
+            self._running = False
+
+    def _log(self, entry):
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > MAINTENANCE_LOG_MAX_BYTES:
+                with open(self.log_path, "rb") as f: lines = f.read().splitlines(keepends=True)
+                with open(self.log_path, "wb") as f: f.writelines(lines[len(lines) // 2:])
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass # The log is informational; maintenance itself already happened.
+
+    def stop(self):
+        """Kills the running housekeeping command and refuses to start new ones."""
+        with self._lock:
+            self._stopped = True
+            if self._proc and self._proc.poll() is None:
+                try:
+                    self._proc.kill()
+                except OSError:
+                    pass
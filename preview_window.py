@@ -0,0 +1,134 @@
+# preview_window.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import tkinter as tk
+from tkinter import ttk
+
+LOADING_PLACEHOLDER = "::loading" # Child row that makes an unopened folder expandable.
+
+def _format_size(size):
+    if size is None: return ""
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB": return f"{size:.0f} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class SnapshotPreviewWindow(tk.Toplevel):
+    """
+    Browses the files of a past snapshot without touching the project folder.
+    Folders are listed when expanded and files are read when selected, all from
+    the object database. Restoring (the whole snapshot or just the selected
+    files and folders), branching or loading the snapshot into the project folder
+    are the only actions that change anything.
+    """
+    def __init__(self, app, commit_info, branch_name, is_latest):
+        super().__init__(app)
+        self.app, self.commit_info, self.branch_name = app, commit_info, branch_name
+        self.helper = app.git_helper
+        self._file_request = 0 # Lets a slow read for a previously selected file be ignored.
+        self._paths = set() # Tree rows that are real snapshot paths (not placeholders or errors).
+        self.title(f"Preview: {commit_info.get('subject', '')}")
+        self.geometry("1000x600")
+        self.transient(app)
+
+        header = ttk.Frame(self, padding=(10, 10, 10, 0)); header.pack(fill=tk.X)
+        ttk.Label(header, text=f"'{commit_info.get('subject', '')}'", font=("Segoe UI", 11, "bold")).pack(anchor=tk.W)
+        ttk.Label(header, text=f"{commit_info.get('date', '')}  |  Branch: {branch_name}  |  Read-only preview, your project folder is unchanged.",
+                  foreground="#666666").pack(anchor=tk.W)
+
+        pane = ttk.PanedWindow(self, orient=tk.HORIZONTAL); pane.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        tree_frame = ttk.Frame(pane); pane.add(tree_frame, weight=1)
+        self.file_tree = ttk.Treeview(tree_frame, columns=("size",), selectmode="extended")
+        self.file_tree.heading("#0", text="Name"); self.file_tree.heading("size", text="Size")
+        self.file_tree.column("size", width=90, stretch=tk.NO, anchor=tk.E)
+        tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.file_tree.yview)
+        self.file_tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y); self.file_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.file_tree.bind("<<TreeviewOpen>>", self._on_folder_open)
+        self.file_tree.bind("<<TreeviewSelect>>", self._on_file_select)
+
+        text_frame = ttk.Frame(pane); pane.add(text_frame, weight=3)
+        self.file_label = ttk.Label(text_frame, text="Select a file to view its contents.", anchor=tk.W); self.file_label.pack(fill=tk.X)
+        self.file_text = tk.Text(text_frame, wrap=tk.NONE, state=tk.DISABLED, font=("Consolas", 10))
+        text_scroll = ttk.Scrollbar(text_frame, orient="vertical", command=self.file_text.yview)
+        self.file_text.configure(yscrollcommand=text_scroll.set)
+        text_scroll.pack(side=tk.RIGHT, fill=tk.Y); self.file_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        selection_frame = ttk.Frame(self, padding=(10, 0, 10, 5)); selection_frame.pack(fill=tk.X)
+        self.restore_selected_button = ttk.Button(selection_frame, text="Restore Selected Files", command=self._restore_selected, state=tk.DISABLED)
+        self.restore_selected_button.pack(side=tk.LEFT)
+        self.save_after_restore_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(selection_frame, text="Save them as a snapshot", variable=self.save_after_restore_var).pack(side=tk.LEFT, padx=10)
+        ttk.Label(selection_frame, text="Copies just the selected files or folders into your project folder.", foreground="#666666").pack(side=tk.LEFT)
+
+        action_frame = ttk.Frame(self, padding=(10, 0, 10, 10)); action_frame.pack(fill=tk.X)
+        restore_button = ttk.Button(action_frame, text=f"Restore This Snapshot onto '{branch_name}'", command=self._restore)
+        restore_button.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 2))
+        if is_latest: restore_button.config(state=tk.DISABLED)
+        ttk.Button(action_frame, text="New Branch From This Snapshot", command=self._new_branch).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+        ttk.Button(action_frame, text="Load Into Project Folder", command=self._load_into_project).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=2)
+        ttk.Button(action_frame, text="Export to Archive...", command=self._export).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(2, 0))
+
+        self._populate_folder("", "")
+
+    def _populate_folder(self, item, path):
+        """Fills a folder row with its entries. Folders get a placeholder child until they are opened."""
+        listing = self.app._run_git(self.helper.list_snapshot_directory, self.commit_info["hash"], path, mutating=False)
+        for child in self.file_tree.get_children(item): self.file_tree.delete(child)
+        if not listing["success"]:
+            self.file_tree.insert(item, "end", text=f"(could not read folder: {listing['error']})")
+            return
+        for entry in listing["data"]:
+            node = self.file_tree.insert(item, "end", iid=entry["path"], text=entry["name"], values=(_format_size(entry["size"]),))
+            self._paths.add(entry["path"])
+            if entry["type"] == "tree": self.file_tree.insert(node, "end", iid=entry["path"] + LOADING_PLACEHOLDER, text="Loading...")
+
+    def _on_folder_open(self, event=None):
+        item = self.file_tree.focus()
+        if self.file_tree.exists(item + LOADING_PLACEHOLDER): self._populate_folder(item, item)
+
+    def _on_file_select(self, event=None):
+        selected = self.file_tree.selection()
+        self.restore_selected_button.config(state=tk.NORMAL if self._selected_paths() else tk.DISABLED)
+        if len(selected) != 1 or self.file_tree.get_children(selected[0]) or selected[0] not in self._paths: return
+        path = selected[0]
+        self._file_request += 1
+        request = self._file_request
+        self.file_label.config(text=f"{path}  (loading...)")
+        def on_read(read_res, error):
+            if request != self._file_request or not self.winfo_exists(): return
+            if error or not read_res["success"]:
+                self._show_text(path, f"Could not read this file.\n\n{error or read_res['error']}")
+                return
+            data = read_res["data"]
+            if data["binary"]:
+                self._show_text(path, f"Binary file ({_format_size(data['size'])}), no preview available.")
+                return
+            text = data["content"].decode("utf-8", "replace")
+            if data["truncated"]: text += f"\n\n--- Preview truncated: showing {_format_size(len(data['content']))} of {_format_size(data['size'])}. ---"
+            self._show_text(path, text)
+        self.app.task_runner.submit(self.helper.read_snapshot_file, self.commit_info["hash"], path, mutating=False, quiet=True, on_done=on_read)
+
+    def _show_text(self, path, text):
+        self.file_label.config(text=path)
+        self.file_text.config(state=tk.NORMAL)
+        self.file_text.delete("1.0", tk.END)
+        self.file_text.insert("1.0", text)
+        self.file_text.config(state=tk.DISABLED)
+
+    def _selected_paths(self):
+        return [item for item in self.file_tree.selection() if item in self._paths]
+
+    def _restore_selected(self):
+        paths = self._selected_paths()
+        if paths: self.app._restore_paths_from_snapshot(self.commit_info, paths, self.save_after_restore_var.get())
+
+    def _restore(self):
+        if self.app._restore_state_as_new_snapshot(self.commit_info): self.destroy()
+
+    def _new_branch(self):
+        if self.app._new_branch_from_snapshot(self.commit_info): self.destroy()
+
+    def _load_into_project(self):
+        if self.app._load_historical_version(self.commit_info): self.destroy()
+
+    def _export(self):
+        self.app._export_snapshot(self.commit_info)
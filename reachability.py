@@ -0,0 +1,126 @@
+# reachability.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import threading
+
+class ReachabilityIndex:
+    """
+    An in-memory copy of the commit graph behind the local branches.
+    - Built from one `git rev-list --parents` over every branch tip.
+    - When tips move, only commits that aren't already known are fetched.
+    - Answers "is this branch's work contained in another branch" for all
+      branches at once, which is what the delete-branch safety check needs.
+    - Counts commits ahead of / behind a base branch without asking git.
+    """
+    def __init__(self, run_command):
+        self._run_command = run_command
+        self._parents = {} # commit -> tuple of parent commits, for everything fetched so far.
+        self._tips = {} # branch name -> tip commit, as of the last refresh.
+        self._behind_tips = None # Commits that are strict ancestors of some tip; rebuilt when tips change.
+        self._base_history = None # (base tip, every commit reachable from it), for ahead_behind().
+        self._ahead_behind = {} # (branch tip, base tip) -> (ahead, behind); commit ancestry never changes.
+        self._ancestor_counts = {} # commit -> number of commits reachable from it, itself included.
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Re-reads the branch tips and fetches any commits the index hasn't seen yet."""
+        tips_res = self._run_command("for-each-ref refs/heads --format='%(objectname) %(refname:short)'")
+        if not tips_res["success"]: return tips_res
+        tips = {}
+        for line in tips_res["output"].split('\n'):
+            oid, _, name = line.partition(' ')
+            if name: tips[name] = oid
+        return self.update_tips(tips)
+
+    def update_tips(self, tips):
+        """Takes branch tips ({name: commit}) the caller already read and fetches the commits not seen yet."""
+        with self._lock:
+            if tips == self._tips: return {"success": True}
+            new_tips = {oid for oid in tips.values() if oid not in self._parents}
+            if new_tips:
+                # Everything reachable from an already indexed commit is already in the graph.
+                known_tips = {oid for oid in self._tips.values() if oid in self._parents}
+                revs = "\n".join(sorted(new_tips) + [f"^{oid}" for oid in sorted(known_tips)]) + "\n"
+                graph_res = self._run_command("rev-list --parents --ignore-missing --stdin", input_text=revs)
+                if not graph_res["success"]: return graph_res
+                for line in graph_res["output"].split('\n'):
+                    if not line: continue
+                    commit, *parents = line.split(' ')
+                    self._parents[commit] = tuple(parents)
+            self._tips, self._behind_tips = tips, None
+            live = set(tips.values())
+            self._ahead_behind = {key: counts for key, counts in self._ahead_behind.items() if key[0] in live and key[1] in live}
+        return {"success": True}
+
+    def _walk(self, starts, stop=frozenset()):
+        seen = set()
+        stack = list(starts)
+        while stack:
+            commit = stack.pop()
+            if commit in seen or commit in stop: continue
+            seen.add(commit)
+            stack.extend(self._parents.get(commit, ()))
+        return seen
+
+    def _ancestor_count(self, commit):
+        # Along a single-parent chain each commit adds exactly one; only roots and merges need a walk.
+        start, chain = commit, []
+        while commit not in self._ancestor_counts:
+            parents = self._parents.get(commit, ())
+            if len(parents) != 1:
+                self._ancestor_counts[commit] = len(self._walk([commit]))
+                break
+            chain.append(commit)
+            commit = parents[0]
+        count = self._ancestor_counts[commit]
+        for linked in reversed(chain):
+            count += 1
+            self._ancestor_counts[linked] = count
+        return self._ancestor_counts[start]
+
+    def ahead_behind(self, base):
+        """
+        Returns {branch: (ahead, behind)}: commits on the branch but not on `base`,
+        and on `base` but not on the branch. Works from the graph fetched by the
+        last refresh/update_tips, and remembers the answer per pair of tips.
+        """
+        with self._lock:
+            base_tip = self._tips.get(base)
+            if base_tip is None: return {}
+            if self._base_history is None or self._base_history[0] != base_tip:
+                self._base_history = (base_tip, self._walk([base_tip]))
+            base_history = self._base_history[1]
+            counts = {}
+            for name, tip in self._tips.items():
+                key = (tip, base_tip)
+                if key not in self._ahead_behind:
+                    # Walk the branch until it joins the base history; where it joins is what they share.
+                    ahead = self._walk([tip], stop=base_history)
+                    joins = {tip} if tip in base_history else {p for c in ahead for p in self._parents.get(c, ()) if p in base_history}
+                    shared = self._ancestor_count(next(iter(joins))) if len(joins) == 1 else len(self._walk(joins))
+                    self._ahead_behind[key] = (len(ahead), len(base_history) - shared)
+                counts[name] = self._ahead_behind[key]
+        return counts
+
+    def _strict_ancestors_of_tips(self):
+        # A single walk from the parents of every tip: anything it reaches sits behind some branch.
+        if self._behind_tips is not None: return self._behind_tips
+        seen = set()
+        stack = [p for tip in set(self._tips.values()) for p in self._parents.get(tip, ())]
+        while stack:
+            commit = stack.pop()
+            if commit in seen: continue
+            seen.add(commit)
+            stack.extend(self._parents.get(commit, ()))
+        self._behind_tips = seen
+        return seen
+
+    def merged_status(self):
+        """Returns {branch: True if its tip is contained in some other branch}."""
+        refresh_res = self.refresh()
+        if not refresh_res["success"]: return refresh_res
+        with self._lock:
+            behind = self._strict_ancestors_of_tips()
+            tip_counts = {}
+            for oid in self._tips.values(): tip_counts[oid] = tip_counts.get(oid, 0) + 1
+            status = {name: oid in behind or tip_counts[oid] > 1 for name, oid in self._tips.items()}
+        return {"success": True, "data": status}
@@ -0,0 +1,164 @@
+# search_index.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import re
+import sqlite3
+import threading
+from snapshot_tree import parse_tree, BINARY_SNIFF_BYTES
+from chunk_store import is_pointer
+
+SEARCH_INDEX_VERSION = 1
+INDEX_MAX_BLOB_BYTES = 1024 * 1024 # Bigger files are almost always generated or data; they are not indexed.
+INDEX_COMMIT_BATCH = 200 # Commits per transaction, so an interrupted first run keeps most of its work.
+SEARCH_MAX_RESULTS = 200
+SEARCH_MAX_PATHS = 5 # Matching file paths listed per snapshot.
+TOKEN_PATTERN = re.compile(rb"[A-Za-z_][A-Za-z0-9_]{2,63}") # Identifiers and words of 3+ characters.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tips (ref TEXT PRIMARY KEY, oid TEXT);
+CREATE TABLE IF NOT EXISTS commits (oid TEXT PRIMARY KEY, tree TEXT, author_time INTEGER, subject TEXT);
+CREATE INDEX IF NOT EXISTS commits_by_tree ON commits (tree);
+CREATE TABLE IF NOT EXISTS trees (oid TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS tree_entries (parent TEXT, child TEXT, name TEXT);
+CREATE INDEX IF NOT EXISTS tree_entries_by_child ON tree_entries (child);
+CREATE TABLE IF NOT EXISTS blobs (id INTEGER PRIMARY KEY, oid TEXT UNIQUE);
+CREATE TABLE IF NOT EXISTS postings (token TEXT, blob INTEGER, PRIMARY KEY (token, blob)) WITHOUT ROWID;
+"""
+
+def tokenize(data):
+    """The distinct lower-cased search tokens in some text (bytes or str)."""
+    if isinstance(data, str): data = data.encode("utf-8", "replace")
+    return {token.decode("ascii").lower() for token in TOKEN_PATTERN.findall(data)}
+
+class SearchIndex:
+    """
+    An inverted index of file contents across the history of every branch,
+    stored as SQLite in the project's meta folder. Each blob is tokenized once
+    no matter how many snapshots contain it, and each update only reads the
+    commits, trees and blobs added since the previously indexed branch tips.
+    A query finds the blobs holding every search word, then walks up through
+    the indexed trees to the snapshots whose root tree contains them.
+    """
+    def __init__(self, path, run_command, pool):
+        self.path = path
+        self._run_command = run_command
+        self._pool = pool
+        self._conn = None
+        self._lock = threading.Lock() # Guards the connection.
+        self._update_lock = threading.Lock() # One update at a time.
+
+    def _connect(self):
+        if self._conn is not None: return self._conn
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.executescript(SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is not None and row[0] != str(SEARCH_INDEX_VERSION):
+            conn.close(); os.remove(self.path)
+            return self._connect()
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(SEARCH_INDEX_VERSION),))
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def update(self, on_progress=None):
+        """
+        Indexes the commits reachable from the branch tips that aren't indexed yet.
+        `on_progress(done, total)` is called between batches. Returns {"success", "data": {"new_commits"}}.
+        """
+        with self._update_lock:
+            tips_res = self._run_command("for-each-ref refs/heads --format='%(objectname) %(refname)'")
+            if not tips_res["success"]: return tips_res
+            tips = {ref: oid for oid, ref in (line.split(" ", 1) for line in tips_res["output"].split("\n") if line)}
+            with self._lock:
+                known = dict(self._connect().execute("SELECT ref, oid FROM tips").fetchall())
+            if known == tips: return {"success": True, "data": {"new_commits": 0}}
+            new_tips = sorted(set(tips.values()) - set(known.values()))
+            commits = []
+            if new_tips:
+                revs = "\n".join(new_tips + [f"^{oid}" for oid in sorted(set(known.values()))]) + "\n"
+                log_res = self._run_command("log -z --format=%H%x1f%T%x1f%at%x1f%s --ignore-missing --stdin", input_text=revs)
+                if not log_res["success"]: return log_res
+                commits = [record.split("\x1f", 3) for record in log_res["output"].split("\0") if record]
+            # The lock is taken per batch so searches can run between batches of a long first indexing.
+            for start in range(0, len(commits), INDEX_COMMIT_BATCH):
+                batch = commits[start:start + INDEX_COMMIT_BATCH]
+                with self._lock:
+                    conn = self._connect()
+                    for oid, tree, author_time, subject in batch:
+                        self._index_tree(conn, tree)
+                        conn.execute("INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?)", (oid, tree, int(author_time), subject))
+                    conn.commit()
+                if on_progress: on_progress(start + len(batch), len(commits))
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM tips")
+                conn.executemany("INSERT INTO tips VALUES (?, ?)", tips.items())
+                conn.commit()
+        return {"success": True, "data": {"new_commits": len(commits)}}
+
+    def _index_tree(self, conn, root):
+        """Indexes a tree and everything under it that hasn't been seen before."""
+        pending = [root]
+        while pending:
+            tree = pending.pop()
+            if conn.execute("SELECT 1 FROM trees WHERE oid = ?", (tree,)).fetchone(): continue
+            found = self._pool.query(tree)
+            if not found or found[1] != "tree": continue
+            entries = parse_tree(found[3], len(tree) // 2)
+            conn.executemany("INSERT INTO tree_entries VALUES (?, ?, ?)", [(tree, e["oid"], e["name"]) for e in entries])
+            pending.extend(e["oid"] for e in entries if e["type"] == "tree")
+            self._index_blobs(conn, [e["oid"] for e in entries if e["type"] == "blob"])
+            conn.execute("INSERT INTO trees VALUES (?)", (tree,))
+
+    def _index_blobs(self, conn, oids):
+        new = [oid for oid in set(oids) if not conn.execute("SELECT 1 FROM blobs WHERE oid = ?", (oid,)).fetchone()]
+        if not new: return
+        sizes = self._pool.query_many(new, check_only=True)
+        for oid, size in zip(new, sizes):
+            blob_id = conn.execute("INSERT INTO blobs (oid) VALUES (?)", (oid,)).lastrowid
+            if not size or size[2] > INDEX_MAX_BLOB_BYTES: continue
+            found = self._pool.query(oid)
+            if not found or b"\0" in found[3][:BINARY_SNIFF_BYTES] or is_pointer(found[3]): continue
+            conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", [(token, blob_id) for token in tokenize(found[3])])
+
+    def search(self, query, limit=SEARCH_MAX_RESULTS):
+        """
+        Returns snapshots whose description contains `query`, or that contain a file
+        holding every word of it, newest first: [{"hash", "author_time", "subject", "paths"}].
+        """
+        words = sorted(tokenize(query))
+        with self._lock:
+            conn = self._connect()
+            results = {}
+            for oid, author_time, subject in conn.execute(
+                    "SELECT oid, author_time, subject FROM commits WHERE subject LIKE ? ESCAPE '\\' ORDER BY author_time DESC LIMIT ?",
+                    ("%" + re.sub(r"([%_\\])", r"\\\1", query.strip()) + "%", limit)):
+                results[oid] = {"hash": oid, "author_time": author_time, "subject": subject, "paths": []}
+            if words:
+                matched = " INTERSECT ".join(["SELECT blob FROM postings WHERE token = ?"] * len(words))
+                rows = conn.execute(f"""
+                    WITH RECURSIVE matched(oid) AS (SELECT b.oid FROM blobs b WHERE b.id IN ({matched})),
+                    up(oid, path) AS (
+                        SELECT e.parent, e.name FROM tree_entries e JOIN matched m ON e.child = m.oid
+                        UNION
+                        SELECT e.parent, e.name || '/' || up.path FROM tree_entries e JOIN up ON e.child = up.oid
+                    )
+                    SELECT c.oid, c.author_time, c.subject, up.path FROM up JOIN commits c ON c.tree = up.oid
+                    ORDER BY c.author_time DESC""", words)
+                for oid, author_time, subject, path in rows:
+                    result = results.get(oid)
+                    if result is None:
+                        if len(results) >= limit: continue
+                        result = results[oid] = {"hash": oid, "author_time": author_time, "subject": subject, "paths": []}
+                    if len(result["paths"]) < SEARCH_MAX_PATHS: result["paths"].append(path)
+        # Snapshots of deleted branches stay indexed but can't be shown once git has pruned them.
+        found = self._pool.query_many(list(results), check_only=True)
+        live = [result for result, exists in zip(results.values(), found) if exists]
+        return sorted(live, key=lambda r: r["author_time"], reverse=True)[:limit]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None: self._conn.close()
+            self._conn = None
@@ -0,0 +1,78 @@
+# search_window.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import tkinter as tk
+from tkinter import ttk
+
+class HistorySearchWindow(tk.Toplevel):
+    """
+    Searches snapshot descriptions and file contents across every branch. The
+    index is brought up to date in the background when the window opens;
+    searches answer from whatever is indexed so far.
+    """
+    def __init__(self, app):
+        super().__init__(app)
+        self.app, self.helper = app, app.git_helper
+        self.results, self._search_request, self._indexing = [], 0, False
+        self.title("Search Snapshots")
+        self.geometry("800x450")
+        self.transient(app)
+
+        search_frame = ttk.Frame(self, padding=(10, 10, 10, 0)); search_frame.pack(fill=tk.X)
+        ttk.Label(search_frame, text="Find snapshots whose description or files contain:").pack(anchor=tk.W)
+        self.query_var = tk.StringVar()
+        entry = ttk.Entry(search_frame, textvariable=self.query_var); entry.pack(side=tk.LEFT, fill=tk.X, expand=True, pady=5)
+        entry.bind("<Return>", self._search); entry.focus_set()
+        ttk.Button(search_frame, text="Search", command=self._search).pack(side=tk.LEFT, padx=(5, 0))
+        self.status_label = ttk.Label(self, text="", foreground="#666666", padding=(10, 0)); self.status_label.pack(fill=tk.X)
+
+        results_frame = ttk.Frame(self, padding=10); results_frame.pack(fill=tk.BOTH, expand=True)
+        self.result_list = ttk.Treeview(results_frame, columns=("date", "subject", "files"), show="headings", selectmode="browse")
+        self.result_list.heading("date", text="Timestamp"); self.result_list.heading("subject", text="Snapshot Description"); self.result_list.heading("files", text="Matching Files")
+        self.result_list.column("date", width=150, stretch=tk.NO); self.result_list.column("subject", width=280)
+        self.result_list.bind("<Double-1>", self._preview_result)
+        scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.result_list.yview)
+        self.result_list.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y); self.result_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        ttk.Button(self, text="Preview Selected Snapshot", command=self._preview_result).pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        self._update_index()
+
+    def _update_index(self):
+        self._indexing = True
+        self.status_label.config(text="Updating the search index...")
+        def on_progress(done, total):
+            if self.winfo_exists(): self.status_label.config(text=f"Indexing snapshots... {done} of {total}")
+        def on_done(update_res, error):
+            self._indexing = False
+            if not self.winfo_exists(): return
+            if error or not update_res["success"]:
+                self.status_label.config(text=f"{error or update_res['error']}")
+                return
+            self.status_label.config(text="Search index is up to date. Words are matched whole, so search for complete names.")
+            if self.query_var.get().strip(): self._search()
+        self.app.task_runner.submit(self.helper.update_search_index, on_progress=self.app.task_runner.relay(on_progress),
+                                    mutating=False, quiet=True, on_done=on_done)
+
+    def _search(self, event=None):
+        query = self.query_var.get().strip()
+        if not query: return
+        self._search_request += 1
+        request = self._search_request
+        def on_results(search_res, error):
+            if request != self._search_request or not self.winfo_exists(): return
+            for item in self.result_list.get_children(): self.result_list.delete(item)
+            if error or not search_res["success"]:
+                self.status_label.config(text=f"{error or search_res['error']}")
+                return
+            self.results = search_res["data"]
+            for result in self.results:
+                self.result_list.insert("", "end", values=(f" {result['date']}", f" {result['subject']}", ", ".join(result["paths"])))
+            note = " (still indexing, more may appear)" if self._indexing else ""
+            self.status_label.config(text=f"{len(self.results)} snapshot(s) found{note}.")
+        self.app.task_runner.submit(self.helper.search_history, query, mutating=False, quiet=True, on_done=on_results)
+
+    def _preview_result(self, event=None):
+        selected = self.result_list.selection()
+        if not selected: return
+        result = self.results[self.result_list.index(selected[0])]
+        self.app._open_preview({"hash": result["hash"], "date": result["date"], "subject": result["subject"]})
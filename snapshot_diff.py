@@ -0,0 +1,125 @@
+# snapshot_diff.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import subprocess
+import threading
+import collections
+from git_pool import hidden_startupinfo
+from tracing import tracer
+
+NUMSTAT_CACHE_PAIRS = 500 # Commit pairs whose per-file summaries are kept. Both sides are immutable, so entries never go stale.
+PATCH_CACHE_FILES = 200
+NUMSTAT_BATCH_ROWS = 200 # Rows handed to the caller at a time while a summary is still streaming.
+PATCH_MAX_BYTES = 2 * 1024 * 1024 # Bigger file diffs are cut off for display.
+
+class SnapshotDiffError(Exception):
+    pass
+
+class SnapshotDiffer:
+    """
+    Per-file change summaries (`--numstat`) and full diffs between two snapshots.
+    Summaries are cached by (old, new) commit pair and can be streamed to the
+    caller in batches while git is still producing them; full diffs are only
+    computed for the files that are actually opened.
+    """
+    def __init__(self, project_root, max_pairs=NUMSTAT_CACHE_PAIRS, max_patches=PATCH_CACHE_FILES):
+        self.project_root = project_root
+        self.max_pairs, self.max_patches = max_pairs, max_patches
+        self._numstats = collections.OrderedDict() # (old, new) -> rows, least recently used first.
+        self._patches = collections.OrderedDict() # (old, new, path, old_path) -> (text, truncated)
+        self._lock = threading.Lock()
+
+    def _cached(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None: cache.move_to_end(key)
+            return value
+
+    def _store(self, cache, key, value, limit):
+        with self._lock:
+            cache[key] = value
+            while len(cache) > limit: cache.popitem(last=False)
+
+    def _diff_command(self, old, new):
+        # With no old side, --root diffs a first commit against the empty tree.
+        return ["git", "diff-tree", "-r", "--no-commit-id", "-M", "--root"] + ([old, new] if old else [new])
+
+    def numstat(self, old, new, on_rows=None):
+        """
+        Returns [{"path", "old_path", "added", "deleted", "binary"}] for the files that
+        differ between two full commit ids (`old` None for a first commit). `on_rows`
+        is called with each batch of rows as they arrive.
+        """
+        key = (old, new)
+        rows = self._cached(self._numstats, key)
+        if rows is not None:
+            if on_rows and rows: on_rows(list(rows))
+            return rows
+        rows, batch = [], []
+        command = self._diff_command(old, new) + ["--numstat", "-z"]
+        with tracer.span(" ".join(command), "stream") as trace:
+            proc = subprocess.Popen(command, cwd=self.project_root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    startupinfo=hidden_startupinfo())
+            try:
+                for row in _iter_numstat_z(proc.stdout, trace):
+                    rows.append(row); batch.append(row)
+                    if on_rows and len(batch) >= NUMSTAT_BATCH_ROWS:
+                        on_rows(batch); batch = []
+                stderr = proc.stderr.read()
+            finally:
+                proc.stdout.close()
+                trace["exit_status"] = proc.wait()
+        if trace["exit_status"] != 0: raise SnapshotDiffError(stderr.decode("utf-8", "replace").strip() or "git diff-tree failed")
+        if on_rows and batch: on_rows(batch)
+        self._store(self._numstats, key, rows, self.max_pairs)
+        return rows
+
+    def file_diff(self, old, new, path, old_path=None):
+        """Returns (patch text, truncated) for one file, following a rename when `old_path` is given."""
+        key = (old, new, path, old_path)
+        cached = self._cached(self._patches, key)
+        if cached is not None: return cached
+        pathspecs = [f":(literal){p}" for p in {path, old_path or path}]
+        command = self._diff_command(old, new) + ["-p", "--"] + pathspecs
+        with tracer.span(" ".join(command), "subprocess") as trace:
+            proc = subprocess.Popen(command, cwd=self.project_root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    startupinfo=hidden_startupinfo())
+            try:
+                raw = proc.stdout.read(PATCH_MAX_BYTES + 1)
+            finally:
+                proc.stdout.close()
+                # A cut-off diff leaves git writing into a closed pipe, so it is stopped rather than waited on.
+                if len(raw) > PATCH_MAX_BYTES: proc.kill()
+                stderr = proc.stderr.read()
+                trace["exit_status"], trace["stdout_bytes"] = proc.wait(), len(raw)
+        truncated = len(raw) > PATCH_MAX_BYTES
+        if trace["exit_status"] != 0 and not truncated: raise SnapshotDiffError(stderr.decode("utf-8", "replace").strip() or "git diff-tree failed")
+        result = (raw[:PATCH_MAX_BYTES].decode("utf-8", "replace"), truncated)
+        self._store(self._patches, key, result, self.max_patches)
+        return result
+
+def _iter_numstat_z(stream, trace):
+    """
+    Parses `--numstat -z` output as it arrives: `added\\tdeleted\\tpath\\0`, or for a
+    rename `added\\tdeleted\\t\\0old path\\0new path\\0`. Binary files show `-` counts.
+    """
+    buffer, pending = b"", None
+    while True:
+        chunk = stream.read1(65536) if hasattr(stream, "read1") else stream.read(65536)
+        if not chunk: break
+        trace["stdout_bytes"] += len(chunk)
+        fields = (buffer + chunk).split(b"\0")
+        buffer = fields.pop()
+        for field in fields:
+            text = field.decode("utf-8", "replace")
+            if pending is None:
+                added, deleted, path = text.split("\t", 2)
+                binary = added == "-"
+                pending = {"path": path, "old_path": None, "added": 0 if binary else int(added), "deleted": 0 if binary else int(deleted), "binary": binary}
+                if not path: continue # A rename: the old and new paths follow as separate fields.
+            elif pending["old_path"] is None and not pending["path"]:
+                pending["old_path"] = text
+                continue
+            else:
+                pending["path"] = text
+            yield pending
+            pending = None
@@ -0,0 +1,110 @@
+# snapshot_export.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import zlib
+import collections
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+# Archive formats for exporting a snapshot, by file extension (longest first).
+EXPORT_FORMATS = collections.OrderedDict([(".tar.zst", "tar.zst"), (".tar.gz", "tar.gz"), (".tgz", "tar.gz"), (".zip", "zip")])
+GZIP_BLOCK_BYTES = 1024 * 1024 # Each block becomes its own gzip member, so blocks compress independently.
+GZIP_LEVEL = 6
+COMPRESS_WORKERS = max(1, min(8, os.cpu_count() or 1))
+COMPRESS_IN_FLIGHT = COMPRESS_WORKERS * 2 # Blocks being compressed at once; bounds memory to a few MB.
+ZSTD_MISSING = "Exporting to .tar.zst needs the 'zstandard' Python package (pip install zstandard). Choose .tar.gz or .zip instead."
+
+class ExportError(Exception):
+    pass
+
+def format_for_path(path):
+    """The export format a destination's extension asks for, or None."""
+    lowered = path.lower()
+    return next((fmt for ext, fmt in EXPORT_FORMATS.items() if lowered.endswith(ext)), None)
+
+def format_error(fmt):
+    """Why `fmt` can't be exported on this machine, or None if it can."""
+    if fmt not in EXPORT_FORMATS.values(): return "Choose a file name ending in .zip, .tar.gz or .tar.zst."
+    if fmt == "tar.zst" and importlib.util.find_spec("zstandard") is None: return ZSTD_MISSING
+    return None
+
+def _gzip_member(block, level):
+    # A complete gzip member (header, raw deflate, CRC and size); concatenated members are one valid .gz file.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+class ParallelGzipWriter:
+    """
+    A write-only file object that gzips what it is given on several threads, in
+    the style of pigz: input is cut into fixed blocks, each compressed as its own
+    gzip member (zlib releases the GIL), and the members are written out in order.
+    """
+    def __init__(self, fileobj, level=GZIP_LEVEL, workers=COMPRESS_WORKERS):
+        self._file, self._level = fileobj, level
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gitsimply-gzip")
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= GZIP_BLOCK_BYTES:
+            self._submit(bytes(self._buffer[:GZIP_BLOCK_BYTES]))
+            del self._buffer[:GZIP_BLOCK_BYTES]
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append(self._pool.submit(_gzip_member, block, self._level))
+        while len(self._pending) >= COMPRESS_IN_FLIGHT: self._file.write(self._pending.popleft().result())
+
+    def close(self):
+        try:
+            if self._buffer: self._submit(bytes(self._buffer))
+            self._buffer = bytearray()
+            while self._pending: self._file.write(self._pending.popleft().result())
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+def _zstd_writer(fileobj):
+    try:
+        import zstandard # Optional: only needed for .tar.zst exports.
+    except ImportError:
+        raise ExportError(ZSTD_MISSING)
+    # threads=-1 compresses on every core inside zstd itself.
+    return zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(fileobj, closefd=False)
+
+def write_archive(blocks, destination, fmt, on_bytes=None, finish=None, abort=None):
+    """
+    Writes the archive stream `blocks` (tar for the tar formats, a finished zip
+    for "zip") to `destination`, compressing on the way. `finish()` returns the
+    producer's result dict once the blocks run out; `abort()` stops the producer
+    if writing fails. The file only appears when everything succeeded, so a
+    failed or stopped export leaves nothing behind. `on_bytes(total_read)` is
+    called after every block.
+    Returns {"success", "data": {"bytes"}} or {"success": False, "error"}.
+    """
+    temp_path = destination + ".part"
+    read, error = 0, None
+    try:
+        with open(temp_path, "wb") as f:
+            writer = f if fmt == "zip" else ParallelGzipWriter(f) if fmt == "tar.gz" else _zstd_writer(f)
+            try:
+                for block in blocks:
+                    writer.write(block)
+                    read += len(block)
+                    if on_bytes: on_bytes(read)
+            finally:
+                if writer is not f: writer.close()
+    except (ExportError, OSError) as e:
+        error = str(e)
+        if abort: abort()
+    finally:
+        result = finish() if finish else {"success": True} # Always reaps the producer.
+    try:
+        if error is None and result["success"]: os.replace(temp_path, destination)
+    except OSError as e:
+        error = str(e)
+    finally:
+        if os.path.exists(temp_path): os.remove(temp_path)
+    if error is not None: return {"success": False, "error": f"Could not write {destination}:\n{error}"}
+    if not result["success"]: return result
+    return {"success": True, "data": {"bytes": os.path.getsize(destination)}}
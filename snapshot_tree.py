@@ -0,0 +1,151 @@
+# snapshot_tree.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import subprocess
+import threading
+import collections
+from git_pool import hidden_startupinfo
+from tracing import tracer
+from chunk_store import is_pointer, parse_pointer, ChunkStoreError
+
+TREE_CACHE_MAX_TREES = 5000 # Tree objects are immutable, so entries never go stale; this only bounds memory.
+PREVIEW_MAX_BYTES = 1024 * 1024 # Larger files are previewed from their first bytes only.
+BINARY_SNIFF_BYTES = 8000 # Same heuristic git uses: a NUL byte in the first 8000 bytes means binary.
+POINTER_MAX_BYTES = 64 * 1024 # Large-asset pointers are a few KB; bigger blobs are never read to check.
+
+MODE_TYPES = {"40000": "tree", "160000": "commit"} # Everything else is a blob (files, executables, symlinks).
+
+class SnapshotPathError(Exception):
+    pass
+
+def resolve_pointer_sizes(pool, blobs, candidate):
+    """
+    Replaces the "size" of each large-asset pointer in `blobs` (dicts with "oid",
+    "name" and "size") with the size of the file it stands for. Only small blobs
+    whose name passes `candidate(name)` are read, in one pooled cat-file batch.
+    """
+    small = [e for e in blobs if e["size"] is not None and e["size"] <= POINTER_MAX_BYTES and candidate(e["name"])]
+    if not small: return
+    for entry, found in zip(small, pool.query_many([e["oid"] for e in small])):
+        if not found or not is_pointer(found[3]): continue
+        try:
+            entry["size"] = parse_pointer(found[3])[0]
+        except ChunkStoreError:
+            pass
+
+class SnapshotTree:
+    """
+    A read-only view of any snapshot's files, read straight from the object
+    database through the cat-file pool. Nothing in the project folder is touched.
+    Parsed tree objects are cached by id, and since unchanged folders keep the
+    same tree id across snapshots, browsing neighbouring snapshots is mostly cache hits.
+    """
+    def __init__(self, pool, project_root, max_trees=TREE_CACHE_MAX_TREES, pointer_candidate=None):
+        self._pool = pool
+        self.project_root = project_root
+        # pointer_candidate(name) says whether a file may be a large-asset pointer (None: never).
+        self.pointer_candidate = pointer_candidate
+        self.max_trees = max_trees
+        self._trees = collections.OrderedDict() # tree oid -> entries, least recently used first.
+        self._lock = threading.Lock()
+
+    def _root_tree(self, commit):
+        found = self._pool.query(f"{commit}^{{tree}}", check_only=True)
+        if not found: raise SnapshotPathError(f"Snapshot not found: {commit}")
+        return found[0]
+
+    def _read_tree(self, tree_oid):
+        with self._lock:
+            entries = self._trees.get(tree_oid)
+            if entries is not None:
+                self._trees.move_to_end(tree_oid)
+                return entries
+        found = self._pool.query(tree_oid)
+        if not found or found[1] != "tree": raise SnapshotPathError(f"Not a folder: {tree_oid}")
+        entries = parse_tree(found[3], len(tree_oid) // 2)
+        blobs = [e for e in entries if e["type"] == "blob"]
+        for entry, size in zip(blobs, self._pool.query_many([e["oid"] for e in blobs], check_only=True)):
+            entry["size"] = size[2] if size else None
+        if self.pointer_candidate: resolve_pointer_sizes(self._pool, blobs, self.pointer_candidate)
+        with self._lock:
+            self._trees[tree_oid] = entries
+            while len(self._trees) > self.max_trees: self._trees.popitem(last=False)
+        return entries
+
+    def _lookup(self, commit, path):
+        """Walks from the snapshot's root tree to `path` using cached trees. Returns the entry dict."""
+        entry = {"name": "", "path": "", "type": "tree", "mode": "40000", "oid": self._root_tree(commit), "size": None}
+        for part in [p for p in path.replace("\\", "/").split("/") if p]:
+            if entry["type"] != "tree": raise SnapshotPathError(f"Not a folder: {entry['path']}")
+            match = next((e for e in self._read_tree(entry["oid"]) if e["name"] == part), None)
+            if match is None: raise SnapshotPathError(f"'{path}' does not exist in this snapshot.")
+            entry = dict(match, path=f"{entry['path']}/{part}" if entry["path"] else part)
+        return entry
+
+    def list_directory(self, commit, path=""):
+        """Lists a folder of a snapshot: folders first, then files, each sorted by name."""
+        folder = self._lookup(commit, path)
+        if folder["type"] != "tree": raise SnapshotPathError(f"Not a folder: {path}")
+        entries = [dict(e, path=f"{folder['path']}/{e['name']}" if folder["path"] else e["name"]) for e in self._read_tree(folder["oid"])]
+        return sorted(entries, key=lambda e: (e["type"] != "tree", e["name"].lower()))
+
+    def list_files(self, commit, path=""):
+        """Every file at or under `path` in a snapshot, each with its full path. Submodules are skipped."""
+        entry = self._lookup(commit, path)
+        if entry["type"] == "blob": return [entry]
+        if entry["type"] != "tree": raise SnapshotPathError(f"Not a file or folder: {path}")
+        files, folders = [], [entry]
+        while folders:
+            folder = folders.pop()
+            for child in self._read_tree(folder["oid"]):
+                child = dict(child, path=f"{folder['path']}/{child['name']}" if folder["path"] else child["name"])
+                if child["type"] == "tree": folders.append(child)
+                elif child["type"] == "blob": files.append(child)
+        return files
+
+    def read_file(self, commit, path, max_bytes=PREVIEW_MAX_BYTES):
+        """
+        Returns {"content", "size", "binary", "truncated"} for a file in a snapshot.
+        Only the first `max_bytes` are read, so huge assets don't get loaded whole.
+        """
+        entry = self._lookup(commit, path)
+        if entry["type"] != "blob": raise SnapshotPathError(f"Not a file: {path}")
+        size = entry["size"]
+        if size is not None and size > max_bytes:
+            content = self._read_blob_prefix(entry["oid"], max_bytes)
+        else:
+            found = self._pool.query(entry["oid"])
+            if not found: raise SnapshotPathError(f"'{path}' is missing from the object database.")
+            content, size = found[3], found[2]
+        if is_pointer(content):
+            # A large-asset file: the bytes live in the chunk store, and the pointer text is not its content.
+            try:
+                size = parse_pointer(content)[0]
+            except ChunkStoreError:
+                pass
+            return {"content": b"", "size": size, "binary": True, "truncated": False}
+        return {"content": content, "size": size, "binary": b"\0" in content[:BINARY_SNIFF_BYTES], "truncated": len(content) < size}
+
+    def _read_blob_prefix(self, oid, max_bytes):
+        with tracer.span(f"git cat-file blob {oid} (first {max_bytes} bytes)", "subprocess") as trace:
+            proc = subprocess.Popen(["git", "cat-file", "blob", oid], cwd=self.project_root, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, startupinfo=hidden_startupinfo())
+            try:
+                content = proc.stdout.read(max_bytes)
+            finally:
+                proc.kill()
+                proc.wait()
+            trace["stdout_bytes"], trace["exit_status"] = len(content), 0
+        return content
+
+def parse_tree(raw, oid_bytes):
+    """Parses a raw tree object: repeated `<mode> <name>\\0<binary oid>`."""
+    entries, i = [], 0
+    while i < len(raw):
+        space = raw.index(b" ", i)
+        nul = raw.index(b"\0", space)
+        mode = raw[i:space].decode("ascii")
+        name = raw[space + 1:nul].decode("utf-8", "replace")
+        oid = raw[nul + 1:nul + 1 + oid_bytes].hex()
+        entries.append({"name": name, "type": MODE_TYPES.get(mode, "blob"), "mode": mode, "oid": oid, "size": None})
+        i = nul + 1 + oid_bytes
+    return entries
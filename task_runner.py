@@ -0,0 +1,140 @@
+# task_runner.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import threading
+import queue
+import contextvars
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+class ReadWriteLock:
+    """Many readers or one writer. Writers wait for running readers to drain."""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writing: self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers: self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            while self._writing or self._readers: self._cond.wait()
+            self._writing = True
+
+    def release_write(self):
+        with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+
+class GitTaskRunner:
+    """
+    Runs GitHelper operations off the Tk main thread.
+    - Mutating operations go through a single worker thread, so they never overlap.
+    - Read-only operations share a small thread pool and may run side by side.
+    - Results are handed back on the main thread by polling a queue with `after()`,
+      since Tk widgets must only be touched from the thread that created them.
+    """
+    def __init__(self, root, max_readers=4, poll_ms=15, on_busy_changed=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy_changed = on_busy_changed
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="gitsimply-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gitsimply-write")
+        self._lock = ReadWriteLock()
+        self._results = queue.Queue()
+        self._relayed = queue.Queue() # Intermediate results from running operations, see relay().
+        self._pending, self._busy = 0, 0
+        self._pumping = False
+
+    def is_busy(self):
+        return self._busy > 0
+
+    def submit(self, operation, *args, mutating=True, on_done=None, quiet=False, **kwargs):
+        """
+        Queues `operation(*args, **kwargs)`. `on_done(result, error)` is called on the
+        main thread when it finishes; `error` is the raised exception, if any.
+        Quiet operations (background prefetches) don't put the UI into its busy state.
+        """
+        executor = self._writer if mutating else self._readers
+        self._pending += 1
+        if not quiet:
+            self._busy += 1
+            if self._busy == 1 and self.on_busy_changed: self.on_busy_changed(True)
+        # Run inside a copy of the caller's context so tracing tags follow the work to the worker thread.
+        context = contextvars.copy_context()
+        future = executor.submit(context.run, self._guarded, operation, args, kwargs, mutating)
+        future.add_done_callback(lambda f: self._results.put((f, on_done, quiet)))
+        if not self._pumping:
+            self._pumping = True
+            self.root.after(self.poll_ms, self._pump)
+        return future
+
+    def relay(self, callback):
+        """
+        Wraps `callback` so a running operation can call it from its worker thread
+        (to stream partial results); the calls are made on the main thread, in
+        order, and always before that operation's on_done.
+        """
+        return lambda *args: self._relayed.put((callback, args))
+
+    def _guarded(self, operation, args, kwargs, mutating):
+        acquire, release = (self._lock.acquire_write, self._lock.release_write) if mutating else (self._lock.acquire_read, self._lock.release_read)
+        acquire()
+        try:
+            return operation(*args, **kwargs)
+        finally:
+            release()
+
+    def _pump(self):
+        ready = []
+        while True:
+            try:
+                ready.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        self._pending -= len(ready)
+        finished_busy = sum(1 for _, _, quiet in ready if not quiet)
+        self._busy -= finished_busy
+        # Schedule the next tick before running callbacks: a callback may itself wait
+        # on another operation, and that wait needs this pump to keep going.
+        if self._pending:
+            self.root.after(self.poll_ms, self._pump)
+        else:
+            self._pumping = False
+        if finished_busy and not self._busy and self.on_busy_changed: self.on_busy_changed(False)
+        while True:
+            try:
+                callback, args = self._relayed.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+        for future, on_done, _ in ready:
+            if not on_done: continue
+            error = future.exception()
+            on_done(None if error else future.result(), error)
+
+    def run_and_wait(self, operation, *args, mutating=True, **kwargs):
+        """
+        Runs an operation in the background and returns its result, keeping the Tk
+        event loop (redraws, busy cursor) alive in the meantime. This lets event
+        handlers keep their step-by-step structure without freezing the window.
+        """
+        done, finished = {}, tk.BooleanVar(master=self.root, value=False)
+        def finish(result, error):
+            done["result"], done["error"] = result, error
+            finished.set(True)
+        self.submit(operation, *args, mutating=mutating, on_done=finish, **kwargs)
+        if "error" not in done: self.root.wait_variable(finished)
+        if done["error"]: raise done["error"]
+        return done["result"]
+
+    def shutdown(self):
+        self._readers.shutdown(wait=False, cancel_futures=True)
+        self._writer.shutdown(wait=True)
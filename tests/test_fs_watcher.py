@@ -0,0 +1,60 @@
+# tests/test_fs_watcher.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fs_watcher import IgnoreRules
+from git_helper import GitHelper, SESSION_META_DIR
+
+class IgnoreRulesTest(unittest.TestCase):
+    def test_leading_slash_anchors_to_root(self):
+        rules = IgnoreRules([f"/{SESSION_META_DIR}/"])
+        self.assertTrue(rules.is_ignored(SESSION_META_DIR, is_dir=True))
+        self.assertTrue(rules.is_ignored(f"{SESSION_META_DIR}/settings.json"))
+        self.assertFalse(rules.is_ignored(f"sub/{SESSION_META_DIR}", is_dir=True))
+        self.assertFalse(rules.is_ignored(f"sub/{SESSION_META_DIR}/notes.txt"))
+
+    def test_unanchored_matches_at_any_depth(self):
+        rules = IgnoreRules(["__pycache__/", "*.pyc"])
+        self.assertTrue(rules.is_ignored("pkg/__pycache__/mod.cpython-311.pyc"))
+        self.assertTrue(rules.is_ignored("deep/er/x.pyc"))
+        self.assertFalse(rules.is_ignored("pkg/__pycache__"))
+
+    def test_middle_slash_anchors_to_root(self):
+        rules = IgnoreRules(["build/out"])
+        self.assertTrue(rules.is_ignored("build/out/a.o"))
+        self.assertFalse(rules.is_ignored("src/build/out/a.o"))
+
+class WatchedNestedMetaFolderTest(unittest.TestCase):
+    """A tracked folder named like the app's metadata folder, but not at the root, must stay watched."""
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="gitsimply-test-")
+        os.makedirs(os.path.join(self.root, "sub", SESSION_META_DIR))
+        self.notes = os.path.join(self.root, "sub", SESSION_META_DIR, "notes.txt")
+        with open(self.notes, "w", encoding="utf-8") as f: f.write("one\n")
+        self.helper = GitHelper(self.root)
+        self.assertTrue(self.helper.initialize_repo()["success"])
+
+    def tearDown(self):
+        self.helper.stop_watching()
+        self.helper.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_edit_in_nested_meta_folder_is_seen(self):
+        self.helper.start_watching()
+        self.assertFalse(self.helper.has_changes())
+        with open(self.notes, "a", encoding="utf-8") as f: f.write("two\n")
+        porcelain = subprocess.run(["git", "status", "--porcelain"], cwd=self.root, capture_output=True, text=True).stdout
+        self.assertIn(f"sub/{SESSION_META_DIR}/notes.txt", porcelain)
+        deadline = time.monotonic() + 10 # Polling backends report every couple of seconds.
+        while not self.helper.has_changes() and time.monotonic() < deadline: time.sleep(0.1)
+        self.assertTrue(self.helper.has_changes())
+
+if __name__ == "__main__":
+    unittest.main()
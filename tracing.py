@@ -0,0 +1,76 @@
+# tracing.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import json
+import time
+import threading
+import contextvars
+import collections
+from contextlib import contextmanager
+
+TRACE_BUFFER_SIZE = 5000
+
+# The UI handler a git call is being made for. Set by the app, carried to worker threads by the task runner.
+current_action = contextvars.ContextVar("gitsimply_current_action", default=None)
+
+class CallTracer:
+    """
+    Keeps the most recent git invocations (and UI actions) in a ring buffer:
+    duration, stdout size, exit status and the UI action that caused them.
+    """
+    def __init__(self, capacity=TRACE_BUFFER_SIZE):
+        self._records = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, kind):
+        """
+        Times the enclosed block. The yielded dict can be filled in with
+        "stdout_bytes" and "exit_status" before the block ends.
+        """
+        info = {"stdout_bytes": 0, "exit_status": None}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(name, kind, start, time.perf_counter(), **info)
+
+    def record(self, name, kind, start, end, stdout_bytes=0, exit_status=None, action=None):
+        entry = {
+            "name": name, "kind": kind, "start": start, "duration": end - start,
+            "stdout_bytes": stdout_bytes, "exit_status": exit_status,
+            "action": action if action is not None else current_action.get(),
+            "thread": threading.current_thread().name,
+        }
+        with self._lock:
+            self._records.append(entry)
+
+    def records(self, since=None):
+        with self._lock:
+            records = list(self._records)
+        return records if since is None else [r for r in records if r["start"] >= since]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def export_chrome_trace(self, path):
+        """Writes the buffer in Chrome's trace event format (chrome://tracing, Perfetto)."""
+        records = self.records()
+        origin = min((r["start"] for r in records), default=0)
+        threads = {}
+        events = []
+        for r in records:
+            tid = threads.setdefault(r["thread"], len(threads) + 1)
+            events.append({
+                "name": r["name"], "cat": r["kind"], "ph": "X", "pid": os.getpid(), "tid": tid,
+                "ts": round((r["start"] - origin) * 1e6), "dur": round(r["duration"] * 1e6),
+                "args": {"action": r["action"], "stdout_bytes": r["stdout_bytes"], "exit_status": r["exit_status"]},
+            })
+        for name, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}})
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(records)
+
+tracer = CallTracer()
@@ -0,0 +1,110 @@
+# workspace.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from git_helper import GitHelper
+
+WORKSPACE_REFRESH_WORKERS = 8 # Projects whose status is read at the same time.
+
+class Workspace:
+    """
+    The set of project folders the app knows about. Each project's GitHelper is
+    created on first use and kept open (with its cat-file workers, history cache
+    and search index), so switching back to a project costs nothing to set up.
+    """
+    def __init__(self, project_roots=(), max_workers=WORKSPACE_REFRESH_WORKERS):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._projects = []
+        self._helpers, self._initialized = {}, set()
+        for root in project_roots: self.add(root)
+
+    @staticmethod
+    def _key(project_root):
+        return os.path.normcase(os.path.abspath(project_root))
+
+    def projects(self):
+        with self._lock:
+            return list(self._projects)
+
+    def add(self, project_root):
+        """Registers a project folder. Returns False if it was already registered."""
+        with self._lock:
+            if any(self._key(p) == self._key(project_root) for p in self._projects): return False
+            self._projects.append(project_root)
+            return True
+
+    def remove(self, project_root):
+        """Forgets a project folder and closes its helper."""
+        key = self._key(project_root)
+        with self._lock:
+            self._projects = [p for p in self._projects if self._key(p) != key]
+            helper = self._helpers.pop(key, None)
+            self._initialized.discard(key)
+        if helper: helper.close()
+
+    def helper_for(self, project_root):
+        """The open GitHelper for a project, creating it on first use. Registers the project if needed."""
+        self.add(project_root)
+        key = self._key(project_root)
+        with self._lock:
+            helper = self._helpers.get(key)
+            if helper is None:
+                helper = self._helpers[key] = GitHelper(project_root)
+            return helper
+
+    def is_initialized(self, project_root):
+        """True once initialize_repo has succeeded for this project in this session."""
+        return self._key(project_root) in self._initialized
+
+    def mark_initialized(self, project_root):
+        self._initialized.add(self._key(project_root))
+
+    def project_status(self, project_root):
+        """
+        A one-line summary for the dashboard: branch, unsaved change count and the
+        age of the last snapshot. Only reads; never initializes or commits.
+        The app's loaded project shares its helper with the main window, so read
+        that one through the task runner (mutating=False), not refresh_status.
+        """
+        if not os.path.isdir(project_root): return {"success": False, "error": "The folder no longer exists."}
+        if not os.path.exists(os.path.join(project_root, ".git")): return {"success": False, "error": "Not set up yet. Open it to start tracking."}
+        helper = self.helper_for(project_root)
+        status_res = helper.get_repo_status()
+        if not status_res["success"]: return status_res
+        data = status_res["data"]
+        last = helper.get_commit_info(data["head"]) if data["head"] else None
+        return {"success": True, "data": {
+            "branch": data["current_ref"], "is_detached": data["is_detached"], "changes": len(data["entries"]),
+            "last_snapshot": last["subject"] if last else None,
+            "last_snapshot_age": time.time() - last["author_time"] if last else None}}
+
+    def refresh_status(self, on_result=None, project_roots=None):
+        """
+        Reads the status of every project (or just `project_roots`) with at most
+        `max_workers` at a time. `on_result(project_root, result)` is called from
+        the worker threads as each one finishes. Returns {project_root: result}.
+        """
+        roots = list(project_roots) if project_roots is not None else self.projects()
+        def read(root):
+            try:
+                return self.project_status(root)
+            except Exception as e: # One broken folder must not hide the others.
+                return {"success": False, "error": f"{type(e).__name__}: {e}"}
+        results = {}
+        if not roots: return results
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(roots)), thread_name_prefix="gitsimply-workspace") as pool:
+            futures = {pool.submit(read, root): root for root in roots}
+            for future in as_completed(futures):
+                root = futures[future]
+                results[root] = future.result()
+                if on_result: on_result(root, results[root])
+        return results
+
+    def close(self):
+        with self._lock:
+            helpers, self._helpers = list(self._helpers.values()), {}
+            self._initialized.clear()
+        for helper in helpers: helper.close()
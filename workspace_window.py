@@ -0,0 +1,134 @@
+# workspace_window.py Please give all changes to this script in WHOLE. Do not give snippets. Respond with the script as a whole pasteable unit without comments made to omit parts like "... rest of xyz method remains the same"
+# IF THIS FILE IS UNCHANGED **DO NOT RETURN IT**
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+def _format_age(seconds):
+    if seconds is None: return "never"
+    if seconds < 90: return "just now"
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "just now"
+
+class WorkspaceWindow(tk.Toplevel):
+    """
+    Lists every project in the workspace with its loaded branch, unsaved changes
+    and how long ago it was last saved. Statuses are read in the background,
+    several projects at a time, and rows fill in as each one answers.
+    """
+    def __init__(self, app):
+        super().__init__(app)
+        self.app, self.workspace = app, app.workspace
+        self._refreshing = False
+        self.title("Workspace")
+        self.geometry("850x400")
+        self.transient(app)
+
+        list_frame = ttk.Frame(self, padding=10); list_frame.pack(fill=tk.BOTH, expand=True)
+        self.project_list = ttk.Treeview(list_frame, columns=("project", "branch", "changes", "saved"), show="headings", selectmode="browse")
+        self.project_list.heading("project", text="Project Folder"); self.project_list.heading("branch", text="Loaded Branch")
+        self.project_list.heading("changes", text="Unsaved Changes"); self.project_list.heading("saved", text="Last Snapshot")
+        self.project_list.column("project", width=320); self.project_list.column("branch", width=150)
+        self.project_list.column("changes", width=120, stretch=tk.NO); self.project_list.column("saved", width=200)
+        self.project_list.tag_configure("active", background="#e0e8f0")
+        self.project_list.tag_configure("dirty", foreground="#c00000")
+        self.project_list.tag_configure("error", foreground="#888888")
+        self.project_list.bind("<Double-1>", self._open_selected)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.project_list.yview)
+        self.project_list.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y); self.project_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        button_frame = ttk.Frame(self, padding=(10, 0, 10, 10)); button_frame.pack(fill=tk.X)
+        ttk.Button(button_frame, text="Open Selected", command=self._open_selected).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Add Project...", command=self._add_project).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Remove from Workspace", command=self._remove_selected).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh).pack(side=tk.RIGHT)
+        self.status_label = ttk.Label(self, text="", foreground="#666666", padding=(10, 0, 10, 5)); self.status_label.pack(fill=tk.X)
+
+        self.refresh()
+
+    def _rebuild_rows(self):
+        for item in self.project_list.get_children(): self.project_list.delete(item)
+        for root in self.workspace.projects():
+            tags = ("active",) if self._is_active(root) else ()
+            self.project_list.insert("", "end", iid=root, values=(f" {root}", " ...", "", ""), tags=tags)
+
+    def _is_active(self, root):
+        return bool(self.app.project_root) and os.path.normcase(os.path.abspath(root)) == os.path.normcase(os.path.abspath(self.app.project_root))
+
+    def refresh(self):
+        if self._refreshing: return
+        self._rebuild_rows()
+        roots = self.workspace.projects()
+        if not roots:
+            self.status_label.config(text="No projects yet. Use 'Add Project...' to register your project folders.")
+            return
+        self._refreshing = True
+        self.status_label.config(text=f"Checking {len(roots)} project(s)...")
+        active = [root for root in roots if self._is_active(root)]
+        others = [root for root in roots if not self._is_active(root)]
+        results, errors, remaining = {}, [], [2 if active else 1]
+        def part_done():
+            remaining[0] -= 1
+            if remaining[0]: return
+            self._refreshing = False
+            if not self.winfo_exists(): return
+            if errors: self.status_label.config(text=f"{errors[0]}"); return
+            dirty = sum(1 for r in results.values() if r["success"] and r["data"]["changes"])
+            self.status_label.config(text=f"{len(results)} project(s), {dirty} with unsaved changes.")
+        def on_others_done(others_results, error):
+            if error: errors.append(error)
+            else: results.update(others_results)
+            part_done()
+        def on_active_done(result, error):
+            result = {"success": False, "error": f"{error}"} if error else result
+            results[active[0]] = result
+            self._show_row(active[0], result)
+            part_done()
+        # Other projects are read on the workspace's own pool with their own helpers.
+        self.app.task_runner.submit(self.workspace.refresh_status, on_result=self.app.task_runner.relay(self._show_row),
+                                    project_roots=others, mutating=False, quiet=True, on_done=on_others_done)
+        # The loaded project's helper is shared with the main window, so its read goes through the
+        # runner's read lock like every other app read and can't overlap a commit or checkout.
+        if active:
+            self.app.task_runner.submit(self.workspace.project_status, active[0], mutating=False, quiet=True, on_done=on_active_done)
+
+    def _show_row(self, root, result):
+        if not self.winfo_exists() or not self.project_list.exists(root): return
+        tags = ["active"] if self._is_active(root) else []
+        if not result["success"]:
+            self.project_list.item(root, values=(f" {root}", "", "", f" {result['error']}"), tags=tags + ["error"])
+            return
+        data = result["data"]
+        branch = "(viewing a past snapshot)" if data["is_detached"] else data["branch"]
+        if data["changes"]: tags.append("dirty")
+        saved = _format_age(data["last_snapshot_age"]) + (f": {data['last_snapshot']}" if data["last_snapshot"] else "")
+        self.project_list.item(root, values=(f" {root}", f" {branch}", f" {data['changes'] or 'none'}", f" {saved}"), tags=tags)
+
+    def _selected_root(self):
+        selected = self.project_list.selection()
+        return selected[0] if selected else None
+
+    def _open_selected(self, event=None):
+        root = self._selected_root()
+        if not root or self._is_active(root): return
+        if self.app._switch_project(root): self.refresh()
+
+    def _add_project(self):
+        path = filedialog.askdirectory(title="Add a Project Folder to the Workspace", parent=self)
+        if not path: return
+        if self.workspace.add(path): self.app._save_config()
+        self.refresh()
+
+    def _remove_selected(self):
+        root = self._selected_root()
+        if not root: return
+        if self._is_active(root):
+            self.status_label.config(text="The loaded project can't be removed. Open another project first.")
+            return
+        self.workspace.remove(root)
+        self.app._save_config()
+        self.project_list.delete(root)